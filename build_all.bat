@@ -63,6 +63,7 @@ pyinstaller ^
 --paths=dist/obfuscated_project ^
 --hidden-import platform ^
 --hidden-import ttkbootstrap ^
+--hidden-import numpy ^
 --hidden-import tkinter.messagebox ^
 --add-data "ffmpeg;ffmpeg" ^
 --add-data "security/runtime_manifest.json;security" ^
@@ -29,6 +29,16 @@ class ConfigManager:
         default_config: Dict[str, Any] = {
             "ffmpeg_path": "",
             "output_folder": str(Path.home() / "Videos"),
+            "scratch_folder": "",
+            "scratch_quota_mb": 0,
+            "batch_resume_enabled": True,
+            "work_queue_folder": "",
+            "skip_unchanged_outputs": False,
+            "folder_index_cache": False,
+            "asset_selection": "balanced",
+            "asset_seed": "",
+            "ffmpeg_priority": "Normal",
+            "ffmpeg_pin_cores": False,
             "last_download_folder": str(Path.home() / "Downloads"),
             "last_video_folder": "",
             "last_audio_folder": "",
@@ -41,6 +51,7 @@ class ConfigManager:
             "last_presenter_folder": "",
             "video_codec": "Automático",
             "resolution": RESOLUTIONS[0],
+            "output_renditions": "",
             "narration_volume": 0,
             "music_volume": -15,
             "subtitle_fontsize": 48,
@@ -50,6 +61,7 @@ class ConfigManager:
             "subtitle_bold": True,
             "subtitle_italic": False,
             "subtitle_font_file": "",
+            "subtitle_prerender_enabled": False,
             "image_duration": 5,
             "slideshow_transition": list(SLIDESHOW_TRANSITIONS.keys())[1],
             "slideshow_transition_duration": 1.0,
@@ -59,10 +71,14 @@ class ConfigManager:
             "png_overlay_scale": 0.15,
             "png_overlay_opacity": 1.0,
             "batch_music_behavior": "loop",
+            "audio_premix_enabled": True,
+            "loudnorm_enabled": False,
+            "loudnorm_target_i": -16.0,
             "add_fade_out": False,
             "fade_out_duration": 10,
             "effect_overlay_path": "",
             "effect_blend_mode": list(EFFECT_BLEND_MODES.keys())[0],
+            "effect_prerender_enabled": True,
             "presenter_video_path": "",
             "presenter_position": PRESENTER_POSITIONS[1],
             "presenter_scale": 0.40,
@@ -70,6 +86,8 @@ class ConfigManager:
             "presenter_chroma_color": "#00FF00",
             "presenter_chroma_similarity": 0.2,
             "presenter_chroma_blend": 0.1,
+            "presenter_prerender_enabled": True,
+            "presenter_track_codec": "prores",
             "show_tech_logs": False,
             "intro_enabled": False,
             "intro_default_text": "",
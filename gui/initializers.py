@@ -21,6 +21,7 @@ from .constants import (
     SUBTITLE_POSITIONS,
     INTRO_FONT_CHOICES,
 )
+from .previews import PreviewRenderWorker
 
 
 def initialize_variables(app: Any, config: Dict[str, Any]) -> None:
@@ -38,9 +39,20 @@ def initialize_variables(app: Any, config: Dict[str, Any]) -> None:
     app.music_folder_path = ttk.StringVar()
     app.output_folder = ttk.StringVar(value=config.get("output_folder", str(Path.home() / "Videos")))
     app.output_filename_single = ttk.StringVar(value="video_final.mp4")
+    app.scratch_folder = ttk.StringVar(value=config.get("scratch_folder", ""))
+    app.scratch_quota_mb_var = ttk.StringVar(value=str(config.get("scratch_quota_mb", 0)))
+    app.batch_resume_enabled_var = ttk.BooleanVar(value=config.get("batch_resume_enabled", True))
+    app.skip_unchanged_outputs_var = ttk.BooleanVar(value=config.get("skip_unchanged_outputs", False))
+    app.folder_index_cache_var = ttk.BooleanVar(value=config.get("folder_index_cache", False))
+    app.asset_selection_var = ttk.StringVar(value=config.get("asset_selection", "balanced"))
+    app.asset_seed_var = ttk.StringVar(value=str(config.get("asset_seed", "")))
+    app.ffmpeg_priority_var = ttk.StringVar(value=config.get("ffmpeg_priority", "Normal"))
+    app.ffmpeg_pin_cores_var = ttk.BooleanVar(value=config.get("ffmpeg_pin_cores", False))
+    app.work_queue_folder = ttk.StringVar(value=config.get("work_queue_folder", ""))
     app.subtitle_font_file = ttk.StringVar(value=config.get("subtitle_font_file", ""))
     app.media_type = ttk.StringVar(value="video_single")
     app.resolution_var = ttk.StringVar(value=config.get("resolution", RESOLUTIONS[0]))
+    app.output_renditions_var = ttk.StringVar(value=config.get("output_renditions", ""))
     app.video_codec_var = ttk.StringVar(value=config.get("video_codec", "Automático"))
     app.image_duration_var = ttk.IntVar(value=config.get("image_duration", 5))
     app.transition_name_var = ttk.StringVar(
@@ -58,14 +70,19 @@ def initialize_variables(app: Any, config: Dict[str, Any]) -> None:
     )
     app.subtitle_bold_var = ttk.BooleanVar(value=config.get("subtitle_bold", True))
     app.subtitle_italic_var = ttk.BooleanVar(value=config.get("subtitle_italic", False))
+    app.subtitle_prerender_enabled_var = ttk.BooleanVar(value=config.get("subtitle_prerender_enabled", False))
     app.png_overlay_path_var = ttk.StringVar(value=config.get("png_overlay_path", ""))
     app.png_overlay_position_var = ttk.StringVar(value=config.get("png_overlay_position", OVERLAY_POSITIONS[3]))
     app.png_overlay_scale_var = ttk.DoubleVar(value=config.get("png_overlay_scale", 0.15))
     app.png_overlay_opacity_var = ttk.DoubleVar(value=config.get("png_overlay_opacity", 1.0))
     app.batch_music_behavior_var = ttk.StringVar(value=config.get("batch_music_behavior", "loop"))
+    app.audio_premix_enabled_var = ttk.BooleanVar(value=config.get("audio_premix_enabled", True))
+    app.loudnorm_enabled_var = ttk.BooleanVar(value=config.get("loudnorm_enabled", False))
+    app.loudnorm_target_i_var = ttk.DoubleVar(value=config.get("loudnorm_target_i", -16.0))
     app.add_fade_out_var = ttk.BooleanVar(value=config.get("add_fade_out", False))
     app.fade_out_duration_var = ttk.IntVar(value=config.get("fade_out_duration", 10))
     app.effect_overlay_path_var = ttk.StringVar(value=config.get("effect_overlay_path", ""))
+    app.effect_prerender_enabled_var = ttk.BooleanVar(value=config.get("effect_prerender_enabled", True))
     app.effect_blend_mode_var = ttk.StringVar(value=config.get("effect_blend_mode", list(EFFECT_BLEND_MODES.keys())[0]))
     app.presenter_video_path_var = ttk.StringVar(value=config.get("presenter_video_path", ""))
     app.presenter_position_var = ttk.StringVar(value=config.get("presenter_position", PRESENTER_POSITIONS[1]))
@@ -74,6 +91,8 @@ def initialize_variables(app: Any, config: Dict[str, Any]) -> None:
     app.presenter_chroma_color_var = ttk.StringVar(value=config.get("presenter_chroma_color", "#00FF00"))
     app.presenter_chroma_similarity_var = ttk.DoubleVar(value=config.get("presenter_chroma_similarity", 0.2))
     app.presenter_chroma_blend_var = ttk.DoubleVar(value=config.get("presenter_chroma_blend", 0.1))
+    app.presenter_prerender_enabled_var = ttk.BooleanVar(value=config.get("presenter_prerender_enabled", True))
+    app.presenter_track_codec_var = ttk.StringVar(value=config.get("presenter_track_codec", "prores"))
     app.show_tech_logs_var = ttk.BooleanVar(value=config.get("show_tech_logs", False))
     app.download_output_path_var = ttk.StringVar(
         value=config.get("last_download_folder", str(Path.home() / "Downloads"))
@@ -156,6 +175,8 @@ def initialize_variables(app: Any, config: Dict[str, Any]) -> None:
         "music_single": app.music_file_single,
         "music_folder": app.music_folder_path,
         "output": app.output_folder,
+        "scratch": app.scratch_folder,
+        "work_queue": app.work_queue_folder,
         "subtitle_font": app.subtitle_font_file,
         "ffmpeg_path": app.ffmpeg_path_var,
         "png_overlay": app.png_overlay_path_var,
@@ -170,9 +191,12 @@ def initialize_state(app: Any) -> None:
     app.cancel_requested = threading.Event()
     app.progress_queue = queue.Queue()
     app.thread_executor = ThreadPoolExecutor(max_workers=3)
+    app.preview_worker = PreviewRenderWorker(app.progress_queue)
     app.available_encoders_cache: Optional[List[str]] = None
     app.loaded_fonts = []
-    app.presenter_processed_frame_path = None
+    app.presenter_preview_frame = None
+    app.presenter_preview_frame_key = None
+    app.presenter_frame_decode_pending = None
     app.download_thread = None
     app.yt_dlp_engine_path = None
 
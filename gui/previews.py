@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import os
+import queue
+import threading
 import tkinter as tk
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageTk
 
 from .constants import SUBTITLE_POSITIONS
 from .utils import logger
+from processing.chroma_key import apply_chroma_key
 from video_processing.banner import (
     BANNER_HEIGHT_RATIO,
+    BANNER_MIN_HEIGHT,
     BannerRenderConfig,
     BannerRenderResult,
     generate_banner_image,
@@ -19,261 +24,354 @@ from video_processing.banner import (
 
 
 DEFAULT_FONT_SCALE = BannerRenderConfig.__dataclass_fields__['font_scale'].default
+DEFAULT_VIDEO_RESOLUTION = (1920, 1080)
+
+
+@dataclass
+class BannerPreviewScene:
+    """Fully composed banner preview, ready to be painted on the canvas."""
+
+    image: Image.Image
+    frame_bbox: Tuple[int, int, int, int]
+    message: Optional[str] = None
+    message_fill: str = "#c0c4d2"
+    result: Optional[BannerRenderResult] = None
+
+
+class PreviewRenderWorker:
+    """Render previews on a dedicated thread, keeping only the latest request.
+
+    Each ``kind`` holds at most one pending job: submitting a new one replaces
+    the previous request before it starts, so a slider drag renders only the
+    most recent settings. Results are posted to ``result_queue`` as
+    ``(kind, generation, result)`` and must be checked with :meth:`is_current`
+    on the Tk thread before being displayed.
+    """
+
+    def __init__(self, result_queue: "queue.Queue[Any]") -> None:
+        self._result_queue = result_queue
+        self._condition = threading.Condition()
+        self._pending: Dict[str, Tuple[int, Callable[[], Any]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="preview-render", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, render: Callable[[], Any]) -> int:
+        with self._condition:
+            generation = self._generations.get(kind, 0) + 1
+            self._generations[kind] = generation
+            self._pending[kind] = (generation, render)
+            self._condition.notify()
+        return generation
+
+    def cancel(self, kind: str) -> None:
+        """Drop the pending job of ``kind`` and invalidate any result still in flight."""
+
+        with self._condition:
+            self._generations[kind] = self._generations.get(kind, 0) + 1
+            self._pending.pop(kind, None)
+
+    def is_current(self, kind: str, generation: int) -> bool:
+        with self._condition:
+            return self._generations.get(kind) == generation
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+        if timeout is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                kind, (generation, render) = self._pending.popitem()
+
+            try:
+                result = render()
+            except Exception as exc:  # pragma: no cover - defensive rendering
+                logger.error("Erro ao renderizar pré-visualização '%s': %s", kind, exc, exc_info=True)
+                continue
+
+            if self.is_current(kind, generation):
+                self._result_queue.put((kind, generation, result))
+
+
+def _vertical_gradient(size: Tuple[int, int], top: Tuple[int, int, int], bottom: Tuple[int, int, int]) -> Image.Image:
+    width, height = size
+    column = Image.new("RGBA", (1, height))
+    data = []
+    for y in range(height):
+        mix = y / max(1, height - 1)
+        r = int(top[0] * (1 - mix) + bottom[0] * mix)
+        g = int(top[1] * (1 - mix) + bottom[1] * mix)
+        b = int(top[2] * (1 - mix) + bottom[2] * mix)
+        data.append((r, g, b, 255))
+    column.putdata(data)
+    return column.resize((width, height))
+
+
+def _compute_frame_bbox(canvas_size: Tuple[int, int], video_size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    canvas_w, canvas_h = canvas_size
+    video_w, video_h = video_size
+    if video_w <= 0:
+        video_w = 16
+    if video_h <= 0:
+        video_h = 9
+    aspect = video_w / float(video_h)
+
+    margin = int(round(min(canvas_w, canvas_h) * 0.08))
+    available_w = max(20, canvas_w - margin * 2)
+    available_h = max(20, canvas_h - margin * 2)
+    frame_width = available_w
+    frame_height = int(round(frame_width / aspect))
+    if frame_height > available_h:
+        frame_height = available_h
+        frame_width = int(round(frame_height * aspect))
+    frame_width = max(32, frame_width)
+    frame_height = max(18, frame_height)
+
+    frame_x0 = (canvas_w - frame_width) // 2
+    frame_y0 = (canvas_h - frame_height) // 2
+    return (frame_x0, frame_y0, frame_x0 + frame_width, frame_y0 + frame_height)
+
+
+def _preview_render_scale(frame_width: int, video_size: Tuple[int, int], height_ratio: float) -> float:
+    """Scale factor that renders the banner close to the on-screen frame size.
+
+    The banner generator clamps its height to ``BANNER_MIN_HEIGHT``; rendering
+    below that point would change the layout, so the scale never drops under it.
+    """
+
+    video_w, video_h = video_size
+    try:
+        ratio = max(0.05, min(float(height_ratio), 0.9))
+    except (TypeError, ValueError):
+        ratio = BANNER_HEIGHT_RATIO
+    scale = frame_width / float(max(1, video_w))
+    min_scale = BANNER_MIN_HEIGHT / float(max(1.0, video_h * ratio))
+    return max(0.01, min(1.0, max(scale, min_scale)))
+
+
+def compose_banner_mock_scene(
+    canvas_size: Tuple[int, int],
+    video_size: Tuple[int, int],
+    banner_image: Optional[Image.Image],
+    banner_ratio: Optional[float] = None,
+) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+    canvas_w, canvas_h = canvas_size
+    canvas_w = max(1, canvas_w)
+    canvas_h = max(1, canvas_h)
+
+    base = _vertical_gradient((canvas_w, canvas_h), (30, 33, 42), (14, 16, 24))
+
+    video_w, video_h = video_size
+    if video_h <= 0:
+        video_h = 9
+    frame_bbox = _compute_frame_bbox((canvas_w, canvas_h), video_size)
+    frame_x0, frame_y0, frame_x1, frame_y1 = frame_bbox
+    frame_width = frame_x1 - frame_x0
+    frame_height = frame_y1 - frame_y0
+
+    frame_surface = _vertical_gradient((frame_width, frame_height), (42, 46, 58), (22, 24, 32))
+
+    frame_draw = ImageDraw.Draw(frame_surface)
+    frame_draw.rectangle(
+        (0, 0, frame_width - 1, frame_height - 1),
+        outline=(88, 94, 110, 255),
+        width=2,
+    )
+    frame_draw.rectangle(
+        (2, 2, frame_width - 3, frame_height - 3),
+        outline=(18, 20, 28, 255),
+        width=1,
+    )
+
+    base.alpha_composite(frame_surface, (frame_x0, frame_y0))
+
+    if banner_image is not None and banner_image.width > 0 and banner_image.height > 0:
+        banner_reference_width = banner_image.width or video_w
+        width_scale = frame_width / float(max(1, banner_reference_width))
+        width_scale = max(width_scale, 0.01)
+
+        if banner_ratio is None:
+            banner_ratio = banner_image.height / float(max(1, video_h))
+        try:
+            ratio_value = float(banner_ratio)
+        except (TypeError, ValueError):
+            ratio_value = BANNER_HEIGHT_RATIO
+        ratio_value = max(0.05, min(ratio_value, 0.9))
+
+        target_banner_height = max(
+            1,
+            int(round(frame_height * ratio_value)),
+        )
+        height_scale = target_banner_height / float(max(1, banner_image.height))
+        scale = min(width_scale, height_scale, 1.0)
+
+        banner_size = (
+            max(1, int(round(banner_image.width * scale))),
+            max(1, int(round(banner_image.height * scale))),
+        )
+        banner_preview = banner_image
+        if banner_size != banner_image.size:
+            banner_preview = banner_image.resize(
+                banner_size, Image.Resampling.LANCZOS
+            )
+
+        if banner_preview.width > frame_width:
+            excess = banner_preview.width - frame_width
+            crop_left = excess // 2
+            crop_box = (
+                crop_left,
+                0,
+                crop_left + frame_width,
+                banner_preview.height,
+            )
+            banner_preview = banner_preview.crop(crop_box)
+
+        base.alpha_composite(banner_preview, (frame_x0, frame_y0))
+
+    return base, frame_bbox
+
+
+def render_banner_preview_scene(
+    canvas_size: Tuple[int, int],
+    text: str,
+    use_gradient: bool,
+    solid_color: str,
+    gradient_start: str,
+    gradient_end: str,
+    font_color: str,
+    enabled: bool,
+    video_resolution: Tuple[int, int],
+    height_ratio: float = BANNER_HEIGHT_RATIO,
+    font_scale: float = DEFAULT_FONT_SCALE,
+    font_path: Optional[str] = None,
+    outline_enabled: bool = False,
+    outline_color: str = "#000000",
+    outline_offset: float = 2.0,
+    shadow_enabled: bool = False,
+    shadow_color: str = "#000000",
+    shadow_offset_x: float = 3.0,
+    shadow_offset_y: float = 3.0,
+) -> BannerPreviewScene:
+    """Compose the banner preview for ``canvas_size`` without touching Tk.
+
+    The banner is rendered at the resolution of the preview frame instead of
+    the full output resolution; outline and shadow offsets are scaled by the
+    same factor so the preview keeps the proportions of the final overlay.
+    """
+
+    canvas_w, canvas_h = max(1, int(canvas_size[0])), max(1, int(canvas_size[1]))
+
+    try:
+        video_w, video_h = video_resolution
+        video_w = max(1, int(video_w))
+        video_h = max(1, int(video_h))
+    except (TypeError, ValueError):
+        video_w, video_h = DEFAULT_VIDEO_RESOLUTION
+
+    if not enabled:
+        mock_image, frame_bbox = compose_banner_mock_scene((canvas_w, canvas_h), (video_w, video_h), None)
+        return BannerPreviewScene(mock_image, frame_bbox, "Faixa desativada")
+
+    fx0, _fy0, fx1, _fy1 = _compute_frame_bbox((canvas_w, canvas_h), (video_w, video_h))
+    scale = _preview_render_scale(fx1 - fx0, (video_w, video_h), height_ratio)
+
+    try:
+        config = BannerRenderConfig(
+            text=text or "",
+            video_width=max(1, int(round(video_w * scale))),
+            video_height=max(1, int(round(video_h * scale))),
+            use_gradient=use_gradient,
+            solid_color=solid_color or "#333333",
+            gradient_start=gradient_start or solid_color or "#333333",
+            gradient_end=gradient_end or solid_color or "#333333",
+            font_color=font_color or "#FFFFFF",
+            height_ratio=height_ratio,
+            font_scale=font_scale,
+            font_path=font_path,
+            outline_enabled=outline_enabled,
+            outline_color=outline_color or "#000000",
+            outline_offset=float(outline_offset or 0.0) * scale,
+            shadow_enabled=shadow_enabled,
+            shadow_color=shadow_color or "#000000",
+            shadow_offset_x=float(shadow_offset_x or 0.0) * scale,
+            shadow_offset_y=float(shadow_offset_y or 0.0) * scale,
+        )
+        result = generate_banner_image(config)
+        banner_image = result.image
+    except Exception as exc:
+        logger.error("Erro ao gerar pré-visualização da faixa: %s", exc)
+        mock_image, frame_bbox = compose_banner_mock_scene((canvas_w, canvas_h), (video_w, video_h), None)
+        return BannerPreviewScene(mock_image, frame_bbox, "Erro na pré-visualização", "#E57373")
+
+    banner_ratio = banner_image.height / float(max(1, config.video_height))
+    composed, frame_bbox = compose_banner_mock_scene(
+        (canvas_w, canvas_h),
+        (config.video_width, config.video_height),
+        banner_image,
+        banner_ratio if banner_ratio > 0 else None,
+    )
+    return BannerPreviewScene(composed, frame_bbox, result=result)
 
 
 class BannerPreview(tk.Canvas):
-    def __init__(self, parent: tk.Misc, **kwargs: Any) -> None:
+    RENDER_KIND = "update_banner_preview"
+
+    def __init__(self, parent: tk.Misc, worker: Optional[PreviewRenderWorker] = None, **kwargs: Any) -> None:
         super().__init__(parent, bg="#14161f", highlightthickness=0, bd=0, **kwargs)
         self._photo: Optional[ImageTk.PhotoImage] = None
         self._last_params: Dict[str, Any] = {}
         self._last_result: Optional[BannerRenderResult] = None
+        self._worker = worker
         self.bind("<Configure>", self._on_resize)
 
     def _on_resize(self, event: tk.Event[Any]) -> None:  # pragma: no cover - UI callback
         if self._last_params:
             try:
-                self.update_preview(**self._last_params)
+                self.request_preview(**self._last_params)
             except Exception as exc:  # pragma: no cover - defensive UI
                 logger.error("Erro ao atualizar preview da faixa após redimensionamento: %s", exc)
 
-    def update_preview(
-        self,
-        text: str,
-        use_gradient: bool,
-        solid_color: str,
-        gradient_start: str,
-        gradient_end: str,
-        font_color: str,
-        enabled: bool,
-        video_resolution: Tuple[int, int],
-        height_ratio: float = BANNER_HEIGHT_RATIO,
-        font_scale: float = DEFAULT_FONT_SCALE,
-        font_path: Optional[str] = None,
-        outline_enabled: bool = False,
-        outline_color: str = "#000000",
-        outline_offset: float = 2.0,
-        shadow_enabled: bool = False,
-        shadow_color: str = "#000000",
-        shadow_offset_x: float = 3.0,
-        shadow_offset_y: float = 3.0,
-    ) -> None:
-        self._last_params = {
-            'text': text,
-            'use_gradient': use_gradient,
-            'solid_color': solid_color,
-            'gradient_start': gradient_start,
-            'gradient_end': gradient_end,
-            'font_color': font_color,
-            'enabled': enabled,
-            'video_resolution': video_resolution,
-            'height_ratio': height_ratio,
-            'font_scale': font_scale,
-            'font_path': font_path,
-            'outline_enabled': outline_enabled,
-            'outline_color': outline_color,
-            'outline_offset': outline_offset,
-            'shadow_enabled': shadow_enabled,
-            'shadow_color': shadow_color,
-            'shadow_offset_x': shadow_offset_x,
-            'shadow_offset_y': shadow_offset_y,
-        }
+    def _canvas_size(self) -> Tuple[int, int]:
+        return max(1, self.winfo_width()), max(1, self.winfo_height())
 
-        canvas_w, canvas_h = max(1, self.winfo_width()), max(1, self.winfo_height())
-        self.delete("all")
+    def request_preview(self, **params: Any) -> None:
+        """Queue a render on the preview worker, or render inline without one."""
 
-        try:
-            video_w, video_h = video_resolution
-        except Exception:
-            video_w, video_h = (1920, 1080)
+        if self._worker is None:
+            self.update_preview(**params)
+            return
+        self._last_params = dict(params)
+        canvas_size = self._canvas_size()
+        self._worker.submit(self.RENDER_KIND, lambda: render_banner_preview_scene(canvas_size, **params))
 
-        try:
-            video_w = max(1, int(video_w))
-            video_h = max(1, int(video_h))
-        except (TypeError, ValueError):
-            video_w, video_h = 1920, 1080
+    def apply_rendered(self, generation: int, scene: BannerPreviewScene) -> None:
+        """Display a scene posted by the worker unless a newer one is pending."""
 
-        if not enabled:
-            self._last_result = None
-            mock_image, frame_bbox = self._compose_mock_scene(
-                (canvas_w, canvas_h), (video_w, video_h), None
-            )
-            self._photo = ImageTk.PhotoImage(mock_image)
-            self.create_image(0, 0, image=self._photo, anchor="nw")
-            self._draw_overlay_message(frame_bbox, "Faixa desativada", fill="#c0c4d2")
+        if self._worker is not None and not self._worker.is_current(self.RENDER_KIND, generation):
             return
+        self.show_scene(scene)
 
-        try:
-            config = BannerRenderConfig(
-                text=text or "",
-                video_width=video_w,
-                video_height=video_h,
-                use_gradient=use_gradient,
-                solid_color=solid_color or "#333333",
-                gradient_start=gradient_start or solid_color or "#333333",
-                gradient_end=gradient_end or solid_color or "#333333",
-                font_color=font_color or "#FFFFFF",
-                height_ratio=height_ratio,
-                font_scale=font_scale,
-                font_path=font_path,
-                outline_enabled=outline_enabled,
-                outline_color=outline_color or "#000000",
-                outline_offset=outline_offset,
-                shadow_enabled=shadow_enabled,
-                shadow_color=shadow_color or "#000000",
-                shadow_offset_x=shadow_offset_x,
-                shadow_offset_y=shadow_offset_y,
-            )
-            result = generate_banner_image(config)
-            self._last_result = result
-            banner_image = result.image
-        except Exception as exc:
-            logger.error("Erro ao gerar pré-visualização da faixa: %s", exc)
-            self._last_result = None
-            mock_image, frame_bbox = self._compose_mock_scene(
-                (canvas_w, canvas_h), (video_w, video_h), None
-            )
-            self._photo = ImageTk.PhotoImage(mock_image)
-            self.create_image(0, 0, image=self._photo, anchor="nw")
-            self._draw_overlay_message(frame_bbox, "Erro na pré-visualização", fill="#E57373")
-            return
+    def update_preview(self, **params: Any) -> None:
+        self._last_params = dict(params)
+        self.show_scene(render_banner_preview_scene(self._canvas_size(), **params))
 
-        banner_ratio = 0.0
-        if config.video_height:
-            try:
-                banner_ratio = banner_image.height / float(max(1, config.video_height))
-            except Exception:
-                banner_ratio = 0.0
-
-        composed, frame_bbox = self._compose_mock_scene(
-            (canvas_w, canvas_h),
-            (config.video_width, config.video_height),
-            banner_image,
-            banner_ratio if banner_ratio > 0 else None,
-        )
-
-        self._photo = ImageTk.PhotoImage(composed)
+    def show_scene(self, scene: BannerPreviewScene) -> None:
+        self._last_result = scene.result
+        self.delete("all")
+        self._photo = ImageTk.PhotoImage(scene.image)
         self.create_image(0, 0, image=self._photo, anchor="nw")
-
-    def _compose_mock_scene(
-        self,
-        canvas_size: Tuple[int, int],
-        video_size: Tuple[int, int],
-        banner_image: Optional[Image.Image],
-        banner_ratio: Optional[float] = None,
-    ) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
-        canvas_w, canvas_h = canvas_size
-        canvas_w = max(1, canvas_w)
-        canvas_h = max(1, canvas_h)
-
-        base = Image.new("RGBA", (canvas_w, canvas_h))
-
-        gradient_column = Image.new("RGBA", (1, canvas_h))
-        top_bg = (30, 33, 42)
-        bottom_bg = (14, 16, 24)
-        gradient_data = []
-        for y in range(canvas_h):
-            mix = y / max(1, canvas_h - 1)
-            r = int(top_bg[0] * (1 - mix) + bottom_bg[0] * mix)
-            g = int(top_bg[1] * (1 - mix) + bottom_bg[1] * mix)
-            b = int(top_bg[2] * (1 - mix) + bottom_bg[2] * mix)
-            gradient_data.append((r, g, b, 255))
-        gradient_column.putdata(gradient_data)
-        base = gradient_column.resize((canvas_w, canvas_h))
-
-        video_w, video_h = video_size
-        if video_w <= 0:
-            video_w = 16
-        if video_h <= 0:
-            video_h = 9
-        aspect = video_w / float(video_h)
-
-        margin = int(round(min(canvas_w, canvas_h) * 0.08))
-        available_w = max(20, canvas_w - margin * 2)
-        available_h = max(20, canvas_h - margin * 2)
-        frame_width = available_w
-        frame_height = int(round(frame_width / aspect))
-        if frame_height > available_h:
-            frame_height = available_h
-            frame_width = int(round(frame_height * aspect))
-        frame_width = max(32, frame_width)
-        frame_height = max(18, frame_height)
-
-        frame_x0 = (canvas_w - frame_width) // 2
-        frame_y0 = (canvas_h - frame_height) // 2
-        frame_bbox = (frame_x0, frame_y0, frame_x0 + frame_width, frame_y0 + frame_height)
-
-        frame_gradient_column = Image.new("RGBA", (1, frame_height))
-        frame_top = (42, 46, 58)
-        frame_bottom = (22, 24, 32)
-        frame_gradient_data = []
-        for y in range(frame_height):
-            mix = y / max(1, frame_height - 1)
-            r = int(frame_top[0] * (1 - mix) + frame_bottom[0] * mix)
-            g = int(frame_top[1] * (1 - mix) + frame_bottom[1] * mix)
-            b = int(frame_top[2] * (1 - mix) + frame_bottom[2] * mix)
-            frame_gradient_data.append((r, g, b, 255))
-        frame_gradient_column.putdata(frame_gradient_data)
-        frame_surface = frame_gradient_column.resize((frame_width, frame_height))
-
-        frame_draw = ImageDraw.Draw(frame_surface)
-        frame_draw.rectangle(
-            (0, 0, frame_width - 1, frame_height - 1),
-            outline=(88, 94, 110, 255),
-            width=2,
-        )
-        frame_draw.rectangle(
-            (2, 2, frame_width - 3, frame_height - 3),
-            outline=(18, 20, 28, 255),
-            width=1,
-        )
-
-        base.alpha_composite(frame_surface, (frame_x0, frame_y0))
-
-        if banner_image is not None and banner_image.width > 0 and banner_image.height > 0:
-            banner_reference_width = banner_image.width or video_w
-            width_scale = frame_width / float(max(1, banner_reference_width))
-            width_scale = max(width_scale, 0.01)
-
-            if banner_ratio is None:
-                banner_ratio = banner_image.height / float(max(1, video_h))
-            try:
-                ratio_value = float(banner_ratio)
-            except (TypeError, ValueError):
-                ratio_value = BANNER_HEIGHT_RATIO
-            ratio_value = max(0.05, min(ratio_value, 0.9))
-
-            target_banner_height = max(
-                1,
-                int(round(frame_height * ratio_value)),
-            )
-            height_scale = target_banner_height / float(max(1, banner_image.height))
-            scale = min(width_scale, height_scale, 1.0)
-
-            banner_size = (
-                max(1, int(round(banner_image.width * scale))),
-                max(1, int(round(banner_image.height * scale))),
-            )
-            banner_preview = banner_image.resize(
-                banner_size, Image.Resampling.LANCZOS
-            )
-
-            if banner_preview.width > frame_width:
-                excess = banner_preview.width - frame_width
-                crop_left = excess // 2
-                crop_box = (
-                    crop_left,
-                    0,
-                    crop_left + frame_width,
-                    banner_preview.height,
-                )
-                banner_preview = banner_preview.crop(crop_box)
-
-            banner_x = frame_x0
-            banner_y = frame_y0
-
-            base.alpha_composite(banner_preview, (banner_x, banner_y))
-
-        return base, frame_bbox
+        if scene.message:
+            self._draw_overlay_message(scene.frame_bbox, scene.message, fill=scene.message_fill)
 
     def _draw_overlay_message(
         self, frame_bbox: Tuple[int, int, int, int], message: str, *, fill: str = "#c0c4d2"
@@ -411,16 +509,50 @@ class PngPreview(tk.Canvas):
 
 
 class PresenterPreview(tk.Canvas):
-    def __init__(self, parent: tk.Misc, **kwargs: Any) -> None:
+    """Quadro do apresentador sobre o vídeo; o chroma key é aplicado aqui, em processo.
+
+    O quadro decodificado fica em memória e só é redimensionado quando o
+    tamanho muda; mover os controles do chroma key refaz apenas o alpha. Com
+    um ``worker``, escala e chroma key rodam na thread de pré-visualização e
+    só o pedido mais recente é calculado, sem travar a interface.
+    """
+
+    RENDER_KIND = "update_presenter_preview"
+
+    def __init__(self, parent: tk.Misc, worker: Optional[PreviewRenderWorker] = None, **kwargs: Any) -> None:
         super().__init__(parent, bg="#333333", **kwargs)
         self.presenter_tk: Optional[ImageTk.PhotoImage] = None
         self.presenter_id: Optional[int] = None
         self.bind("<Configure>", self.on_resize)
         self.current_image_path: Optional[str] = None
+        self.current_frame: Optional[Image.Image] = None
         self.current_settings: Dict[str, Any] = {}
+        self._resized: Optional[Tuple[Tuple[int, Tuple[int, int]], Image.Image]] = None
+        self._worker = worker
 
     def on_resize(self, event: Optional[tk.Event[Any]] = None) -> None:  # pragma: no cover - UI callback
-        self.update_preview(self.current_image_path, **self.current_settings)
+        self.update_preview(self.current_image_path, frame=self.current_frame, **self.current_settings)
+
+    def _resized_frame(self, frame: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        key = (id(frame), size)
+        if self._resized is None or self._resized[0] != key:
+            self._resized = (key, frame.resize(size, Image.Resampling.LANCZOS))
+        return self._resized[1]
+
+    def render_frame(self, frame: Image.Image, size: Tuple[int, int], chroma: Optional[Tuple[str, float, float]]) -> Image.Image:
+        """Escala o quadro e aplica o chroma key, como no passe final: escala primeiro."""
+
+        resized = self._resized_frame(frame, size)
+        return apply_chroma_key(resized, *chroma) if chroma is not None else resized
+
+    def _clear(self) -> Tuple[int, int]:
+        if self._worker is not None:
+            # Um quadro ainda em cálculo não pode sobrescrever o que for desenhado agora.
+            self._worker.cancel(self.RENDER_KIND)
+        self.delete("all")
+        canvas_w, canvas_h = self.winfo_width(), self.winfo_height()
+        self.create_rectangle(0, 0, canvas_w, canvas_h, fill="#333333", outline="")
+        return canvas_w, canvas_h
 
     def update_preview(
         self,
@@ -429,21 +561,23 @@ class PresenterPreview(tk.Canvas):
         scale: float = 0.40,
         is_enabled: bool = False,
         error_message: Optional[str] = None,
+        frame: Optional[Image.Image] = None,
+        chroma: Optional[Tuple[str, float, float]] = None,
         **kwargs: Any,
     ) -> None:
         self.current_image_path = image_path
+        self.current_frame = frame
         self.current_settings = {
             "position_key": position_key,
             "scale": scale,
             "is_enabled": is_enabled,
             "error_message": error_message,
+            "chroma": chroma,
         }
-
-        self.delete("all")
         canvas_w, canvas_h = self.winfo_width(), self.winfo_height()
-        self.create_rectangle(0, 0, canvas_w, canvas_h, fill="#333333", outline="")
 
         if error_message:
+            self._clear()
             self.create_text(
                 canvas_w / 2,
                 canvas_h / 2,
@@ -455,41 +589,76 @@ class PresenterPreview(tk.Canvas):
             )
             return
 
-        if not is_enabled or not image_path or not os.path.exists(image_path):
+        has_image = frame is not None or bool(image_path and os.path.exists(image_path))
+        if not is_enabled or not has_image:
+            self._clear()
             text = "Aguardando imagem..." if is_enabled else "Selecione um vídeo de apresentador"
             self.create_text(canvas_w / 2, canvas_h / 2, text=text, fill="white", font=("Arial", 12))
             return
 
         try:
-            with Image.open(image_path) as img:
-                target_h = int(canvas_h * float(scale))
-                ratio = target_h / img.height
-                target_w = int(img.width * ratio)
-
-                if target_w < 1 or target_h < 1:
-                    return
+            if frame is None:
+                with Image.open(image_path) as img:
+                    frame = img.copy()
+            target_h = int(canvas_h * float(scale))
+            ratio = target_h / frame.height
+            target_w = int(frame.width * ratio)
+
+            if target_w < 1 or target_h < 1:
+                self._clear()
+                return
+
+            pos_x_map = {
+                "Inferior Esquerdo": 10,
+                "Inferior Central": (canvas_w - target_w) / 2,
+                "Inferior Direito": canvas_w - target_w - 10,
+            }
+            placement = (pos_x_map.get(position_key, (canvas_w - target_w) / 2), canvas_h)
+            if self._worker is not None:
+                # O quadro anterior continua na tela até o novo ficar pronto.
+                self._worker.submit(
+                    self.RENDER_KIND,
+                    lambda: (placement, self.render_frame(frame, (target_w, target_h), chroma)),
+                )
+                return
+            self.show_frame(placement, self.render_frame(frame, (target_w, target_h), chroma))
+        except Exception as exc:  # pragma: no cover - defensive image processing
+            self._show_load_error(exc)
 
-                img_resized = img.resize((target_w, target_h), Image.Resampling.LANCZOS)
-                self.presenter_tk = ImageTk.PhotoImage(img_resized)
+    def apply_rendered(self, generation: int, rendered: Tuple[Tuple[float, float], Image.Image]) -> None:
+        """Exibe um quadro calculado pelo worker, a menos que haja um pedido mais novo."""
 
-                pos_x_map = {
-                    "Inferior Esquerdo": 10,
-                    "Inferior Central": (canvas_w - target_w) / 2,
-                    "Inferior Direito": canvas_w - target_w - 10,
-                }
-                x = pos_x_map.get(position_key, (canvas_w - target_w) / 2)
-                y = canvas_h
+        if self._worker is not None and not self._worker.is_current(self.RENDER_KIND, generation):
+            return
+        self.show_frame(*rendered)
 
-                self.presenter_id = self.create_image(x, y, image=self.presenter_tk, anchor="sw")
+    def show_frame(self, placement: Tuple[float, float], image: Image.Image) -> None:
+        try:
+            self._clear()
+            self.presenter_tk = ImageTk.PhotoImage(image)
+            self.presenter_id = self.create_image(*placement, image=self.presenter_tk, anchor="sw")
         except Exception as exc:  # pragma: no cover - defensive image processing
-            logger.error("Erro ao carregar preview do apresentador: %s", exc)
-            self.create_text(
-                canvas_w / 2,
-                canvas_h / 2,
-                text="Erro ao carregar frame",
-                fill="red",
-                font=("Arial", 12),
-            )
+            self._show_load_error(exc)
+
+    def _show_load_error(self, exc: Exception) -> None:  # pragma: no cover - defensive image processing
+        logger.error("Erro ao carregar preview do apresentador: %s", exc)
+        canvas_w, canvas_h = self._clear()
+        self.create_text(
+            canvas_w / 2,
+            canvas_h / 2,
+            text="Erro ao carregar frame",
+            fill="red",
+            font=("Arial", 12),
+        )
 
 
-__all__ = ["SubtitlePreview", "PngPreview", "PresenterPreview"]
+__all__ = [
+    "BannerPreview",
+    "BannerPreviewScene",
+    "PreviewRenderWorker",
+    "SubtitlePreview",
+    "PngPreview",
+    "PresenterPreview",
+    "compose_banner_mock_scene",
+    "render_banner_preview_scene",
+]
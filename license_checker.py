@@ -387,6 +387,40 @@ def extract_license_key(data: Optional[Dict[str, Any]]) -> Optional[str]:
     return None
 
 
+def check_license_headless(
+    license_key: Optional[str] = None,
+) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """Valida a licença sem janelas, para execuções em servidores e agendadores.
+
+    Revalida a chave já ativada nesta máquina; quando ``license_key`` é
+    informado e difere da armazenada, tenta ativá-lo. Retorna
+    ``(válida, dados, mensagem de erro)``.
+    """
+
+    fingerprint = get_machine_fingerprint()
+    stored_key = extract_license_key(load_license_data(fingerprint))
+    requested_key = (license_key or "").strip()
+
+    if stored_key and (not requested_key or requested_key == stored_key):
+        payload, error, _detail = validate_license_key(stored_key, fingerprint)
+        if payload and payload.get("meta", {}).get("valid"):
+            save_license_data(payload)
+            set_license_as_valid()
+            return True, payload, None
+        if not requested_key:
+            return False, None, error or "A licença armazenada nesta máquina não é válida."
+
+    if not requested_key:
+        return False, None, "Nenhuma licença ativada nesta máquina. Informe uma chave de licença."
+
+    activation_data, message, _error_code = activate_new_license(requested_key, fingerprint)
+    if activation_data:
+        save_license_data(activation_data)
+        set_license_as_valid()
+        return True, activation_data, None
+    return False, None, message
+
+
 def check_license(parent_window: tk.Misc) -> Tuple[bool, Optional[Dict[str, Any]]]:
     fingerprint = get_machine_fingerprint()
     stored_data = load_license_data(fingerprint)
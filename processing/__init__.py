@@ -4,5 +4,8 @@ __all__ = [
     "language_utils",
     "typing_renderer",
     "ffmpeg_pipeline",
+    "chroma_key",
     "process_manager",
+    "concurrency",
+    "retry",
 ]
@@ -0,0 +1,167 @@
+"""Chroma key em processo, equivalente ao filtro ``chromakey`` do FFmpeg.
+
+Usado pela pré-visualização do apresentador: o quadro é decodificado uma
+única vez e cada mudança de cor, similaridade ou suavização só refaz a conta
+do alpha, sem abrir um novo processo do FFmpeg.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import os
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .ffmpeg_pipeline import capture_frame, logger, probe_media_properties
+
+__all__ = [
+    "chroma_key_uv",
+    "rgb_to_uv",
+    "apply_chroma_key",
+    "decode_preview_frame",
+]
+
+_SCALEBITS = 10
+_ONE_HALF = 1 << (_SCALEBITS - 1)
+# Normalização da distância usada pelo ``chromakey`` (vf_chromakey.c).
+_DISTANCE_SCALE = 255.0 * 255.0 * 2
+
+
+def _fix(value: float) -> int:
+    return int(value * (1 << _SCALEBITS) + 0.5)
+
+
+def _parse_color(color: str) -> Tuple[int, int, int]:
+    value = color.strip().lstrip('#')
+    if value.lower().startswith('0x'):
+        value = value[2:]
+    try:
+        return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+    except (ValueError, IndexError):
+        return 0, 255, 0
+
+
+def chroma_key_uv(color: str) -> Tuple[int, int]:
+    """U/V da cor-chave, com a mesma aritmética inteira (JPEG, faixa completa) do FFmpeg."""
+
+    r, g, b = _parse_color(color)
+    u = ((-_fix(0.16874) * r - _fix(0.33126) * g + _fix(0.50000) * b + _ONE_HALF - 1) >> _SCALEBITS) + 128
+    v = ((_fix(0.50000) * r - _fix(0.41869) * g - _fix(0.08131) * b + _ONE_HALF - 1) >> _SCALEBITS) + 128
+    return u, v
+
+
+def rgb_to_uv(r: int, g: int, b: int) -> Tuple[int, int]:
+    """U/V de um pixel como o ``format=rgba`` → ``yuva444p`` do FFmpeg entrega ao filtro (BT.601, faixa limitada)."""
+
+    u = 128 + (-0.148223 * r - 0.290993 * g + 0.439216 * b)
+    v = 128 + (0.439216 * r - 0.367788 * g - 0.071427 * b)
+    return min(255, max(0, int(round(u)))), min(255, max(0, int(round(v))))
+
+
+def _alpha_from_distance(diff: float, similarity: float, blend: float) -> int:
+    if blend > 0.0001:
+        return int(min(1.0, max(0.0, (diff - similarity) / blend)) * 255.0)
+    return 255 if diff > similarity else 0
+
+
+def _chroma_alpha_numpy(rgb: "np.ndarray", key_uv: Tuple[int, int], similarity: float, blend: float) -> "np.ndarray":
+    rgb = rgb.astype(np.float64)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    u = np.clip(np.rint(128 + (-0.148223 * r - 0.290993 * g + 0.439216 * b)), 0, 255)
+    v = np.clip(np.rint(128 + (0.439216 * r - 0.367788 * g - 0.071427 * b)), 0, 255)
+    distance = np.sqrt(((u - key_uv[0]) ** 2 + (v - key_uv[1]) ** 2) / _DISTANCE_SCALE)
+
+    # Média da distância na vizinhança 3x3, com as bordas repetidas, como o filtro faz.
+    padded = np.pad(distance, 1, mode='edge')
+    height, width = distance.shape
+    diff = sum(padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3)) / 9.0
+
+    if blend > 0.0001:
+        alpha = np.clip((diff - similarity) / blend, 0.0, 1.0) * 255.0
+    else:
+        alpha = np.where(diff > similarity, 255.0, 0.0)
+    return alpha.astype(np.uint8)
+
+
+def _chroma_alpha_python(image: Image.Image, key_uv: Tuple[int, int], similarity: float, blend: float) -> List[int]:
+    width, height = image.size
+    data = image.tobytes()
+    uv_cache = {}
+    distance: List[float] = []
+    for pixel in zip(data[0::4], data[1::4], data[2::4]):
+        value = uv_cache.get(pixel)
+        if value is None:
+            u, v = rgb_to_uv(*pixel)
+            value = math.sqrt(((u - key_uv[0]) ** 2 + (v - key_uv[1]) ** 2) / _DISTANCE_SCALE)
+            uv_cache[pixel] = value
+        distance.append(value)
+
+    alpha: List[int] = []
+    for y in range(height):
+        starts = [min(height - 1, max(0, y + dy)) * width for dy in (-1, 0, 1)]
+        rows = [distance[start:start + width] for start in starts]
+        for x in range(width):
+            left, right = max(0, x - 1), min(width - 1, x + 1)
+            diff = sum(row[left] + row[x] + row[right] for row in rows) / 9.0
+            alpha.append(_alpha_from_distance(diff, similarity, blend))
+    return alpha
+
+
+def apply_chroma_key(image: Image.Image, color: str, similarity: float, blend: float) -> Image.Image:
+    """Retorna ``image`` em RGBA com o alpha calculado como o ``chromakey=color:similarity:blend``.
+
+    Com numpy a conta é vetorizada (milissegundos para um quadro de
+    pré-visualização); sem ele, um laço em Python puro dá o mesmo resultado.
+    """
+
+    rgba = image.convert('RGBA')
+    key_uv = chroma_key_uv(color)
+    if np is not None:
+        pixels = np.asarray(rgba).copy()
+        pixels[..., 3] = _chroma_alpha_numpy(pixels[..., :3], key_uv, similarity, blend)
+        return Image.fromarray(pixels, 'RGBA')
+
+    alpha = Image.new('L', rgba.size)
+    alpha.putdata(_chroma_alpha_python(rgba, key_uv, similarity, blend))
+    rgba.putalpha(alpha)
+    return rgba
+
+
+def decode_preview_frame(path: str, ffmpeg_path: str, max_height: int = 480, timeout: float = 15) -> Optional[Image.Image]:
+    """Decodifica um quadro representativo de ``path`` (perto de 1 s, ou do meio em clipes curtos)."""
+
+    if not path or not os.path.isfile(path):
+        return None
+    seek = 1.0
+    props = probe_media_properties(path, ffmpeg_path)
+    try:
+        seek = min(seek, float(props['format']['duration']) / 2) if props else seek
+    except (KeyError, TypeError, ValueError):
+        pass
+    cmd = [
+        ffmpeg_path, '-hide_banner', '-nostats', '-v', 'error',
+        '-ss', f"{max(0.0, seek):.3f}",
+        '-i', os.path.normpath(path),
+        '-vf', f"scale=w=-2:h='min(ih,{int(max_height)})',format=rgb24",
+        '-frames:v', '1',
+        '-an',
+        '-f', 'image2pipe',
+        '-c:v', 'png',
+        'pipe:1',
+    ]
+    frame = capture_frame(cmd, timeout)
+    if frame is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(frame)) as img:
+            return img.convert('RGB')
+    except OSError as exc:
+        logger.warning("Quadro de pré-visualização inválido para '%s': %s", os.path.basename(path), exc)
+        return None
@@ -0,0 +1,262 @@
+"""Controle adaptativo de quantos processos FFmpeg rodam ao mesmo tempo."""
+
+from __future__ import annotations
+
+import ctypes
+import logging
+import os
+import platform
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from .process_manager import process_manager
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "SystemSample",
+    "AdaptiveConcurrencyController",
+    "concurrency_controller",
+    "sample_system",
+]
+
+
+def _clock_ticks() -> int:
+    try:
+        return os.sysconf("SC_CLK_TCK")
+    except (AttributeError, ValueError, OSError):
+        return 100
+
+
+_CLOCK_TICKS = _clock_ticks()
+
+
+@dataclass
+class SystemSample:
+    """Leitura pontual da máquina; campos ``None`` indicam métrica indisponível na plataforma."""
+
+    cpu_count: int
+    load_ratio: Optional[float]
+    mem_available_ratio: Optional[float]
+    ffmpeg_cores: Optional[float]
+    running: int
+
+
+def _load_ratio(cpu_count: int) -> Optional[float]:
+    try:
+        return os.getloadavg()[0] / cpu_count
+    except (AttributeError, OSError):
+        return None
+
+
+def _mem_available_ratio() -> Optional[float]:
+    try:
+        info: Dict[str, int] = {}
+        with open("/proc/meminfo", "r", encoding="ascii") as src:
+            for line in src:
+                key, _, value = line.partition(":")
+                fields = value.split()
+                if fields and fields[0].isdigit():
+                    info[key] = int(fields[0])
+        return info["MemAvailable"] / info["MemTotal"]
+    except (OSError, KeyError, ZeroDivisionError):
+        pass
+
+    if platform.system() == "Windows":
+        class _MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(_MemoryStatus)
+        try:
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)) and status.ullTotalPhys:  # type: ignore[attr-defined]
+                return status.ullAvailPhys / status.ullTotalPhys
+        except (AttributeError, OSError):
+            return None
+    return None
+
+
+def _process_cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat", "r", encoding="ascii") as src:
+            fields = src.read().rsplit(")", 1)[1].split()
+        # utime e stime são os campos 14 e 15 do stat (índices 11 e 12 após o nome).
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class _ProcessCpuTracker:
+    """Converte o tempo de CPU acumulado dos FFmpeg ativos em núcleos ocupados."""
+
+    def __init__(self) -> None:
+        self._last: Dict[int, float] = {}
+        self._last_time: Optional[float] = None
+
+    def sample(self, pids) -> Optional[float]:
+        now = time.monotonic()
+        current = {pid: cpu for pid in pids if (cpu := _process_cpu_seconds(pid)) is not None}
+        previous, previous_time = self._last, self._last_time
+        self._last, self._last_time = current, now
+        if previous_time is None or not current or now <= previous_time:
+            return None
+        used = sum(cpu - previous[pid] for pid, cpu in current.items() if pid in previous)
+        return max(0.0, used / (now - previous_time))
+
+
+_cpu_tracker = _ProcessCpuTracker()
+
+
+def sample_system() -> SystemSample:
+    cpu_count = os.cpu_count() or 1
+    with process_manager.lock:
+        pids = list(process_manager.active_processes)
+    return SystemSample(
+        cpu_count=cpu_count,
+        load_ratio=_load_ratio(cpu_count),
+        mem_available_ratio=_mem_available_ratio(),
+        ffmpeg_cores=_cpu_tracker.sample(pids),
+        running=len(pids),
+    )
+
+
+class AdaptiveConcurrencyController:
+    """Limita os ``execute_ffmpeg`` simultâneos e ajusta o limite pela pressão da máquina.
+
+    A cada ``interval`` segundos amostra a carga média por núcleo, a memória
+    disponível e os núcleos consumidos pelos FFmpeg ativos. Reduz o limite
+    sob pressão (carga ou memória) e o aumenta quando há trabalhos à espera e
+    folga de CPU — encodes NVENC quase não ocupam a CPU e deixam espaço para
+    outros, enquanto o libx264 já satura todos os núcleos sozinho. Após cada
+    mudança espera ``cooldown`` amostras, pois a carga média reage devagar.
+    """
+
+    def __init__(
+        self,
+        min_jobs: int = 1,
+        max_jobs: Optional[int] = None,
+        initial_jobs: int = 2,
+        interval: float = 2.0,
+        cooldown: int = 3,
+        high_load: float = 1.25,
+        low_load: float = 0.75,
+        min_free_memory: float = 0.10,
+        sampler: Callable[[], SystemSample] = sample_system,
+    ) -> None:
+        self.min_jobs = max(1, min_jobs)
+        self.max_jobs = max(self.min_jobs, max_jobs or max(2, (os.cpu_count() or 2) // 2))
+        self.limit = min(self.max_jobs, max(self.min_jobs, initial_jobs))
+        self.interval = interval
+        self.cooldown = cooldown
+        self.high_load = high_load
+        self.low_load = low_load
+        self.min_free_memory = min_free_memory
+        self._sampler = sampler
+        self._running = 0
+        self._waiting = 0
+        self._hold = 0
+        self._condition = threading.Condition()
+        self._monitor: Optional[threading.Thread] = None
+
+    def configure(self, min_jobs: Optional[int] = None, max_jobs: Optional[int] = None) -> None:
+        with self._condition:
+            if min_jobs:
+                self.min_jobs = max(1, int(min_jobs))
+            if max_jobs:
+                self.max_jobs = max(self.min_jobs, int(max_jobs))
+            self.limit = min(self.max_jobs, max(self.min_jobs, self.limit))
+            self._condition.notify_all()
+
+    def decide(self, sample: SystemSample) -> int:
+        """Aplica uma amostra e retorna o novo limite, registrando a decisão no log."""
+
+        with self._condition:
+            previous = self.limit
+            memory_low = sample.mem_available_ratio is not None and sample.mem_available_ratio < self.min_free_memory
+            overloaded = sample.load_ratio is not None and sample.load_ratio > self.high_load
+            per_job = (sample.ffmpeg_cores / sample.running) if sample.ffmpeg_cores is not None and sample.running else None
+            cpu_headroom = per_job is None or (sample.ffmpeg_cores or 0.0) + per_job <= sample.cpu_count * 0.9
+            idle = sample.load_ratio is None or sample.load_ratio < self.low_load
+
+            if memory_low:
+                # Falta de memória reduz já, mesmo durante a espera, para não entrar em swap.
+                self.limit = max(self.min_jobs, self.limit - 1)
+                reason = "memória baixa"
+            elif self._hold > 0:
+                self._hold -= 1
+                reason = "aguardando estabilizar"
+            elif overloaded:
+                self.limit = max(self.min_jobs, self.limit - 1)
+                reason = "carga alta"
+            elif self._waiting and self._running >= self.limit and idle and cpu_headroom:
+                self.limit = min(self.max_jobs, self.limit + 1)
+                reason = "folga de CPU com trabalhos na fila"
+            else:
+                reason = "estável"
+
+            if self.limit != previous:
+                self._hold = self.cooldown
+                self._condition.notify_all()
+            log = logger.info if self.limit != previous else logger.debug
+            log(
+                "Concorrência FFmpeg %d -> %d (%s): carga/núcleo=%s, memória livre=%s, núcleos FFmpeg=%s, ativos=%d, na fila=%d",
+                previous, self.limit, reason,
+                f"{sample.load_ratio:.2f}" if sample.load_ratio is not None else "n/d",
+                f"{sample.mem_available_ratio:.0%}" if sample.mem_available_ratio is not None else "n/d",
+                f"{sample.ffmpeg_cores:.1f}" if sample.ffmpeg_cores is not None else "n/d",
+                self._running, self._waiting,
+            )
+            return self.limit
+
+    def _monitor_loop(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._condition:
+                if not self._running and not self._waiting:
+                    self._monitor = None
+                    return
+            try:
+                self.decide(self._sampler())
+            except Exception as exc:  # pragma: no cover - amostragem defensiva
+                logger.warning("Falha ao amostrar a carga do sistema: %s", exc)
+
+    def _ensure_monitor(self) -> None:
+        if self._monitor is None:
+            self._monitor = threading.Thread(target=self._monitor_loop, name="ffmpeg-concurrency", daemon=True)
+            self._monitor.start()
+
+    def acquire(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Espera por uma vaga; ``False`` se ``cancel_event`` for acionado antes."""
+
+        with self._condition:
+            self._waiting += 1
+            self._ensure_monitor()
+            try:
+                while self._running >= self.limit:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return False
+                    self._condition.wait(timeout=0.2)
+                self._running += 1
+                return True
+            finally:
+                self._waiting -= 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._running = max(0, self._running - 1)
+            self._condition.notify()
+
+
+concurrency_controller = AdaptiveConcurrencyController()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import locale
+import math
 import logging
 import os
 import platform
@@ -11,19 +12,26 @@ import shutil
 import subprocess
 import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
 from queue import Empty, Queue
 from typing import Callable, Dict, List, Optional, Tuple
 
+from .concurrency import concurrency_controller
 from .process_manager import process_manager
+from .retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
     "stream_reader",
     "execute_ffmpeg",
+    "FFmpegOutcome",
     "escape_ffmpeg_path",
     "probe_media_properties",
+    "probe_last_keyframe",
+    "measure_loudness",
+    "capture_frame",
     "get_codec_params",
 ]
 
@@ -55,6 +63,40 @@ def stream_reader(stream, line_queue: Queue) -> None:
             pass
 
 
+@dataclass
+class FFmpegOutcome:
+    """Resultado de uma execução do FFmpeg, com o necessário para decidir uma nova tentativa."""
+
+    success: bool
+    returncode: Optional[int] = None
+    stalled: bool = False
+    cancelled: bool = False
+    output: str = ""
+
+    @property
+    def transient(self) -> bool:
+        """Falhas que tendem a passar sozinhas: travamentos, E/S de rede, processo morto por sinal."""
+
+        if self.success or self.cancelled:
+            return False
+        if self.stalled or (self.returncode is not None and self.returncode < 0):
+            return True
+        lowered = self.output.lower()
+        return any(marker in lowered for marker in _TRANSIENT_ERROR_MARKERS)
+
+
+_TRANSIENT_ERROR_MARKERS = (
+    "input/output error",
+    "connection reset",
+    "connection timed out",
+    "resource temporarily unavailable",
+    "broken pipe",
+    "stale file handle",
+    "no space left on device",
+)
+_RESUMABLE_EXTENSIONS = ('.ts', '.mkv')
+
+
 def execute_ffmpeg(
     cmd: List[str],
     duration: float,
@@ -62,13 +104,150 @@ def execute_ffmpeg(
     cancel_event: threading.Event,
     log_prefix: str,
     progress_queue: Queue,
+    policy: Optional[RetryPolicy] = None,
+) -> bool:
+    """Executa o FFmpeg (fora de pausa e com vaga no controle de concorrência) segundo ``policy``.
+
+    Falhas transitórias são repetidas com espera crescente. Com
+    ``policy.resume_partial`` e saída em contêiner legível após interrupção, a
+    parte já codificada até o último keyframe é preservada e a nova tentativa
+    codifica só o restante, juntando os segmentos ao final.
+    """
+
+    policy = policy or RetryPolicy()
+    output_path = cmd[-1]
+    resumable = policy.resume_partial and _is_resumable_output(cmd)
+    segments: List[str] = []
+    offset = 0.0
+
+    for attempt in range(1, policy.attempts + 1):
+        if not process_manager.wait_if_paused(cancel_event) or not concurrency_controller.acquire(cancel_event):
+            progress_queue.put(("status", f"[{log_prefix}] Cancelado antes de iniciar o FFmpeg.", "warning"))
+            _discard_files(segments)
+            return False
+        attempt_cmd = [*cmd[:-1], "-ss", f"{offset:.3f}", cmd[-1]] if offset > 0 else cmd
+        try:
+            outcome = _run_ffmpeg_process(attempt_cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue, policy, offset)
+        finally:
+            concurrency_controller.release()
+
+        if outcome.success:
+            if segments and not _join_segments(cmd[0], [*segments, output_path], output_path, cancel_event, log_prefix, progress_queue):
+                _discard_files(segments)
+                return False
+            _discard_files(segments)
+            return True
+        if outcome.cancelled or cancel_event.is_set() or attempt >= policy.attempts or not outcome.transient:
+            _discard_files(segments)
+            return False
+
+        if resumable:
+            salvaged = _salvage_partial_output(cmd[0], output_path, len(segments), cancel_event, log_prefix, progress_queue)
+            if salvaged:
+                segment_path, salvaged_seconds = salvaged
+                segments.append(segment_path)
+                offset += salvaged_seconds
+
+        delay = policy.delay(attempt)
+        resume_note = f" a partir de {offset:.1f}s" if offset > 0 else " do início"
+        progress_queue.put((
+            "status",
+            f"[{log_prefix}] Falha transitória; nova tentativa {attempt + 1}/{policy.attempts}{resume_note} em {delay:.0f}s...",
+            "warning",
+        ))
+        logger.warning("[%s] Nova tentativa %d/%d em %.1fs (offset %.3fs).", log_prefix, attempt + 1, policy.attempts, delay, offset)
+        if cancel_event.wait(delay):
+            _discard_files(segments)
+            return False
+
+    _discard_files(segments)
+    return False
+
+
+def _is_resumable_output(cmd: List[str]) -> bool:
+    if os.path.splitext(str(cmd[-1]))[1].lower() in _RESUMABLE_EXTENSIONS:
+        return True
+    return any("frag_keyframe" in str(arg) for arg in cmd)
+
+
+def _discard_files(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _salvage_partial_output(
+    ffmpeg_path: str,
+    output_path: str,
+    segment_index: int,
+    cancel_event: threading.Event,
+    log_prefix: str,
+    progress_queue: Queue,
+) -> Optional[Tuple[str, float]]:
+    """Recorta a saída interrompida no último keyframe; retorna ``(segmento, segundos)``."""
+
+    keyframe = probe_last_keyframe(output_path, ffmpeg_path)
+    if keyframe is None or keyframe < 1.0:
+        return None
+    stem, ext = os.path.splitext(output_path)
+    segment_path = f"{stem}.seg{segment_index}{ext}"
+    trim_cmd = [ffmpeg_path, "-y", "-i", output_path, "-t", f"{keyframe:.3f}", "-map", "0", "-c", "copy", segment_path]
+    outcome = _run_ffmpeg_process(trim_cmd, keyframe, None, cancel_event, f"{log_prefix} (Recuperação)", progress_queue, RetryPolicy(), 0.0)
+    if not outcome.success:
+        _discard_files([segment_path])
+        return None
+    progress_queue.put(("status", f"[{log_prefix}] {keyframe:.1f}s já codificados foram preservados.", "info"))
+    return segment_path, keyframe
+
+
+def _join_segments(
+    ffmpeg_path: str,
+    parts: List[str],
+    output_path: str,
+    cancel_event: threading.Event,
+    log_prefix: str,
+    progress_queue: Queue,
 ) -> bool:
+    stem, ext = os.path.splitext(output_path)
+    list_path = f"{stem}.segments.txt"
+    joined_path = f"{stem}.joined{ext}"
+    with open(list_path, "w", encoding="utf-8") as dst:
+        for part in parts:
+            escaped = Path(part).as_posix().replace("'", "'\\''")
+            dst.write(f"file '{escaped}'\n")
+    join_cmd = [ffmpeg_path, "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-map", "0", "-c", "copy", joined_path]
+    try:
+        outcome = _run_ffmpeg_process(join_cmd, 1.0, None, cancel_event, f"{log_prefix} (Junção)", progress_queue, RetryPolicy(), 0.0)
+        if not outcome.success:
+            _discard_files([joined_path])
+            return False
+        os.replace(joined_path, output_path)
+        return True
+    except OSError as exc:
+        logger.error("[%s] Não foi possível juntar os segmentos recuperados: %s", log_prefix, exc)
+        return False
+    finally:
+        _discard_files([list_path])
+
+
+def _run_ffmpeg_process(
+    cmd: List[str],
+    duration: float,
+    progress_callback: Optional[Callable[[float], None]],
+    cancel_event: threading.Event,
+    log_prefix: str,
+    progress_queue: Queue,
+    policy: RetryPolicy,
+    time_offset: float = 0.0,
+) -> FFmpegOutcome:
     ffmpeg_path = cmd[0]
     if not os.path.isfile(ffmpeg_path):
         error_msg = f"ERRO FATAL: O caminho para o FFmpeg é inválido: '{ffmpeg_path}'"
         progress_queue.put(("status", error_msg, "error"))
         logger.critical("FFmpeg executable check failed: '%s'", ffmpeg_path)
-        return False
+        return FFmpegOutcome(success=False)
 
     logger.info("[%s] Executing FFmpeg: %s", log_prefix, ffmpeg_path)
     progress_queue.put(("status", f"[{log_prefix}] Iniciando processo FFmpeg...", "info"))
@@ -80,16 +259,16 @@ def execute_ffmpeg(
 
     try:
         process = subprocess.Popen(
-            cmd_with_progress,
+            process_manager.wrap_command(cmd_with_progress),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            creationflags=creation_flags,
+            creationflags=creation_flags | process_manager.creation_flags(),
             shell=False,
         )
     except (FileNotFoundError, OSError) as exc:
         logger.critical("Erro ao executar o FFmpeg em '%s': %s", ffmpeg_path, exc, exc_info=True)
         progress_queue.put(("status", f"Erro crítico ao executar o FFmpeg: {exc}", "error"))
-        return False
+        return FFmpegOutcome(success=False, output=str(exc))
 
     process_manager.add(process)
 
@@ -101,9 +280,10 @@ def execute_ffmpeg(
 
     full_output = ""
     last_reported_pct = 0.0
-    stall_warning_threshold = 45.0
+    stall_warning_threshold = policy.stall_warning_seconds
     stall_warning_interval = 15.0
-    stall_abort_threshold = 120.0
+    stall_abort_threshold = policy.stall_abort_seconds
+    cancelled = False
     last_activity_time = time.monotonic()
     last_progress_time = last_activity_time
     last_progress_pct = 0.0
@@ -116,7 +296,9 @@ def execute_ffmpeg(
         if cancel_event.is_set():
             logger.warning("[%s] Cancelamento solicitado. Encerrando FFmpeg %s.", log_prefix, process.pid)
             progress_queue.put(("status", f"[{log_prefix}] Cancelamento em andamento...", "warning"))
+            process_manager.resume()
             process.terminate()
+            cancelled = True
             break
 
         try:
@@ -143,6 +325,8 @@ def execute_ffmpeg(
                         except ValueError:
                             current_time_sec = None
 
+                    if current_time_sec is not None:
+                        current_time_sec += time_offset
                     if current_time_sec is not None and duration > 0:
                         progress_pct = min(current_time_sec / duration, 1.0)
                         if (
@@ -168,6 +352,11 @@ def execute_ffmpeg(
                         logger.debug("[%s/ffmpeg] %s", log_prefix, stripped_line)
         except Empty:
             now = time.monotonic()
+            if process_manager.paused:
+                # Processo suspenso não envia progresso; a pausa não conta como travamento.
+                last_activity_time = last_progress_time = now
+                last_warning_bucket = 0
+                continue
             inactive_duration = now - last_activity_time
             progress_inactive_duration = now - last_progress_time
 
@@ -196,7 +385,7 @@ def execute_ffmpeg(
         if progress_callback:
             progress_callback(1.0)
         progress_queue.put(("status", f"[{log_prefix}] Comando concluído", "info"))
-        return True
+        return FFmpegOutcome(success=True, returncode=0)
 
     if stalled and process.returncode == 0:
         process.returncode = -1
@@ -217,7 +406,13 @@ def execute_ffmpeg(
     error_snippet = "\n".join(error_lines[-3:]) if error_lines else "\n".join(full_output.strip().split("\n")[-5:])
 
     progress_queue.put(("status", f"[{log_prefix}] ERRO no FFmpeg: {error_snippet}", "error"))
-    return False
+    return FFmpegOutcome(
+        success=False,
+        returncode=process.returncode,
+        stalled=stalled,
+        cancelled=cancelled,
+        output="\n".join(full_output.strip().splitlines()[-20:]),
+    )
 
 
 def escape_ffmpeg_path(path_str: str) -> str:
@@ -229,10 +424,7 @@ def escape_ffmpeg_path(path_str: str) -> str:
     )
 
 
-def probe_media_properties(path: str, ffmpeg_path: str) -> Optional[Dict[str, Any]]:
-    if not path or not os.path.isfile(path):
-        return None
-
+def _resolve_ffprobe_path(ffmpeg_path: str) -> str:
     ffprobe_exe_name = "ffprobe.exe" if platform.system() == "Windows" else "ffprobe"
 
     final_ffprobe_path = ""
@@ -248,7 +440,16 @@ def probe_media_properties(path: str, ffmpeg_path: str) -> Optional[Dict[str, An
             final_ffprobe_path = found_in_path
         else:
             logger.error("ffprobe não encontrado. Verifique o caminho do FFmpeg ou o PATH do sistema.")
-            return None
+    return final_ffprobe_path
+
+
+def probe_media_properties(path: str, ffmpeg_path: str) -> Optional[Dict[str, Any]]:
+    if not path or not os.path.isfile(path):
+        return None
+
+    final_ffprobe_path = _resolve_ffprobe_path(ffmpeg_path)
+    if not final_ffprobe_path:
+        return None
 
     try:
         cmd = [
@@ -281,6 +482,133 @@ def probe_media_properties(path: str, ffmpeg_path: str) -> Optional[Dict[str, An
         return None
 
 
+def probe_last_keyframe(path: str, ffmpeg_path: str) -> Optional[float]:
+    """Instante (s) do último keyframe de vídeo legível em ``path``, mesmo se truncado."""
+
+    if not path or not os.path.isfile(path):
+        return None
+    ffprobe_path = _resolve_ffprobe_path(ffmpeg_path)
+    if not ffprobe_path:
+        return None
+    cmd = [
+        ffprobe_path,
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-skip_frame",
+        "nokey",
+        "-show_entries",
+        "frame=pts_time",
+        "-of",
+        "csv=p=0",
+        os.path.normpath(path),
+    ]
+    try:
+        creation_flags = subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=60,
+            creationflags=creation_flags,
+            encoding="utf-8",
+            errors="ignore",
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.warning("Não foi possível localizar keyframes em '%s': %s", Path(path).name, exc)
+        return None
+    keyframes = []
+    for line in result.stdout.splitlines():
+        try:
+            keyframes.append(float(line.strip().strip(",")))
+        except ValueError:
+            continue
+    return max(keyframes) if keyframes else None
+
+
+_LOUDNORM_FIELDS = ("input_i", "input_tp", "input_lra", "input_thresh")
+
+
+def measure_loudness(
+    path: str,
+    ffmpeg_path: str,
+    target_i: float = -16.0,
+    target_tp: float = -1.5,
+    target_lra: float = 11.0,
+    timeout: float = 900,
+) -> Optional[Dict[str, float]]:
+    """Primeira passagem do ``loudnorm`` (EBU R128): mede ``path`` sem gerar saída.
+
+    Retorna ``input_i``, ``input_tp``, ``input_lra`` e ``input_thresh``; ``None``
+    se o FFmpeg falhar ou o áudio for silencioso (loudness ``-inf``).
+    """
+
+    if not path or not os.path.isfile(path):
+        return None
+    cmd = [
+        ffmpeg_path,
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        os.path.normpath(path),
+        "-vn",
+        "-af",
+        f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}:print_format=json",
+        "-f",
+        "null",
+        "-",
+    ]
+    try:
+        creation_flags = subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            creationflags=creation_flags,
+            encoding="utf-8",
+            errors="ignore",
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.warning("Não foi possível medir o loudness de '%s': %s", Path(path).name, exc)
+        return None
+
+    stderr = result.stderr or ""
+    start, end = stderr.rfind("{"), stderr.rfind("}")
+    if result.returncode != 0 or start < 0 or end < start:
+        logger.warning("Medição de loudness falhou para '%s'.", Path(path).name)
+        return None
+    try:
+        payload = json.loads(stderr[start:end + 1])
+        measurement = {field: float(payload[field]) for field in _LOUDNORM_FIELDS}
+    except (ValueError, KeyError, TypeError):
+        return None
+    if any(math.isinf(value) or math.isnan(value) for value in measurement.values()):
+        return None
+    return measurement
+
+
+def capture_frame(cmd: List[str], timeout: float = 30) -> Optional[bytes]:
+    """Executa ``cmd`` (que grava um único quadro em ``pipe:1``) e retorna os bytes da imagem.
+
+    Não passa pelo gerenciador de processos: é uma chamada curta, usada pelas
+    pré-visualizações, que não deve esperar por vagas dos jobs de renderização.
+    """
+
+    try:
+        creation_flags = subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout, creationflags=creation_flags)
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.warning("Falha ao extrair quadro de pré-visualização: %s", exc)
+        return None
+    if result.returncode != 0 or not result.stdout:
+        stderr = (result.stderr or b"").decode("utf-8", errors="ignore").strip().splitlines()
+        logger.warning("FFmpeg não gerou o quadro de pré-visualização: %s", stderr[-1] if stderr else result.returncode)
+        return None
+    return result.stdout
+
+
 def get_codec_params(params: Dict[str, Any], force_reencode: bool = False) -> List[str]:
     video_codec_choice = params.get("video_codec", "Automático")
     available_encoders = params.get("available_encoders", [])
@@ -3,36 +3,185 @@
 from __future__ import annotations
 
 import atexit
+import ctypes
 import logging
+import os
+import platform
+import shutil
+import signal
 import threading
 import subprocess
-from typing import Dict
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["FFmpegProcessManager", "process_manager"]
+__all__ = ["FFMPEG_PRIORITIES", "FFmpegProcessManager", "process_manager"]
+
+# Prioridade exibida na interface -> (niceness, argumentos do ionice, classe de prioridade do Windows).
+FFMPEG_PRIORITIES: Dict[str, tuple] = {
+    "Normal": (0, (), 0),
+    "Baixa": (10, ("-c", "2", "-n", "7"), 0x00004000),  # BELOW_NORMAL_PRIORITY_CLASS
+    "Ociosa": (19, ("-c", "3"), 0x00000040),  # IDLE_PRIORITY_CLASS
+}
 
 
 class FFmpegProcessManager:
-    """Gerencia processos FFmpeg em execução para garantir a limpeza na saída."""
+    """Gerencia processos FFmpeg em execução para garantir a limpeza na saída.
+
+    Também aplica a prioridade configurada aos novos processos e, com
+    ``pin_cores``, divide os núcleos disponíveis em blocos exclusivos para
+    cada encode simultâneo, redistribuindo-os sempre que um processo entra ou sai.
+
+    ``pause`` suspende os FFmpeg ativos (SIGSTOP; ``NtSuspendProcess`` no
+    Windows) e segura novos trabalhos em :meth:`wait_if_paused` até ``resume``.
+    """
 
     def __init__(self) -> None:
         self.active_processes: Dict[int, subprocess.Popen] = {}
         self.lock = threading.Lock()
+        self.priority = "Normal"
+        self.pin_cores = False
+        self._resumed = threading.Event()
+        self._resumed.set()
         atexit.register(self.shutdown)
 
+    def configure(self, priority: Optional[str] = None, pin_cores: Optional[bool] = None) -> None:
+        if priority is not None:
+            if priority in FFMPEG_PRIORITIES:
+                self.priority = priority
+            else:
+                logger.warning("Prioridade de FFmpeg desconhecida '%s'; mantendo '%s'.", priority, self.priority)
+        if pin_cores is not None:
+            self.pin_cores = bool(pin_cores) and hasattr(os, "sched_setaffinity")
+
+    def wrap_command(self, cmd: List[str]) -> List[str]:
+        """Prefixa ``nice``/``ionice`` para que todas as threads do FFmpeg já nasçam com a prioridade."""
+
+        niceness, ionice_args, _ = FFMPEG_PRIORITIES[self.priority]
+        if platform.system() == "Windows" or not niceness:
+            return list(cmd)
+        prefix: List[str] = []
+        nice_path = shutil.which("nice")
+        if nice_path:
+            prefix += [nice_path, "-n", str(niceness)]
+        ionice_path = shutil.which("ionice")
+        if ionice_path and ionice_args:
+            prefix += [ionice_path, *ionice_args]
+        return prefix + list(cmd)
+
+    def creation_flags(self) -> int:
+        if platform.system() != "Windows":
+            return 0
+        return FFMPEG_PRIORITIES[self.priority][2]
+
     def add(self, process: subprocess.Popen) -> None:
         with self.lock:
             self.active_processes[process.pid] = process
             logger.debug("Processo %s adicionado. Total: %s", process.pid, len(self.active_processes))
+            if self.paused:
+                # Iniciado durante a pausa (corrida com ``pause``): suspende já.
+                self._signal_process(process, suspend=True)
+        if self.pin_cores:
+            self.rebalance_affinity()
 
     def remove(self, process: subprocess.Popen) -> None:
         with self.lock:
             if process.pid in self.active_processes:
                 del self.active_processes[process.pid]
                 logger.debug("Processo %s removido. Restantes: %s", process.pid, len(self.active_processes))
+        if self.pin_cores:
+            self.rebalance_affinity()
+
+    @staticmethod
+    def _core_blocks(cores: List[int], jobs: int) -> List[List[int]]:
+        """Divide ``cores`` em ``jobs`` blocos contíguos de tamanho quase igual."""
+
+        jobs = max(1, min(jobs, len(cores)))
+        size, extra = divmod(len(cores), jobs)
+        blocks, start = [], 0
+        for index in range(jobs):
+            end = start + size + (1 if index < extra else 0)
+            blocks.append(cores[start:end])
+            start = end
+        return blocks
+
+    @staticmethod
+    def _set_affinity(pid: int, cores: List[int]) -> None:
+        # No Linux a afinidade é por thread: aplica a todas as threads já criadas pelo FFmpeg.
+        try:
+            thread_ids = [int(tid) for tid in os.listdir(f"/proc/{pid}/task")]
+        except OSError:
+            thread_ids = [pid]
+        for tid in thread_ids:
+            try:
+                os.sched_setaffinity(tid, cores)
+            except OSError:
+                continue
+
+    def rebalance_affinity(self) -> None:
+        with self.lock:
+            pids = sorted(pid for pid, process in self.active_processes.items() if process.poll() is None)
+        if not pids:
+            return
+        try:
+            cores = sorted(os.sched_getaffinity(0))
+        except (AttributeError, OSError):
+            return
+        blocks = self._core_blocks(cores, len(pids))
+        for index, pid in enumerate(pids):
+            block = blocks[index % len(blocks)]
+            self._set_affinity(pid, block)
+            logger.debug("Processo %s fixado nos núcleos %s.", pid, block)
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    @staticmethod
+    def _signal_process(process: subprocess.Popen, suspend: bool) -> bool:
+        if process.poll() is not None:
+            return False
+        try:
+            if platform.system() == "Windows":
+                ntdll = ctypes.windll.ntdll  # type: ignore[attr-defined]
+                handle = int(process._handle)  # type: ignore[attr-defined]
+                status = ntdll.NtSuspendProcess(handle) if suspend else ntdll.NtResumeProcess(handle)
+                return status == 0
+            os.kill(process.pid, signal.SIGSTOP if suspend else signal.SIGCONT)
+            return True
+        except (AttributeError, OSError) as exc:
+            logger.warning("Não foi possível %s o processo %s: %s", "suspender" if suspend else "retomar", process.pid, exc)
+            return False
+
+    def pause(self) -> int:
+        """Suspende os FFmpeg ativos e bloqueia novos; retorna quantos processos foram suspensos."""
+
+        with self.lock:
+            self._resumed.clear()
+            suspended = sum(self._signal_process(process, suspend=True) for process in self.active_processes.values())
+        logger.info("Processamento pausado: %s processo(s) FFmpeg suspenso(s).", suspended)
+        return suspended
+
+    def resume(self) -> int:
+        with self.lock:
+            if not self.paused:
+                return 0
+            resumed = sum(self._signal_process(process, suspend=False) for process in self.active_processes.values())
+            self._resumed.set()
+        logger.info("Processamento retomado: %s processo(s) FFmpeg continuam.", resumed)
+        return resumed
+
+    def wait_if_paused(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Bloqueia enquanto pausado; ``False`` se ``cancel_event`` for acionado durante a espera."""
+
+        while not self._resumed.wait(timeout=0.2):
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+        return not (cancel_event is not None and cancel_event.is_set())
 
     def terminate_all(self) -> None:
+        # Processos suspensos não tratam SIGTERM até serem retomados.
+        self.resume()
         with self.lock:
             if not self.active_processes:
                 return
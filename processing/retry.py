@@ -0,0 +1,78 @@
+"""Políticas de nova tentativa por etapa para as execuções do FFmpeg."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "RetryPolicy",
+    "DEFAULT_STAGE_POLICIES",
+    "retry_policy_for",
+]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Quantas vezes repetir uma etapa, com que espera e quando considerá-la travada.
+
+    ``resume_partial`` permite retomar do último keyframe íntegro em vez de
+    recomeçar do zero — só é aplicado quando o contêiner de saída continua
+    legível após uma interrupção (MPEG-TS, Matroska ou MP4 fragmentado).
+    """
+
+    attempts: int = 1
+    backoff_seconds: float = 5.0
+    backoff_factor: float = 2.0
+    stall_warning_seconds: float = 45.0
+    stall_abort_seconds: float = 120.0
+    resume_partial: bool = False
+
+    def delay(self, retry_index: int) -> float:
+        """Espera antes da ``retry_index``-ésima nova tentativa (1 = primeira)."""
+
+        return max(0.0, self.backoff_seconds * (self.backoff_factor ** max(0, retry_index - 1)))
+
+
+DEFAULT_STAGE_POLICIES: Dict[str, RetryPolicy] = {
+    'final': RetryPolicy(attempts=2),
+    'intro': RetryPolicy(attempts=2),
+    'slideshow': RetryPolicy(attempts=2),
+    'music': RetryPolicy(attempts=2, stall_abort_seconds=60.0),
+    'subtitle_overlay': RetryPolicy(attempts=2),
+    'presenter': RetryPolicy(attempts=2),
+    'effect': RetryPolicy(attempts=2),
+    'audio_mix': RetryPolicy(attempts=2, stall_abort_seconds=60.0),
+    'base_video': RetryPolicy(attempts=3, resume_partial=True),
+}
+
+_POLICY_FIELDS = {field.name: field.type for field in dataclasses.fields(RetryPolicy)}
+
+
+def retry_policy_for(stage: str, params: Optional[Dict[str, Any]] = None) -> RetryPolicy:
+    """Política padrão da etapa, ajustada por ``params['ffmpeg_retry_policies'][stage]``."""
+
+    policy = DEFAULT_STAGE_POLICIES.get(stage, RetryPolicy())
+    overrides = ((params or {}).get('ffmpeg_retry_policies') or {}).get(stage)
+    if not isinstance(overrides, dict):
+        return policy
+
+    valid: Dict[str, Any] = {}
+    for key, value in overrides.items():
+        if key not in _POLICY_FIELDS:
+            logger.warning("Opção de nova tentativa desconhecida para '%s': %s", stage, key)
+            continue
+        try:
+            if key == 'resume_partial':
+                valid[key] = bool(value)
+            elif key == 'attempts':
+                valid[key] = max(1, int(value))
+            else:
+                valid[key] = max(0.0, float(value))
+        except (TypeError, ValueError):
+            logger.warning("Valor inválido para '%s.%s': %r", stage, key, value)
+    return dataclasses.replace(policy, **valid)
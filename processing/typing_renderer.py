@@ -4,21 +4,36 @@ from __future__ import annotations
 
 import math
 import os
+import random
+import sys
 import tempfile
 import threading
 import wave
 from array import array
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 from .ffmpeg_pipeline import execute_ffmpeg
+from .retry import retry_policy_for
 from shared import INTRO_FONT_REGISTRY, get_intro_font_candidates, resolve_intro_font_candidate_path
 
 REFERENCE_CHAR_COUNT = 125.0
 DEFAULT_TYPING_DURATION_SECONDS = 10.0
 DEFAULT_HOLD_DURATION_SECONDS = 1.5
 
+TYPING_TONE_AMPLITUDE = 0.35
+TYPING_TONE_FREQUENCY = 1100.0
+TYPING_TONE_RATIO = 0.65
+# Variações de altura pré-calculadas quando há jitter; cada tecla sorteia uma delas.
+TYPING_JITTER_VARIANTS = 9
+
 __all__ = [
     "wrap_text_to_width",
     "generate_typing_audio",
@@ -82,45 +97,77 @@ def wrap_text_to_width(text: str, font: ImageFont.ImageFont, max_width: int) ->
     return lines or [""]
 
 
+@lru_cache(maxsize=64)
+def _keystroke_tone(tone_samples: int, sample_rate: int, frequency: float) -> bytes:
+    """PCM 16-bit de um toque de tecla (seno com envelope), calculado uma única vez."""
+
+    scale = TYPING_TONE_AMPLITUDE * 32767
+    if np is not None:
+        n = np.arange(tone_samples, dtype=np.float64)
+        env = np.sin(math.pi * (n / max(1, tone_samples)))
+        samples = env * scale * np.sin(2 * math.pi * frequency * (n / sample_rate))
+        return samples.astype("<i2").tobytes()
+
+    data = array("h")
+    for n in range(tone_samples):
+        env = math.sin(math.pi * (n / max(1, tone_samples)))
+        data.append(int(env * scale * math.sin(2 * math.pi * frequency * (n / sample_rate))))
+    if sys.byteorder == "big":  # pragma: no cover - WAV é little-endian
+        data.byteswap()
+    return data.tobytes()
+
+
 def generate_typing_audio(
     text: str,
     char_duration: float,
     hold_duration: float,
     output_path: str,
     sample_rate: int = 44100,
+    pitch_jitter: float = 0.0,
 ) -> float:
-    amplitude = 0.35
-    base_frequency = 1100.0
-    tone_ratio = 0.65
-    data = array("h")
+    """Grava o som de digitação de ``text`` em WAV e retorna a duração em segundos.
+
+    Todas as teclas duram o mesmo, então cada bloco (toque + silêncio) é
+    sintetizado uma vez e a faixa é montada juntando os blocos prontos.
+    ``pitch_jitter`` (fração da frequência, ex.: ``0.05``) varia a altura de
+    cada tecla entre algumas variações pré-calculadas, sorteadas de forma
+    reprodutível a partir do texto.
+    """
+
+    total_samples = max(1, int(round(char_duration * sample_rate)))
+    tone_samples = min(max(1, int(round(total_samples * TYPING_TONE_RATIO))), total_samples)
+    silence = bytes(2 * (total_samples - tone_samples))
+    blank_block = bytes(2 * total_samples)
+
+    jitter = max(0.0, min(float(pitch_jitter or 0.0), 0.5))
+    if jitter > 0:
+        steps = TYPING_JITTER_VARIANTS - 1
+        frequencies = [TYPING_TONE_FREQUENCY * (1 - jitter + 2 * jitter * i / steps) for i in range(TYPING_JITTER_VARIANTS)]
+    else:
+        frequencies = [TYPING_TONE_FREQUENCY]
+    key_blocks = [_keystroke_tone(tone_samples, sample_rate, frequency) + silence for frequency in frequencies]
+    rng = random.Random(text)
 
+    blocks: List[bytes] = []
     for char in text:
-        total_samples = max(1, int(round(char_duration * sample_rate)))
-        tone_samples = 0
-        if not char.isspace():
-            tone_samples = max(1, int(round(total_samples * tone_ratio)))
-            tone_samples = min(tone_samples, total_samples)
-
-        for n in range(tone_samples):
-            env = math.sin(math.pi * (n / max(1, tone_samples)))
-            sample = int(env * amplitude * 32767 * math.sin(2 * math.pi * base_frequency * (n / sample_rate)))
-            data.append(sample)
-
-        silence_samples = total_samples - tone_samples
-        if silence_samples > 0:
-            data.extend([0] * silence_samples)
+        if char.isspace():
+            blocks.append(blank_block)
+        elif len(key_blocks) == 1:
+            blocks.append(key_blocks[0])
+        else:
+            blocks.append(key_blocks[rng.randrange(len(key_blocks))])
 
     hold_samples = max(0, int(round(hold_duration * sample_rate)))
-    if hold_samples:
-        data.extend([0] * hold_samples)
+    blocks.append(bytes(2 * hold_samples))
+    pcm = b"".join(blocks)
 
     with wave.open(output_path, "wb") as wav_file:
         wav_file.setnchannels(1)
         wav_file.setsampwidth(2)
         wav_file.setframerate(sample_rate)
-        wav_file.writeframes(data.tobytes())
+        wav_file.writeframes(pcm)
 
-    return len(data) / float(sample_rate)
+    return len(pcm) / 2 / float(sample_rate)
 
 
 def create_typing_intro_clip(
@@ -275,7 +322,13 @@ def create_typing_intro_clip(
     total_duration = total_frames / frame_rate
 
     audio_path = os.path.join(intro_temp_dir, "typing_audio.wav")
-    generate_typing_audio(text, char_duration, hold_duration, audio_path)
+    generate_typing_audio(
+        text,
+        char_duration,
+        hold_duration,
+        audio_path,
+        pitch_jitter=params.get('intro_typing_pitch_jitter') or 0.0,
+    )
 
     intro_clip_path = os.path.join(intro_temp_dir, "typing_intro.mp4")
     frame_pattern = os.path.join(frames_dir, "frame_%05d.png")
@@ -291,7 +344,15 @@ def create_typing_intro_clip(
         "-c:a", "aac", "-shortest", intro_clip_path,
     ]
 
-    if not execute_ffmpeg(cmd_intro, total_duration, None, cancel_event, f"{log_prefix} (Intro)", progress_queue):
+    if not execute_ffmpeg(
+        cmd_intro,
+        total_duration,
+        None,
+        cancel_event,
+        f"{log_prefix} (Intro)",
+        progress_queue,
+        policy=retry_policy_for('intro', params),
+    ):
         return None
 
     return {
@@ -0,0 +1,253 @@
+"""Executa renderizações do editor sem interface gráfica.
+
+Recebe um JSON de parâmetros no mesmo formato produzido por
+``VideoEditorApp._gather_processing_params`` e escreve cada evento do
+``progress_queue`` como uma linha JSON em ``stdout``, o que permite rodar lotes
+em servidores Linux sem monitor, via cron ou em vários hosts ao mesmo tempo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import shutil
+import signal
+import sys
+import threading
+from typing import IO, Any, Dict, Iterable, List, Optional
+
+import license_checker
+from security.runtime_guard import SecurityViolation, enforce_runtime_safety
+from video_processing_logic import process_entrypoint, process_manager
+
+__all__ = [
+    "EXIT_OK",
+    "EXIT_RENDER_FAILED",
+    "EXIT_USAGE",
+    "EXIT_LICENSE",
+    "EXIT_CANCELLED",
+    "MEDIA_TYPES",
+    "build_parser",
+    "load_params",
+    "run",
+    "main",
+]
+
+EXIT_OK = 0
+EXIT_RENDER_FAILED = 1
+EXIT_USAGE = 2
+EXIT_LICENSE = 3
+EXIT_CANCELLED = 130
+
+MEDIA_TYPES = (
+    'video_single',
+    'image_folder',
+    'batch_video',
+    'batch_image',
+    'batch_mixed',
+    'batch_image_hierarchical',
+)
+
+# Chaves que o pipeline lê diretamente (``params[...]``) e que a interface
+# sempre preenche; um JSON escrito à mão pode omiti-las.
+_PARAM_DEFAULTS: Dict[str, Any] = {
+    'resolution': '1920x1080',
+    'video_codec': 'Automático',
+    'narration_volume': 0,
+    'music_volume': -15,
+    'subtitle_style': {},
+    'output_filename_single': 'video_final.mp4',
+    'png_overlay_path': '',
+    'effect_overlay_path': '',
+    'presenter_video_path': '',
+}
+
+logger = logging.getLogger("render_cli")
+
+
+class ParamsError(ValueError):
+    """Arquivo de parâmetros ausente, ilegível ou incompleto."""
+
+
+def _parse_override(raw: str) -> tuple:
+    key, sep, value = raw.partition('=')
+    if not sep or not key.strip():
+        raise ParamsError(f"Substituição inválida '{raw}'; use CHAVE=VALOR.")
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        parsed = value
+    return key.strip(), parsed
+
+
+def load_params(path: str, overrides: Iterable[str] = ()) -> Dict[str, Any]:
+    """Lê o JSON de parâmetros, aplica ``--set`` e valida o essencial."""
+
+    try:
+        if path == '-':
+            loaded = json.load(sys.stdin)
+        else:
+            with open(path, 'r', encoding='utf-8') as src:
+                loaded = json.load(src)
+    except OSError as exc:
+        raise ParamsError(f"Não foi possível ler '{path}': {exc}") from exc
+    except ValueError as exc:
+        raise ParamsError(f"JSON inválido em '{path}': {exc}") from exc
+    if not isinstance(loaded, dict):
+        raise ParamsError("O arquivo de parâmetros deve conter um objeto JSON.")
+
+    params = {**_PARAM_DEFAULTS, **loaded}
+    for raw in overrides:
+        key, value = _parse_override(raw)
+        params[key] = value
+
+    media_type = params.get('media_type')
+    if media_type not in MEDIA_TYPES:
+        raise ParamsError(f"'media_type' deve ser um de: {', '.join(MEDIA_TYPES)} (recebido: {media_type!r}).")
+
+    if not params.get('ffmpeg_path'):
+        params['ffmpeg_path'] = shutil.which('ffmpeg') or ''
+    if not params['ffmpeg_path']:
+        raise ParamsError("'ffmpeg_path' não definido e o FFmpeg não foi encontrado no PATH.")
+
+    output_folder = params.get('output_folder')
+    if not output_folder:
+        raise ParamsError("'output_folder' é obrigatório.")
+    os.makedirs(output_folder, exist_ok=True)
+    return params
+
+
+def _event_to_json(message: tuple) -> Dict[str, Any]:
+    msg_type, *payload = message
+    if msg_type == 'status':
+        return {'event': 'status', 'message': payload[0], 'level': payload[1] if len(payload) > 1 else 'info'}
+    if msg_type in ('progress', 'batch_progress'):
+        return {'event': msg_type, 'value': round(float(payload[0]), 4)}
+    if msg_type == 'finish':
+        return {'event': 'finish', 'success': bool(payload[0])}
+    return {'event': msg_type, 'payload': payload}
+
+
+def run(
+    params: Dict[str, Any],
+    out: IO[str],
+    cancel_event: Optional[threading.Event] = None,
+    show_progress: bool = True,
+) -> int:
+    """Executa ``process_entrypoint`` numa thread e transmite os eventos como JSON."""
+
+    cancel_event = cancel_event or threading.Event()
+    progress_queue: "queue.Queue[tuple]" = queue.Queue()
+    result: List[bool] = []
+
+    def worker() -> None:
+        try:
+            result.append(bool(process_entrypoint(params, progress_queue, cancel_event)))
+        except Exception as exc:  # pragma: no cover - process_entrypoint já trata os erros
+            logger.exception("Falha inesperada: %s", exc)
+            result.append(False)
+
+    thread = threading.Thread(target=worker, name="render-cli", daemon=True)
+    thread.start()
+
+    # A thread principal só consome a fila: assim SIGINT/SIGTERM continuam a ser entregues.
+    while thread.is_alive() or not progress_queue.empty():
+        try:
+            message = progress_queue.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        if not show_progress and message[0] in ('progress', 'batch_progress'):
+            continue
+        out.write(json.dumps(_event_to_json(message), ensure_ascii=False, default=str) + "\n")
+        out.flush()
+    thread.join()
+
+    if cancel_event.is_set():
+        return EXIT_CANCELLED
+    return EXIT_OK if result and result[0] else EXIT_RENDER_FAILED
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Renderiza vídeos do Editor Automático sem interface gráfica.",
+        epilog=(
+            "Códigos de saída: 0 sucesso, 1 falha na renderização, 2 parâmetros inválidos, "
+            "3 licença inválida, 130 cancelado."
+        ),
+    )
+    parser.add_argument("params", help="Arquivo JSON de parâmetros ('-' para ler de stdin)")
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        default=[],
+        metavar="CHAVE=VALOR",
+        help="Substitui um parâmetro (o valor é lido como JSON quando possível). Pode repetir.",
+    )
+    parser.add_argument(
+        "--license-key",
+        default=os.getenv("EDITOR_AUTOMATICO_LICENSE_KEY"),
+        help="Chave para ativar esta máquina caso ainda não haja licença (ou EDITOR_AUTOMATICO_LICENSE_KEY)",
+    )
+    parser.add_argument("--no-progress", action="store_true", help="Não emite eventos de progresso percentual")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostra os logs do pipeline em stderr")
+    return parser
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    try:
+        params = load_params(args.params, args.overrides)
+    except ParamsError as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        enforce_runtime_safety()
+    except SecurityViolation as exc:
+        print(f"Violação de segurança detectada: {exc}", file=sys.stderr)
+        return EXIT_LICENSE
+
+    is_licensed, _license_data, error = license_checker.check_license_headless(args.license_key)
+    if not is_licensed:
+        print(f"Licença inválida: {error}", file=sys.stderr)
+        return EXIT_LICENSE
+
+    cancel_event = threading.Event()
+
+    def request_cancel(signum, _frame) -> None:
+        logger.warning("Sinal %s recebido; cancelando a renderização...", signum)
+        cancel_event.set()
+        process_manager.resume()
+
+    def toggle_pause(_signum, _frame) -> None:
+        if process_manager.paused:
+            process_manager.resume()
+        else:
+            process_manager.pause()
+
+    handlers = {signal.SIGINT: request_cancel}
+    if hasattr(signal, 'SIGTERM'):
+        handlers[signal.SIGTERM] = request_cancel
+    if hasattr(signal, 'SIGUSR1'):
+        handlers[signal.SIGUSR1] = toggle_pause
+    previous = {signum: signal.signal(signum, handler) for signum, handler in handlers.items()}
+    try:
+        return run(params, sys.stdout, cancel_event, show_progress=not args.no_progress)
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry-point
+    sys.exit(main())
@@ -0,0 +1,53 @@
+from collections import Counter
+
+from video_processing.assets import AssetAllocator, AssetPlanner
+from video_processing.utils import _get_music_playlist
+
+
+def test_balanced_allocation_is_reproducible_and_even():
+    assets = [f"v{i}.mp4" for i in range(5)]
+
+    first = AssetAllocator(assets, seed=42, label="videos").take(23)
+    again = AssetAllocator(assets, seed=42, label="videos").take(23)
+    other = AssetAllocator(assets, seed=7, label="videos").take(23)
+
+    assert first == again
+    assert first != other
+    counts = Counter(first)
+    assert max(counts.values()) - min(counts.values()) <= 1
+    assert all(a != b for a, b in zip(first, first[1:]))
+
+
+def test_lru_starts_with_least_recently_used_across_batches(tmp_path):
+    params = {'asset_selection': 'lru', 'asset_seed': 1, 'render_cache_dir': str(tmp_path)}
+    assets = ["a.mp4", "b.mp4", "c.mp4"]
+
+    planner = AssetPlanner(params)
+    used = planner.allocator('videos', assets).take(2)
+    planner.save_usage()
+
+    next_batch = AssetPlanner({**params, 'asset_seed': 99})
+    remaining = [asset for asset in assets if asset not in used]
+    assert next_batch.choose('videos', assets) == remaining[0]
+    assert next_batch.choose('videos', assets) == used[0]
+
+
+def test_music_playlist_uses_known_durations_without_probing(monkeypatch):
+    from video_processing import utils
+
+    monkeypatch.setattr(utils, "_probe_media_properties", lambda *args: (_ for _ in ()).throw(AssertionError("sondou")))
+    music = ["m1.mp3", "m2.mp3", "m3.mp3"]
+    durations = {path: 60.0 for path in music}
+
+    playlist = _get_music_playlist(music, 150, {}, "ffmpeg", AssetAllocator(music, seed=3, label="music"), durations)
+    assert len(playlist) == 3
+    assert sorted(playlist) == music
+    assert playlist == _get_music_playlist(music, 150, {}, "ffmpeg", AssetAllocator(music, seed=3, label="music"), durations)
+
+
+def test_music_playlist_gives_up_when_no_track_is_readable(monkeypatch):
+    from video_processing import utils
+
+    monkeypatch.setattr(utils, "_probe_media_properties", lambda *args: None)
+
+    assert len(_get_music_playlist(["x.mp3", "y.mp3"], 120, {}, "ffmpeg")) == 1
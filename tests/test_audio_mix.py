@@ -0,0 +1,159 @@
+import os
+import threading
+from queue import Queue
+
+from video_processing import audio_mix, final_pass
+
+
+def _media(tmp_path):
+    narration = tmp_path / "voz.mp3"
+    narration.write_bytes(b"voz")
+    music = tmp_path / "musica.mp3"
+    music.write_bytes(b"musica")
+    return narration, music
+
+
+def _params(tmp_path, **extra):
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'narration_volume': 2,
+        'music_volume': -18,
+        'add_fade_out': True,
+        'fade_out_duration': 3.0,
+        'render_cache_dir': str(tmp_path / "cache"),
+    }
+    params.update(extra)
+    return params
+
+
+def test_premix_ducks_music_fades_and_reuses_cache(tmp_path, monkeypatch):
+    narration, music = _media(tmp_path)
+    calls = []
+
+    def fake_execute(cmd, duration, progress_cb, cancel_event, log_prefix, progress_queue, policy=None):
+        calls.append((cmd, duration))
+        with open(cmd[-1], "wb") as fp:
+            fp.write(b"m4a")
+        return True
+
+    monkeypatch.setattr(audio_mix, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(audio_mix, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '30.0'}})
+    params = _params(tmp_path)
+
+    first = audio_mix._prerender_audio_mix(params, str(narration), str(music), Queue(), threading.Event(), "teste")
+    second = audio_mix._prerender_audio_mix(params, str(narration), str(music), Queue(), threading.Event(), "teste")
+    louder = audio_mix._prerender_audio_mix(dict(params, music_volume=-6), str(narration), str(music), Queue(), threading.Event(), "teste")
+
+    assert first == second != louder
+    assert first.endswith(".m4a")
+    assert len(calls) == 2
+    cmd, duration = calls[0]
+    assert duration == 33.0
+    filter_complex = cmd[cmd.index('-filter_complex') + 1]
+    assert "sidechaincompress" in filter_complex
+    assert "amix=inputs=2:duration=longest:dropout_transition=3[a_mix]" in filter_complex
+    assert filter_complex.endswith("[a_mix]afade=t=out:st=30.0:d=3.0[a_fadeout]")
+    assert cmd[cmd.index('-map') + 1] == "[a_fadeout]"
+
+
+def test_background_premix_skips_music_preparation_on_cache_hit(tmp_path, monkeypatch):
+    narration, music = _media(tmp_path)
+    params = _params(tmp_path, audio_premix_enabled=True)
+    _key, cached = audio_mix._audio_mix_cache_path(params, str(narration), [str(music)])
+    with open(cached, "wb") as fp:
+        fp.write(b"m4a")
+
+    def unexpected_prepare():
+        raise AssertionError("músicas não devem ser preparadas com a mixagem em cache")
+
+    future = audio_mix._start_audio_premix(
+        params, str(narration), [str(music)], unexpected_prepare, Queue(), threading.Event(), "teste"
+    )
+    final_pass_params = {}
+    assert audio_mix._collect_audio_premix(future, unexpected_prepare, final_pass_params, "teste") == []
+    assert final_pass_params['audio_mix_path'] == cached
+
+
+def test_final_pass_muxes_premixed_audio(tmp_path, monkeypatch):
+    narration, music = _media(tmp_path)
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    mix = tmp_path / "mix.m4a"
+    mix.write_bytes(b"0")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    params = _params(
+        tmp_path,
+        resolution='1920x1080',
+        subtitle_style={},
+        output_folder=str(output_dir),
+        output_filename_single='final.mp4',
+        audio_mix_path=str(mix),
+    )
+    captured = {}
+
+    def fake_execute(cmd, *args, **kwargs):
+        captured['cmd'] = cmd
+        return True
+
+    monkeypatch.setattr(final_pass, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(final_pass, "_maybe_create_intro_clip", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_create_styled_ass_from_srt", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '30.0'}})
+
+    assert final_pass._perform_final_pass(
+        params, str(base_video), str(narration), [str(music)], None, Queue(), threading.Event(), str(tmp_path), "teste"
+    )
+
+    cmd = captured['cmd']
+    assert str(narration) not in cmd and str(music) not in cmd
+    assert ['-map', '1:a:0'] == cmd[cmd.index('1:a:0') - 1:cmd.index('1:a:0') + 1]
+    assert cmd[cmd.index('-c:a') + 1] == 'copy'
+    filter_complex = cmd[cmd.index('-filter_complex') + 1]
+    assert "amix" not in filter_complex and "afade" not in filter_complex
+    assert "fade=t=out:st=30.0" in filter_complex
+
+
+def test_background_premix_keys_a_truncated_playlist_by_the_music_really_mixed(tmp_path, monkeypatch):
+    narration, music = _media(tmp_path)
+    second_track = tmp_path / "musica2.mp3"
+    second_track.write_bytes(b"musica2")
+    playlist = [str(music), str(second_track)]
+    params = _params(tmp_path, audio_premix_enabled=True)
+
+    def fake_execute(cmd, duration, progress_cb, cancel_event, log_prefix, progress_queue, policy=None):
+        with open(cmd[-1], "wb") as fp:
+            fp.write(b"m4a")
+        return True
+
+    monkeypatch.setattr(audio_mix, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(audio_mix, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '30.0'}})
+
+    # A concatenação falhou: só a primeira música entra na mixagem.
+    future = audio_mix._start_audio_premix(
+        params, str(narration), playlist, lambda: [str(music)], Queue(), threading.Event(), "teste"
+    )
+    final_pass_params = {}
+    audio_mix._collect_audio_premix(future, lambda: [], final_pass_params, "teste")
+
+    _key, playlist_mix = audio_mix._audio_mix_cache_path(params, str(narration), playlist)
+    _key, first_only_mix = audio_mix._audio_mix_cache_path(params, str(narration), [str(music)])
+    assert final_pass_params['audio_mix_path'] == first_only_mix
+    assert not os.path.isfile(playlist_mix)
+    assert audio_mix._mixed_music_sources([str(tmp_path / "concat.m4a")], playlist) == playlist
+
+
+def test_failed_premix_is_not_retried_by_the_final_pass_with_loudnorm(tmp_path, monkeypatch):
+    narration, music = _media(tmp_path)
+    params = _params(tmp_path, loudnorm_enabled=True)
+    monkeypatch.setattr(audio_mix, "_prerender_audio_mix", lambda *args, **kwargs: None)
+
+    future = audio_mix._start_audio_premix(
+        params, str(narration), [str(music)], lambda: [str(music)], Queue(), threading.Event(), "teste"
+    )
+    final_pass_params = dict(params)
+    assert audio_mix._collect_audio_premix(future, lambda: [], final_pass_params, "teste") == [str(music)]
+
+    assert 'audio_mix_path' not in final_pass_params
+    assert audio_mix._audio_premix_enabled(params)
+    assert not audio_mix._audio_premix_enabled(final_pass_params)
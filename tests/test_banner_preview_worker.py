@@ -0,0 +1,99 @@
+import threading
+from queue import Queue
+
+from gui.previews import (
+    BannerPreviewScene,
+    PreviewRenderWorker,
+    render_banner_preview_scene,
+)
+
+
+def _banner_params(**overrides):
+    params = {
+        'text': "Título de teste",
+        'use_gradient': False,
+        'solid_color': "#FFB347",
+        'gradient_start': "#FF512F",
+        'gradient_end': "#DD2476",
+        'font_color': "#FFFFFF",
+        'enabled': True,
+        'video_resolution': (1920, 1080),
+    }
+    params.update(overrides)
+    return params
+
+
+def test_worker_drops_stale_requests():
+    results: Queue = Queue()
+    worker = PreviewRenderWorker(results)
+    started = threading.Event()
+    release = threading.Event()
+    rendered = []
+
+    def blocking_render():
+        started.set()
+        release.wait(timeout=5)
+        rendered.append("first")
+        return "first"
+
+    try:
+        worker.submit("banner", blocking_render)
+        assert started.wait(timeout=5)
+        for idx in range(2, 6):
+            worker.submit("banner", lambda idx=idx: rendered.append(idx) or idx)
+        release.set()
+
+        kind, generation, result = results.get(timeout=5)
+        while result != 5:
+            kind, generation, result = results.get(timeout=5)
+    finally:
+        worker.shutdown(timeout=5)
+
+    assert kind == "banner"
+    assert worker.is_current("banner", generation)
+    # Apenas o pedido em execução e o último pedido são renderizados.
+    assert rendered == ["first", 5]
+
+
+def test_render_scene_uses_display_resolution():
+    scene = render_banner_preview_scene((480, 320), **_banner_params())
+
+    assert isinstance(scene, BannerPreviewScene)
+    assert scene.image.size == (480, 320)
+    assert scene.message is None
+    assert scene.result is not None
+    frame_width = scene.frame_bbox[2] - scene.frame_bbox[0]
+    assert scene.result.image.width < 1920
+    assert scene.result.image.width >= frame_width
+
+
+def test_render_scene_reports_disabled_banner():
+    scene = render_banner_preview_scene((300, 200), **_banner_params(enabled=False))
+
+    assert scene.message == "Faixa desativada"
+    assert scene.result is None
+
+
+def test_cancel_invalidates_a_render_in_flight():
+    results: Queue = Queue()
+    worker = PreviewRenderWorker(results)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_render():
+        started.set()
+        release.wait(timeout=5)
+        return "quadro"
+
+    try:
+        generation = worker.submit("presenter", blocking_render)
+        assert started.wait(timeout=5)
+        worker.cancel("presenter")
+        release.set()
+        assert worker.submit("other", lambda: "ok") == 1
+        assert results.get(timeout=5) == ("other", 1, "ok")
+    finally:
+        worker.shutdown(timeout=5)
+
+    assert not worker.is_current("presenter", generation)
+    assert results.empty()
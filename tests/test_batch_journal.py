@@ -0,0 +1,99 @@
+import os
+import threading
+from queue import Queue
+
+from video_processing import batch, preflight
+from video_processing.journal import JOURNAL_FILENAME, BatchJournal, _partial_output_path, _render_params_hash
+from video_processing.preflight import BatchItemPlan
+
+
+def _item(tmp_path, name="voz.mp3"):
+    narration = tmp_path / name
+    if not narration.exists():
+        narration.write_bytes(b"narracao")
+    return BatchItemPlan(0, name, str(narration), output_name=f"video_final_{narration.stem}.mp4", language_code="PT")
+
+
+def test_journal_detects_completed_items_across_reopen(tmp_path):
+    params = {'output_folder': str(tmp_path), 'resolution': '1920x1080'}
+    item = _item(tmp_path)
+    output = tmp_path / item.output_name
+    output.write_bytes(b"video")
+
+    journal = BatchJournal.open(params)
+    journal.record(item, 'started')
+    journal.record(item, 'done')
+    with open(tmp_path / JOURNAL_FILENAME, "a", encoding="utf-8") as fp:
+        fp.write('{"output": "trunc')
+
+    reopened = BatchJournal.open(params)
+    assert reopened.is_complete(item)
+    assert not BatchJournal.open({**params, 'resolution': '1280x720'}).is_complete(item)
+
+    output.write_bytes(b"video truncado")
+    assert not reopened.is_complete(item)
+
+
+def test_journal_invalidates_when_inputs_change(tmp_path):
+    params = {'output_folder': str(tmp_path)}
+    item = _item(tmp_path)
+    output = tmp_path / item.output_name
+    output.write_bytes(b"video")
+    BatchJournal.open(params).record(item, 'done')
+
+    os.utime(item.narration_path, ns=(0, 0))
+
+    assert not BatchJournal.open(params).is_complete(item)
+    assert BatchJournal.open({**params, 'batch_resume_enabled': False}) is None
+
+
+def test_journal_params_hash_follows_the_render_fingerprint_keys(tmp_path):
+    params = {'output_folder': str(tmp_path), 'resolution': '1920x1080', 'slideshow_crf': 20}
+
+    for volatile in ({'audio_mix_path': "mix.m4a"}, {'work_queue_worker_id': "pc-2"}, {'render_cache_dir': "cache"}):
+        assert _render_params_hash({**params, **volatile}) == _render_params_hash(params)
+    assert _render_params_hash({**params, 'slideshow_crf': 28}) != _render_params_hash(params)
+    assert _render_params_hash({**params, 'music_concat_bitrate': "128k"}) != _render_params_hash(params)
+
+
+def test_partial_output_keeps_extension():
+    assert _partial_output_path(os.path.join("out", "video_final_x.mp4")) == os.path.join("out", "video_final_x.part.mp4")
+
+
+def test_restarted_image_batch_skips_finished_items(tmp_path, monkeypatch):
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    for name in ("a.mp3", "b.mp3"):
+        (audio_dir / name).write_bytes(b"0")
+    image_dir = tmp_path / "imagens"
+    image_dir.mkdir()
+    (image_dir / "foto.png").write_bytes(b"0")
+    output_dir = tmp_path / "saida"
+    output_dir.mkdir()
+
+    monkeypatch.setattr(preflight, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '5.0'}, 'streams': []})
+    monkeypatch.setattr(batch, "_process_images_in_chunks", lambda *args, **kwargs: (str(tmp_path / "slideshow.mp4"), True))
+    rendered = []
+
+    def fake_final_pass(**kwargs):
+        name = kwargs['params']['output_filename_single']
+        rendered.append(name)
+        if name == "video_final_b.mp4" and len(rendered) == 2:
+            return False
+        (output_dir / name).write_bytes(b"video")
+        return True
+
+    monkeypatch.setattr(batch, "_perform_final_pass", fake_final_pass)
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'batch_audio_folder': str(audio_dir),
+        'batch_image_parent_folder': str(image_dir),
+        'output_folder': str(output_dir),
+        'resolution': '1280x720',
+        'scratch_min_free_mb': 0,
+    }
+
+    assert batch._run_batch_image_processing(params, Queue(), threading.Event(), str(tmp_path))
+    assert batch._run_batch_image_processing(params, Queue(), threading.Event(), str(tmp_path))
+
+    assert rendered == ["video_final_a.mp4", "video_final_b.mp4", "video_final_b.mp4"]
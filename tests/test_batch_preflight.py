@@ -0,0 +1,220 @@
+import os
+import threading
+from concurrent.futures import Future
+from queue import Queue
+
+from video_processing import batch, preflight
+from video_processing.journal import BatchJournal
+from video_processing.preflight import BatchItemPlan, BatchProgress, _run_preflight
+
+
+def _props(duration=None, video=False):
+    props = {'format': {}, 'streams': [{'codec_type': 'audio'}]}
+    if duration is not None:
+        props['format']['duration'] = str(duration)
+    if video:
+        props['streams'].append({'codec_type': 'video'})
+    return props
+
+
+def _drain(queue):
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+def test_preflight_probes_each_file_once_and_reports_every_problem(tmp_path, monkeypatch):
+    good_srt = tmp_path / "a.srt"
+    good_srt.write_text("1\n00:00:01,000 --> 00:00:02,000\nOi\n", encoding="utf-8")
+    bad_srt = tmp_path / "c.srt"
+    bad_srt.write_text("nada aqui\n", encoding="utf-8")
+    probes = {
+        "a.mp3": _props(12.0),
+        "b.mp3": None,
+        "c.mp3": _props(8.0),
+        "ok.mp4": _props(30.0, video=True),
+        "audio_only.mp4": _props(30.0),
+    }
+    calls = []
+
+    def fake_probe(path, ffmpeg):
+        calls.append(path)
+        return probes[path]
+
+    monkeypatch.setattr(preflight, "_probe_media_properties", fake_probe)
+    pool = ["ok.mp4", "audio_only.mp4"]
+    items = [
+        BatchItemPlan(0, "a.mp3", "a.mp3", subtitle_path=str(good_srt), candidate_videos=pool),
+        BatchItemPlan(1, "b.mp3", "b.mp3", candidate_videos=pool),
+        BatchItemPlan(2, "c.mp3", "c.mp3", subtitle_path=str(bad_srt), candidate_videos=pool),
+    ]
+
+    plan = _run_preflight(
+        items, {'ffmpeg_path': 'ffmpeg', 'preflight_workers': 3}, Queue(), threading.Event(), "teste",
+        tail_extension=lambda duration: duration + 2, choose_video=lambda item, videos: videos[0],
+    )
+
+    assert sorted(calls) == sorted(probes)
+    assert [item.name for item in plan.valid_items] == ["a.mp3"]
+    assert plan.valid_items[0].duration == 14.0
+    assert plan.valid_items[0].base_video_path == "ok.mp4"
+    assert plan.total_duration == 14.0
+    assert "duração" in items[1].problems[0]
+    assert "sem falas" in items[2].problems[0]
+    assert plan.playable(pool) == ["ok.mp4"]
+    assert any("audio_only.mp4" in problem for problem in plan.problems)
+
+
+def test_batch_progress_is_weighted_by_duration_with_eta():
+    plan = preflight.BatchPlan(items=[
+        BatchItemPlan(0, "curto", "curto", duration=10.0),
+        BatchItemPlan(1, "longo", "longo", duration=30.0),
+    ])
+    ticks = iter([0.0, 20.0])
+    queue = Queue()
+    tracker = BatchProgress(plan, queue, clock=lambda: next(ticks))
+
+    tracker.item_finished(plan.items[0], "teste")
+
+    messages = _drain(queue)
+    assert messages[0] == ("batch_progress", 0.25)
+    assert "1m00s" in messages[1][1]
+
+
+def test_image_batch_renders_only_items_that_pass_preflight(tmp_path, monkeypatch):
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    for name in ("um.mp3", "dois.mp3", "tres.mp3"):
+        (audio_dir / name).write_bytes(b"0")
+    image_dir = tmp_path / "imagens"
+    image_dir.mkdir()
+    (image_dir / "foto.png").write_bytes(b"0")
+
+    durations = {"um.mp3": 10.0, "dois.mp3": None, "tres.mp3": 30.0}
+    monkeypatch.setattr(preflight, "_probe_media_properties", lambda path, ffmpeg: _props(durations[os.path.basename(path)]))
+    monkeypatch.setattr(batch, "_process_images_in_chunks", lambda *args, **kwargs: (str(tmp_path / "slideshow.mp4"), True))
+    rendered = []
+    monkeypatch.setattr(batch, "_perform_final_pass", lambda **kwargs: rendered.append(kwargs['narration_path']) or True)
+
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'batch_audio_folder': str(audio_dir),
+        'batch_image_parent_folder': str(image_dir),
+        'resolution': '1280x720',
+        'scratch_min_free_mb': 0,
+    }
+    queue = Queue()
+
+    assert batch._run_batch_image_processing(params, queue, threading.Event(), str(tmp_path))
+
+    assert [os.path.basename(path) for path in rendered] == ["tres.mp3", "um.mp3"]
+    messages = _drain(queue)
+    progress = [payload for kind, payload, *_ in messages if kind == "batch_progress"]
+    assert progress == [0.0, 0.75, 0.75, 1.0, 1.0]
+    assert any("dois.mp3" in payload and kind == "status" for kind, payload, *_ in messages)
+
+
+def test_failed_items_still_count_towards_batch_progress(tmp_path, monkeypatch):
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    for name in ("a.mp3", "b.mp3"):
+        (audio_dir / name).write_bytes(b"0")
+    image_dir = tmp_path / "imagens"
+    image_dir.mkdir()
+    (image_dir / "foto.png").write_bytes(b"0")
+    output_dir = tmp_path / "saida"
+    output_dir.mkdir()
+
+    monkeypatch.setattr(preflight, "_probe_media_properties", lambda path, ffmpeg: _props(100.0))
+    slideshows = iter([(None, False), (str(tmp_path / "slideshow.mp4"), True)])
+    monkeypatch.setattr(batch, "_process_images_in_chunks", lambda *args, **kwargs: next(slideshows))
+    monkeypatch.setattr(
+        batch, "_perform_final_pass",
+        lambda **kwargs: (output_dir / kwargs['params']['output_filename_single']).write_bytes(b"video") > 0,
+    )
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'batch_audio_folder': str(audio_dir),
+        'batch_image_parent_folder': str(image_dir),
+        'output_folder': str(output_dir),
+        'resolution': '1280x720',
+        'scratch_min_free_mb': 0,
+    }
+    queue = Queue()
+
+    assert batch._run_batch_image_processing(params, queue, threading.Event(), str(tmp_path))
+
+    messages = _drain(queue)
+    progress = [payload for kind, payload, *_ in messages if kind == "batch_progress"]
+    assert progress == [0.0, 0.5, 0.5, 1.0, 1.0]
+    # Só o item que falhou ainda deixa vídeo por fazer; depois do último, nada resta.
+    remaining = [payload for kind, payload, *_ in messages if kind == "status" and "Restam" in payload]
+    assert len(remaining) == 1 and "Restam 1m40s" in remaining[0]
+    # O diário também registra a falha: o item volta na próxima execução.
+    journal = BatchJournal.open(params)
+    items = [BatchItemPlan(i, name, str(audio_dir / name), output_name=f"video_final_{name[0]}.mp4") for i, name in enumerate(("a.mp3", "b.mp3"))]
+    assert [journal.is_complete(item) for item in items] == [False, True]
+
+
+def test_image_batch_discards_subtitle_prerender_when_base_video_fails(tmp_path, monkeypatch):
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    (audio_dir / "a.mp3").write_bytes(b"0")
+    (audio_dir / "a.srt").write_text("1\n00:00:00,000 --> 00:00:01,000\nOlá\n", encoding="utf-8")
+    image_dir = tmp_path / "imagens"
+    image_dir.mkdir()
+    (image_dir / "foto.png").write_bytes(b"0")
+    output_dir = tmp_path / "saida"
+    output_dir.mkdir()
+
+    monkeypatch.setattr(preflight, "_probe_media_properties", lambda path, ffmpeg: _props(10.0))
+    monkeypatch.setattr(batch, "_process_images_in_chunks", lambda *args, **kwargs: (None, False))
+    futures = []
+
+    def fake_start(*args, **kwargs):
+        futures.append(Future())
+        return futures[-1]
+
+    monkeypatch.setattr(batch, "_start_subtitle_prerender", fake_start)
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'batch_audio_folder': str(audio_dir),
+        'batch_image_parent_folder': str(image_dir),
+        'output_folder': str(output_dir),
+        'resolution': '1280x720',
+        'scratch_min_free_mb': 0,
+    }
+
+    batch._run_batch_image_processing(params, Queue(), threading.Event(), str(tmp_path))
+
+    # Sem vídeo base o item é abandonado; a legenda pendente não pode ficar rodando no executor.
+    assert len(futures) == 1 and futures[0].cancelled()
+
+
+def test_plan_batch_allocates_assets_reproducibly(monkeypatch):
+    probes = {
+        "a.mp3": _props(10.0),
+        "b.mp3": _props(10.0),
+        "v1.mp4": _props(30.0, video=True),
+        "v2.mp4": _props(30.0, video=True),
+        "m1.mp3": _props(30.0),
+    }
+    monkeypatch.setattr(preflight, "_probe_media_properties", lambda path, ffmpeg: probes[path])
+    params = {'ffmpeg_path': 'ffmpeg', 'asset_seed': 5}
+
+    def plan_once():
+        items = [BatchItemPlan(0, "a.mp3", "a.mp3"), BatchItemPlan(1, "b.mp3", "b.mp3")]
+        return batch._plan_batch(
+            items, params, Queue(), threading.Event(), "teste",
+            music_paths=["m1.mp3"], video_pool=["v1.mp4", "v2.mp4"], extra_videos=["v1.mp4", "v2.mp4"],
+        )
+
+    plan = plan_once()
+    again = plan_once()
+
+    assert plan.asset_seed == 5
+    assert [item.base_video_path for item in plan.items] == [item.base_video_path for item in again.items]
+    assert {item.base_video_path for item in plan.items} == {"v1.mp4", "v2.mp4"}
+    assert [item.music_playlist for item in plan.items] == [["m1.mp3"], ["m1.mp3"]]
+    assert plan.required_assets() == {"v1.mp4", "v2.mp4", "m1.mp3"}
@@ -0,0 +1,71 @@
+import math
+
+import pytest
+from PIL import Image
+
+from processing import chroma_key
+from video_processing.presenter import _chroma_key_settings, _presenter_filter
+
+
+def _keyed(image, *args, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+        return chroma_key.apply_chroma_key(image, *args)
+    original = chroma_key.np
+    chroma_key.np = None
+    try:
+        return chroma_key.apply_chroma_key(image, *args)
+    finally:
+        chroma_key.np = original
+
+
+def test_key_color_uses_ffmpeg_fixed_point_conversion():
+    assert chroma_key.chroma_key_uv('0x00FF00') == (44, 21)
+    assert chroma_key.chroma_key_uv('#0000FF') == (255, 107)
+    assert chroma_key.rgb_to_uv(0, 255, 0) == (54, 34)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_apply_chroma_key_matches_filter_math(use_numpy):
+    image = Image.new("RGB", (6, 3), (0, 255, 0))
+    for y in range(3):
+        for x in range(3, 6):
+            image.putpixel((x, y), (200, 30, 40))
+
+    keyed = _keyed(image, '0x00FF00', 0.1, 0.0, use_numpy=use_numpy)
+    alpha = [keyed.getpixel((x, 1))[3] for x in range(6)]
+    assert alpha[0] == 0 and alpha[1] == 0
+    assert alpha[4] == 255 and alpha[5] == 255
+    assert keyed.getpixel((5, 1))[:3] == (200, 30, 40)
+
+    # Na fronteira a distância é a média da vizinhança 3x3: 3 de 9 amostras são vermelhas.
+    key_u, key_v = chroma_key.chroma_key_uv('0x00FF00')
+    u, v = chroma_key.rgb_to_uv(200, 30, 40)
+    green_u, green_v = chroma_key.rgb_to_uv(0, 255, 0)
+    red = math.sqrt(((u - key_u) ** 2 + (v - key_v) ** 2) / (255.0 * 255.0 * 2))
+    green = math.sqrt(((green_u - key_u) ** 2 + (green_v - key_v) ** 2) / (255.0 * 255.0 * 2))
+    diff = (3 * red + 6 * green) / 9.0
+    blended = _keyed(image, '0x00FF00', 0.05, 0.3, use_numpy=use_numpy)
+    assert blended.getpixel((2, 1))[3] == int(min(1.0, max(0.0, (diff - 0.05) / 0.3)) * 255.0)
+
+
+def test_numpy_and_python_paths_agree():
+    pytest.importorskip("numpy")
+    image = Image.effect_noise((24, 16), 80).convert("RGB")
+    image = Image.merge("RGB", (image.split()[0], Image.new("L", image.size, 200), image.split()[0]))
+
+    assert _keyed(image, '#20C040', 0.14, 0.08, use_numpy=True).tobytes() == _keyed(
+        image, '#20C040', 0.14, 0.08, use_numpy=False
+    ).tobytes()
+    noise = Image.merge("RGB", [Image.effect_noise((32, 18), 120) for _ in range(3)])
+    assert _keyed(noise, '0x00FF00', 0.3, 0.0, use_numpy=True).tobytes() == _keyed(
+        noise, '0x00FF00', 0.3, 0.0, use_numpy=False
+    ).tobytes()
+
+
+def test_preview_and_final_pass_share_chroma_settings():
+    params = {'presenter_chroma_enabled': True, 'presenter_chroma_color': '#00FF00', 'presenter_chroma_similarity': 0.5, 'presenter_chroma_blend': 0.0}
+    color, similarity, blend = _chroma_key_settings(params)
+
+    assert (color, similarity, blend) == ('0x00FF00', 0.275, 0.02)
+    assert _presenter_filter(params, (1920, 1080)).endswith(f"chromakey={color}:{similarity}:{blend}")
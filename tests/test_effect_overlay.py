@@ -0,0 +1,80 @@
+import threading
+from queue import Queue
+
+from video_processing import effect_overlay, final_pass
+
+
+def _params(tmp_path, **extra):
+    source = tmp_path / "efeito_4k.mp4"
+    source.write_bytes(b"0")
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1280x720',
+        'effect_overlay_path': str(source),
+        'render_cache_dir': str(tmp_path / "cache"),
+    }
+    params.update(extra)
+    return params
+
+
+def test_prerender_scales_effect_once_and_reuses_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_execute(cmd, duration, progress_cb, cancel_event, log_prefix, progress_queue, policy=None):
+        calls.append((cmd, duration))
+        with open(cmd[-1], "wb") as fp:
+            fp.write(b"mp4")
+        return True
+
+    monkeypatch.setattr(effect_overlay, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(effect_overlay, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '8.0'}})
+    params = _params(tmp_path)
+
+    first = effect_overlay._prerender_effect_overlay(params, (1280, 720), Queue(), threading.Event(), "teste")
+    second = effect_overlay._prerender_effect_overlay(params, (1280, 720), Queue(), threading.Event(), "teste")
+
+    assert first == second
+    assert len(calls) == 1
+    cmd, duration = calls[0]
+    assert duration == 8.0
+    # Sem ``fps=``: o efeito mantém a cadência original, como no passe final sem pré-escala.
+    assert cmd[cmd.index('-vf') + 1] == "scale=1280:720,setsar=1"
+    assert cmd[cmd.index('-g') + 1] == '1'
+    assert effect_overlay._prerender_effect_overlay(
+        dict(params, effect_prerender_enabled=False), (1280, 720), Queue(), threading.Event(), "teste"
+    ) is None
+
+
+def test_final_pass_skips_scale_for_prescaled_effect(tmp_path, monkeypatch):
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    scaled = tmp_path / "efeito_720p.mp4"
+    scaled.write_bytes(b"0")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    params = _params(
+        tmp_path,
+        subtitle_style={},
+        output_folder=str(output_dir),
+        output_filename_single='final.mp4',
+        narration_volume=0,
+        music_volume=0,
+    )
+    captured = {}
+
+    def fake_execute(cmd, *args, **kwargs):
+        captured['cmd'] = cmd
+        return True
+
+    monkeypatch.setattr(final_pass, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(final_pass, "_prerender_effect_overlay", lambda *args, **kwargs: str(scaled))
+    monkeypatch.setattr(final_pass, "_maybe_create_intro_clip", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '10.0'}})
+
+    assert final_pass._perform_final_pass(
+        params, str(base_video), None, [], None, Queue(), threading.Event(), str(tmp_path), "teste"
+    )
+
+    cmd = captured['cmd']
+    assert str(scaled) in cmd and params['effect_overlay_path'] not in cmd
+    assert "[1:v]format=rgba[effect_scaled]" in cmd[cmd.index('-filter_complex') + 1]
@@ -0,0 +1,91 @@
+import threading
+from queue import Queue
+
+from video_processing import final_pass
+
+
+def _run_final_pass(tmp_path, monkeypatch, video_stream, intro_info=None, **extra):
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    narration = tmp_path / "voice.mp3"
+    narration.write_bytes(b"0")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir(exist_ok=True)
+
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1920x1080',
+        'subtitle_style': {},
+        'output_folder': str(output_dir),
+        'output_filename_single': 'final.mp4',
+        'narration_volume': 0,
+        'music_volume': 0,
+        'video_codec': 'Automático',
+        'available_encoders': [],
+        **extra,
+    }
+    captured = {}
+
+    def fake_execute(cmd, *args, **kwargs):
+        captured['cmd'] = cmd
+        return True
+
+    probes = {
+        str(base_video): {'format': {'duration': '20.0'}, 'streams': [video_stream]},
+        str(narration): {'format': {'duration': '20.0'}},
+    }
+    monkeypatch.setattr(final_pass, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(final_pass, "_maybe_create_intro_clip", lambda *args, **kwargs: intro_info)
+    monkeypatch.setattr(final_pass, "_combine_intro_with_main", lambda info, content, partial, *args: open(partial, "wb").close() or True)
+    monkeypatch.setattr(final_pass, "_create_styled_ass_from_srt", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", lambda path, ffmpeg: probes.get(path))
+
+    assert final_pass._perform_final_pass(
+        params, str(base_video), str(narration), [], None, Queue(), threading.Event(), str(tmp_path), "teste"
+    )
+    return captured['cmd']
+
+
+MATCHING_STREAM = {
+    'codec_type': 'video',
+    'codec_name': 'h264',
+    'width': 1920,
+    'height': 1080,
+    'pix_fmt': 'yuv420p',
+    'sample_aspect_ratio': '1:1',
+}
+
+
+def test_matching_base_video_is_stream_copied(tmp_path, monkeypatch):
+    cmd = _run_final_pass(tmp_path, monkeypatch, MATCHING_STREAM)
+
+    assert cmd[cmd.index('-c:v') + 1] == 'copy'
+    assert cmd[cmd.index('-c:a') + 1] == 'aac'
+    filter_complex = cmd[cmd.index('-filter_complex') + 1]
+    assert 'scale=' not in filter_complex and 'format=yuv420p' not in filter_complex
+    assert ['-map', '0:v:0'] == cmd[cmd.index('-map'):cmd.index('-map') + 2]
+
+
+def test_mismatched_base_video_is_scaled_and_reencoded(tmp_path, monkeypatch):
+    cmd = _run_final_pass(tmp_path, monkeypatch, dict(MATCHING_STREAM, width=1280, height=720))
+
+    assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+    assert 'scale=1920:1080,setsar=1' in cmd[cmd.index('-filter_complex') + 1]
+
+
+def test_fade_out_still_reencodes_matching_video(tmp_path, monkeypatch):
+    cmd = _run_final_pass(tmp_path, monkeypatch, MATCHING_STREAM, add_fade_out=True, fade_out_duration=2.0)
+
+    filter_complex = cmd[cmd.index('-filter_complex') + 1]
+    assert 'fade=t=out' in filter_complex
+    assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+
+
+def test_intro_reencodes_matching_video(tmp_path, monkeypatch):
+    intro = tmp_path / "intro.mp4"
+    intro.write_bytes(b"0")
+    cmd = _run_final_pass(tmp_path, monkeypatch, MATCHING_STREAM, intro_info={'path': str(intro)})
+
+    assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+    assert '[0:v]format=yuv420p[vout]' in cmd[cmd.index('-filter_complex') + 1]
+    assert cmd[-1].endswith("main-content-final.mp4")
@@ -40,7 +40,7 @@ def test_fade_out_starts_after_narration(tmp_path, monkeypatch):
 
     captured = {}
 
-    def fake_execute(cmd, total_duration, progress_cb, cancel_event, log_prefix, progress_queue):
+    def fake_execute(cmd, total_duration, progress_cb, cancel_event, log_prefix, progress_queue, policy=None):
         captured['cmd'] = cmd
         captured['total_duration'] = total_duration
         return True
@@ -0,0 +1,79 @@
+import os
+
+from video_processing.cache import file_fingerprint
+from video_processing.folder_index import NARRATION_EXTENSIONS, FolderIndex
+
+
+def _touch(path, data=b"0"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_scan_classifies_files_and_keeps_stat(tmp_path):
+    _touch(tmp_path / "b PT.mp3")
+    _touch(tmp_path / "a PT.wav")
+    _touch(tmp_path / "trilha.flac")
+    _touch(tmp_path / "clip.MP4")
+    _touch(tmp_path / "foto.png")
+    _touch(tmp_path / "a PT.srt")
+    _touch(tmp_path / "notas.txt")
+    (tmp_path / "Inglês").mkdir()
+
+    index = FolderIndex.scan(str(tmp_path))
+
+    assert [f.name for f in index.files('audio', NARRATION_EXTENSIONS)] == ["a PT.wav", "b PT.mp3"]
+    assert len(index.files('audio')) == 3
+    assert [os.path.basename(p) for p in index.paths('video')] == ["clip.MP4"]
+    assert index.subdirs == ["Inglês"]
+    assert index.find(str(tmp_path), "a PT", 'subtitle') == str(tmp_path / "a PT.srt")
+    assert index.find(str(tmp_path), "b PT", 'subtitle') is None
+    clip = str(tmp_path / "clip.MP4")
+    assert index.fingerprints()[clip] == file_fingerprint(clip)
+
+
+def test_recursive_scan_finds_nested_narrations(tmp_path):
+    _touch(tmp_path / "curso" / "aula1" / "voz PT.mp3")
+    _touch(tmp_path / "curso" / "aula1" / "voz PT.srt")
+    _touch(tmp_path / "curso" / "aula2" / "voz ING.mp3")
+
+    index = FolderIndex.scan(str(tmp_path), recursive=True)
+
+    narrations = index.paths('audio', NARRATION_EXTENSIONS)
+    assert [os.path.relpath(p, tmp_path) for p in narrations] == [
+        os.path.join("curso", "aula1", "voz PT.mp3"),
+        os.path.join("curso", "aula2", "voz ING.mp3"),
+    ]
+    assert index.find(str(tmp_path / "curso" / "aula1"), "voz PT", 'subtitle')
+    assert index.find(str(tmp_path / "curso" / "aula2"), "voz ING", 'subtitle') is None
+
+
+def test_persisted_index_rereads_only_modified_folders(tmp_path, monkeypatch):
+    root = tmp_path / "raiz"
+    _touch(root / "a" / "voz.mp3")
+    _touch(root / "b" / "voz.mp3")
+    params = {'folder_index_cache': True, 'render_cache_dir': str(tmp_path / "cache")}
+    FolderIndex.scan(str(root), recursive=True, params=params)
+
+    _touch(root / "b" / "nova.mp3")
+    os.utime(root / "b", ns=(1, 1))
+    from video_processing import folder_index
+    scanned = []
+    original = folder_index._scan_directory
+
+    def tracking_scan(directory, with_dir_mtimes):
+        scanned.append(os.path.relpath(directory, root))
+        return original(directory, with_dir_mtimes)
+
+    monkeypatch.setattr(folder_index, "_scan_directory", tracking_scan)
+    index = FolderIndex.scan(str(root), recursive=True, params=params)
+
+    assert scanned == ["b"]
+    assert sorted(os.path.relpath(p, root) for p in index.paths('audio')) == [
+        os.path.join("a", "voz.mp3"),
+        os.path.join("b", "nova.mp3"),
+        os.path.join("b", "voz.mp3"),
+    ]
+    # Arquivos reaproveitados do cache não fornecem impressão digital sem reler o stat.
+    assert str(root / "a" / "voz.mp3") not in index.fingerprints()
+    assert str(root / "b" / "nova.mp3") in index.fingerprints()
@@ -0,0 +1,68 @@
+from video_processing import final_pass, frame_preview, preview
+
+
+def _setup(tmp_path, monkeypatch, calls):
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    presenter = tmp_path / "apresentador.mov"
+    presenter.write_bytes(b"0")
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1920x1080',
+        'subtitle_style': {},
+        'render_cache_dir': str(tmp_path / "cache"),
+        'presenter_video_path': str(presenter),
+        'presenter_chroma_enabled': True,
+        'add_fade_out': True,
+        'fade_out_duration': 5,
+    }
+    durations = {str(base_video): '100.0', str(presenter): '8.0'}
+
+    def fake_capture(cmd, timeout):
+        calls.append(cmd)
+        return b"\x89PNG-frame"
+
+    def fake_probe(path, ffmpeg):
+        return {'format': {'duration': durations[path]}}
+
+    monkeypatch.setattr(frame_preview, "capture_frame", fake_capture)
+    monkeypatch.setattr(preview, "_probe_media_properties", fake_probe)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", fake_probe)
+    monkeypatch.setattr(final_pass, "_create_styled_ass_from_srt", lambda *args, **kwargs: None)
+    frame_preview.clear_frame_cache()
+    return params, str(base_video), str(presenter)
+
+
+def test_composite_frame_seeks_every_input_and_runs_the_final_graph(tmp_path, monkeypatch):
+    calls = []
+    params, base_video, presenter = _setup(tmp_path, monkeypatch, calls)
+
+    frame = frame_preview.render_composite_frame(params, base_video, 42.5, max_width=640)
+
+    assert frame == b"\x89PNG-frame"
+    cmd = calls[0]
+    base_at = cmd.index(base_video)
+    assert cmd[base_at - 5:base_at] == ['-ss', '42.500', '-itsoffset', '42.500', '-i']
+    presenter_at = cmd.index(presenter)
+    # O apresentador roda em laço: procura em 42.5 % 8.
+    assert cmd[presenter_at - 7:presenter_at] == ['-stream_loop', '-1', '-ss', '2.500', '-itsoffset', '42.500', '-i']
+    filter_complex = cmd[cmd.index('-filter_complex') + 1]
+    assert "chromakey=" in filter_complex
+    assert "overlay=" in filter_complex
+    assert "fade=t=out:st=" in filter_complex
+    assert filter_complex.endswith("scale=w='min(iw,640)':h=-2,format=rgb24[frame]")
+    assert cmd[cmd.index('-frames:v') + 1] == '1'
+    assert cmd[-1] == 'pipe:1'
+
+
+def test_composite_frames_are_cached_per_settings_and_timestamp(tmp_path, monkeypatch):
+    calls = []
+    params, base_video, _presenter = _setup(tmp_path, monkeypatch, calls)
+
+    frame_preview.render_composite_frame(params, base_video, 10.0)
+    frame_preview.render_composite_frame(params, base_video, 10.0)
+    assert len(calls) == 1
+
+    frame_preview.render_composite_frame(params, base_video, 11.0)
+    frame_preview.render_composite_frame({**params, 'presenter_scale': 0.5}, base_video, 10.0)
+    assert len(calls) == 3
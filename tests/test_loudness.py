@@ -0,0 +1,116 @@
+import subprocess
+import threading
+from queue import Queue
+
+import pytest
+
+from processing import ffmpeg_pipeline
+from video_processing import audio_mix, loudness
+from video_processing.loudness import LoudnessMeasurement
+
+
+LOUDNORM_STDERR = """
+[Parsed_loudnorm_0 @ 0x1] 
+{
+	"input_i" : "-27.61",
+	"input_tp" : "-4.47",
+	"input_lra" : "18.06",
+	"input_thresh" : "-39.20",
+	"output_i" : "-16.58",
+	"target_offset" : "0.58"
+}
+"""
+
+
+def test_measure_loudness_parses_first_pass_json(tmp_path, monkeypatch):
+    audio = tmp_path / "voz.wav"
+    audio.write_bytes(b"0")
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr=LOUDNORM_STDERR)
+
+    monkeypatch.setattr(ffmpeg_pipeline.subprocess, "run", fake_run)
+
+    result = ffmpeg_pipeline.measure_loudness(str(audio), "ffmpeg", -16.0, -1.5, 11.0)
+
+    assert result == {'input_i': -27.61, 'input_tp': -4.47, 'input_lra': 18.06, 'input_thresh': -39.2}
+    assert "loudnorm=I=-16.0:TP=-1.5:LRA=11.0:print_format=json" in calls[0]
+
+
+def test_measurements_are_cached_by_file_fingerprint(tmp_path, monkeypatch):
+    audio = tmp_path / "musica.mp3"
+    audio.write_bytes(b"0")
+    calls = []
+
+    def fake_measure(path, ffmpeg_path, target_i, target_tp, target_lra):
+        calls.append(path)
+        return {'input_i': -20.0, 'input_tp': -2.0, 'input_lra': 7.0, 'input_thresh': -30.0}
+
+    monkeypatch.setattr(loudness, "measure_loudness", fake_measure)
+    monkeypatch.setattr(loudness, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '60.0'}})
+    params = {'ffmpeg_path': 'ffmpeg', 'render_cache_dir': str(tmp_path / "cache")}
+
+    first = loudness.measure_cached(str(audio), params)
+    second = loudness.measure_cached(str(audio), dict(params, loudnorm_target_i=-23))
+
+    assert first == second == LoudnessMeasurement(-20.0, -2.0, 7.0, -30.0, 60.0)
+    assert len(calls) == 1
+
+    audio.write_bytes(b"outra gravacao")
+    loudness.measure_cached(str(audio), params)
+    assert len(calls) == 2
+
+
+def test_combine_measurements_uses_duration_weighted_energy():
+    quiet = LoudnessMeasurement(-30.0, -10.0, 5.0, -40.0, 30.0)
+    loud = LoudnessMeasurement(-10.0, -1.0, 9.0, -20.0, 90.0)
+
+    combined = loudness.combine_measurements([quiet, loud])
+
+    assert combined.input_i == pytest.approx(-11.235, abs=1e-3)
+    assert (combined.input_tp, combined.input_lra, combined.duration) == (-1.0, 9.0, 120.0)
+    assert loudness.combine_measurements([quiet, None]) is None
+
+
+def test_premix_applies_linear_loudnorm_before_gain(tmp_path, monkeypatch):
+    narration = tmp_path / "voz.mp3"
+    narration.write_bytes(b"voz")
+    music = tmp_path / "musica.mp3"
+    music.write_bytes(b"musica")
+    calls = []
+
+    def fake_execute(cmd, duration, progress_cb, cancel_event, log_prefix, progress_queue, policy=None):
+        calls.append(cmd)
+        with open(cmd[-1], "wb") as fp:
+            fp.write(b"m4a")
+        return True
+
+    measurements = {
+        str(narration): LoudnessMeasurement(-24.0, -3.0, 6.0, -34.0, 30.0),
+        str(music): LoudnessMeasurement(-12.0, -0.5, 4.0, -22.0, 40.0),
+    }
+    monkeypatch.setattr(audio_mix, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(audio_mix, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '30.0'}})
+    monkeypatch.setattr(audio_mix, "measure_cached", lambda path, params: measurements[path])
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'narration_volume': 0,
+        'music_volume': -18,
+        'loudnorm_enabled': True,
+        'loudnorm_target_i': -14,
+        'render_cache_dir': str(tmp_path / "cache"),
+    }
+
+    assert audio_mix._audio_premix_enabled(params)
+    assert audio_mix._prerender_audio_mix(params, str(narration), str(music), Queue(), threading.Event(), "teste")
+
+    filter_complex = calls[0][calls[0].index('-filter_complex') + 1]
+    assert (
+        "[0:a]loudnorm=I=-14.0:TP=-1.5:LRA=11.0:measured_I=-24.00:measured_TP=-3.00"
+        ":measured_LRA=6.00:measured_thresh=-34.00:linear=true:print_format=none,aresample=48000,volume=0dB[narr_vol]"
+    ) in filter_complex
+    assert "[1:a]loudnorm=I=-14.0" in filter_complex and "measured_I=-12.00" in filter_complex
+    # O alvo vale para a narração na mixagem: o amix não divide as entradas pela metade.
+    assert "amix=inputs=2:duration=longest:dropout_transition=3:normalize=0[a_mix]" in filter_complex
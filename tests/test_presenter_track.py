@@ -0,0 +1,101 @@
+import threading
+from queue import Queue
+
+from video_processing import final_pass, presenter
+
+
+def _params(tmp_path, **extra):
+    source = tmp_path / "apresentador.mp4"
+    source.write_bytes(b"0")
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1920x1080',
+        'presenter_video_path': str(source),
+        'presenter_scale': 0.5,
+        'presenter_chroma_enabled': True,
+        'presenter_chroma_color': '#00FF00',
+        'render_cache_dir': str(tmp_path / "cache"),
+    }
+    params.update(extra)
+    return params
+
+
+def test_prerender_keys_presenter_once_and_reuses_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_execute(cmd, duration, progress_cb, cancel_event, log_prefix, progress_queue, policy=None):
+        calls.append((cmd, duration))
+        with open(cmd[-1], "wb") as fp:
+            fp.write(b"mov")
+        return True
+
+    monkeypatch.setattr(presenter, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(presenter, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '12.5'}})
+    params = _params(tmp_path)
+
+    first = presenter._prerender_presenter_track(params, (1920, 1080), Queue(), threading.Event(), "teste")
+    second = presenter._prerender_presenter_track(params, (1920, 1080), Queue(), threading.Event(), "teste")
+    resized = presenter._prerender_presenter_track(params, (1280, 720), Queue(), threading.Event(), "teste")
+
+    assert first == second
+    assert first.endswith(".mov")
+    assert resized != first
+    assert len(calls) == 2
+    cmd, duration = calls[0]
+    assert duration == 12.5
+    assert "-stream_loop" not in cmd
+    assert "prores_ks" in cmd and "yuva444p10le" in cmd
+    assert "scale=w=-1:h=540,format=rgba,chromakey=0x00FF00" in cmd[cmd.index('-vf') + 1]
+    assert "fps=" not in cmd[cmd.index('-vf') + 1]
+
+
+def test_prerender_skipped_without_chroma_key(tmp_path):
+    params = _params(tmp_path, presenter_chroma_enabled=False)
+
+    assert presenter._prerender_presenter_track(params, (1920, 1080), Queue(), threading.Event(), "teste") is None
+
+
+def test_final_pass_only_composites_prerendered_presenter(tmp_path, monkeypatch):
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    track = tmp_path / "presenter_keyed.mov"
+    track.write_bytes(b"0")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    params = _params(
+        tmp_path,
+        subtitle_style={},
+        output_folder=str(output_dir),
+        output_filename_single='final.mp4',
+        narration_volume=0,
+        music_volume=0,
+    )
+    captured = {}
+
+    def fake_execute(cmd, *args, **kwargs):
+        captured['cmd'] = cmd
+        return True
+
+    monkeypatch.setattr(final_pass, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(final_pass, "_prerender_presenter_track", lambda *args, **kwargs: str(track))
+    monkeypatch.setattr(final_pass, "_maybe_create_intro_clip", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '10.0'}})
+
+    assert final_pass._perform_final_pass(
+        params, str(base_video), None, [], None, Queue(), threading.Event(), str(tmp_path), "teste"
+    )
+
+    cmd = captured['cmd']
+    assert cmd[cmd.index(str(track)) - 3:cmd.index(str(track))] == ["-stream_loop", "-1", "-i"]
+    filter_complex = cmd[cmd.index('-filter_complex') + 1]
+    assert "chromakey" not in filter_complex
+    assert "[v_scaled][1:v]overlay=(W-w)/2:H-h:format=auto[v_presenter]" in filter_complex
+
+
+def test_presenter_track_codec_has_a_config_default(tmp_path, monkeypatch):
+    import gui.config_manager as config_manager
+
+    monkeypatch.setattr(config_manager, "CONFIG_FILE", str(tmp_path / "ausente.json"))
+
+    assert config_manager.ConfigManager.load_config()["presenter_track_codec"] in presenter.PRESENTER_TRACK_CODECS
@@ -0,0 +1,125 @@
+import threading
+from queue import Queue
+
+from video_processing import final_pass, preview
+from video_processing.preflight import BatchItemPlan, BatchPlan
+from video_processing.preview import preview_params, preview_windows
+
+
+def test_preview_params_scale_down_and_disable_batch_bookkeeping():
+    params = preview_params({
+        'resolution': '1920x1080',
+        'output_fps': 30,
+        'output_renditions': "1280x720",
+        'batch_resume_enabled': True,
+    })
+
+    assert params['resolution'] == '640x360'
+    assert params['output_fps'] == 12
+    assert params['output_renditions'] is None
+    assert params['batch_resume_enabled'] is False
+    assert preview_params({'resolution': '1080x1920', 'output_fps': 24})['resolution'] == '202x360'
+
+
+def test_preview_windows_cover_start_and_fade_out():
+    assert preview_windows(20.0, {}) == [(0.0, 20.0)]
+    assert preview_windows(300.0, {}) == [(0.0, 30.0), (288.0, 300.0)]
+    assert preview_windows(300.0, {'preview_head_seconds': 10, 'preview_tail_seconds': 5}) == [(0.0, 10.0), (295.0, 300.0)]
+
+
+def test_batch_plan_item_limit_keeps_only_first_pending_item():
+    items = [BatchItemPlan(index=i, name=f"item{i}", narration_path=f"n{i}.mp3", duration=10.0) for i in range(3)]
+    items[0].completed = True
+    plan = BatchPlan(items=items, item_limit=1)
+
+    assert [item.name for item in plan.pending_items] == ["item1"]
+    assert plan.total_duration == 10.0
+
+
+def test_final_pass_preview_seeks_the_inputs_of_each_window(tmp_path, monkeypatch):
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    narration = tmp_path / "voz.mp3"
+    narration.write_bytes(b"0")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    params = preview_params({
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1920x1080',
+        'output_fps': 30,
+        'subtitle_style': {},
+        'output_folder': str(output_dir),
+        'output_filename_single': 'final.mp4',
+        'narration_volume': 0,
+        'music_volume': 0,
+        'add_fade_out': True,
+        'fade_out_duration': 5,
+        'video_codec': 'Automático',
+        'available_encoders': ['h264_nvenc'],
+        'render_preview': True,
+    })
+    calls = []
+
+    def fake_execute(cmd, duration, *args, **kwargs):
+        calls.append((cmd, duration))
+        open(cmd[-1], "wb").close()
+        return True
+
+    monkeypatch.setattr(final_pass, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(preview, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(final_pass, "_maybe_create_intro_clip", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_create_styled_ass_from_srt", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '120.0'}})
+
+    assert final_pass._perform_final_pass(
+        params, str(base_video), str(narration), [], None, Queue(), threading.Event(), str(tmp_path), "teste"
+    )
+
+    (head_cmd, head_duration), (tail_cmd, tail_duration), (join_cmd, _join) = calls
+    assert (head_duration, tail_duration) == (30.0, 12.0)
+    # O trecho final começa nas entradas: nada antes de 113 s é decodificado.
+    for path in (str(base_video), str(narration)):
+        at = tail_cmd.index(path)
+        assert tail_cmd[at - 5:at] == ['-ss', '113.000', '-itsoffset', '113.000', '-i']
+    assert '-ss' not in head_cmd
+    filter_complex = tail_cmd[tail_cmd.index('-filter_complex') + 1]
+    assert "fade=t=out:st=120.0:d=5.0:c=black" in filter_complex
+    assert "fps=12,setpts=PTS-STARTPTS[v_preview]" in filter_complex
+    assert "asetpts=PTS-STARTPTS[a_preview]" in filter_complex
+    assert "select=" not in filter_complex
+    assert "scale=640:360" in filter_complex
+    assert tail_cmd[tail_cmd.index('-preset') + 1] == 'ultrafast'
+    assert 'h264_nvenc' not in tail_cmd
+    assert head_cmd[head_cmd.index('-t') + 1] == "30.000000"
+    assert tail_cmd[tail_cmd.index('-t') + 1] == "12.000000"
+    assert join_cmd[join_cmd.index('-f') + 1] == 'concat'
+    assert [path.name for path in output_dir.iterdir()] == ['final_preview.mp4']
+
+
+def test_preview_params_skip_full_length_prerenders():
+    params = preview_params({'resolution': '1920x1080', 'loudnorm_enabled': True, 'audio_premix_enabled': True})
+
+    assert params['effect_prerender_enabled'] is False
+    assert params['presenter_prerender_enabled'] is False
+    assert params['subtitle_prerender_enabled'] is False
+    assert params['audio_premix_enabled'] is False
+    assert params['loudnorm_enabled'] is False
+    assert params['slideshow_fps'] == 12
+
+
+def test_preview_allocation_does_not_record_asset_usage(tmp_path):
+    from video_processing.assets import AssetPlanner
+    from video_processing.batch import _allocate_assets
+
+    params = {'asset_selection': 'lru', 'asset_seed': 1, 'render_cache_dir': str(tmp_path), 'ffmpeg_path': 'ffmpeg'}
+    videos = ["a.mp4", "b.mp4", "c.mp4"]
+    items = [BatchItemPlan(index=0, name="item0", narration_path="n0.mp3", duration=10.0)]
+
+    playable = {video: True for video in videos}
+
+    _allocate_assets(BatchPlan(items=items, playable_videos=playable), {**params, 'render_preview': True}, AssetPlanner(params), [], videos, [])
+    preview_choice = items[0].base_video_path
+    assert AssetPlanner(params).choose('library-videos', videos) == preview_choice
+
+    _allocate_assets(BatchPlan(items=items, playable_videos=playable), params, AssetPlanner(params), [], videos, [])
+    assert AssetPlanner(params).choose('library-videos', videos) != preview_choice
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from processing.concurrency import AdaptiveConcurrencyController, SystemSample
+
+
+def _sample(load=0.2, memory=0.5, cores=None, running=0, cpu_count=8):
+    return SystemSample(cpu_count=cpu_count, load_ratio=load, mem_available_ratio=memory, ffmpeg_cores=cores, running=running)
+
+
+def _controller(**kwargs):
+    defaults = dict(min_jobs=1, max_jobs=4, initial_jobs=1, interval=3600, cooldown=0, sampler=_sample)
+    defaults.update(kwargs)
+    return AdaptiveConcurrencyController(**defaults)
+
+
+def test_grows_only_with_queued_jobs_and_cpu_headroom():
+    controller = _controller()
+    assert controller.decide(_sample()) == 1
+
+    controller._running, controller._waiting = 1, 1
+    # Um libx264 usando quase todos os núcleos: não há espaço para outro encode.
+    assert controller.decide(_sample(cores=7.5, running=1)) == 1
+    # Um encode NVENC quase não usa CPU: libera mais uma vaga.
+    assert controller.decide(_sample(cores=0.4, running=1)) == 2
+
+
+def test_shrinks_under_load_or_memory_pressure_and_respects_cooldown():
+    controller = _controller(initial_jobs=3, cooldown=2)
+
+    assert controller.decide(_sample(load=2.0)) == 2
+    assert controller.decide(_sample(load=2.0)) == 2
+    assert controller.decide(_sample(load=2.0)) == 2
+    assert controller.decide(_sample(memory=0.05)) == 1
+    assert controller.decide(_sample(memory=0.05)) == 1
+
+
+def test_acquire_blocks_at_limit_and_honours_cancel():
+    controller = _controller()
+    assert controller.acquire()
+
+    cancel = threading.Event()
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(controller.acquire(cancel)))
+    waiter.start()
+    time.sleep(0.3)
+    assert waiter.is_alive()
+
+    cancel.set()
+    waiter.join(timeout=2)
+    assert result == [False]
+
+    released = []
+    waiter = threading.Thread(target=lambda: released.append(controller.acquire()))
+    waiter.start()
+    controller.release()
+    waiter.join(timeout=2)
+    assert released == [True]
+    controller.release()
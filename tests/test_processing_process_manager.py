@@ -1,3 +1,12 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from processing import process_manager as module
 from processing.process_manager import FFmpegProcessManager
 
 
@@ -27,3 +36,73 @@ def test_process_manager_tracks_and_terminates_processes():
 
     manager.terminate_all()
     assert not manager.active_processes
+
+
+def test_low_priority_prefixes_nice_and_ionice(monkeypatch):
+    manager = FFmpegProcessManager()
+    monkeypatch.setattr(module.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(module.shutil, "which", lambda name: f"/usr/bin/{name}")
+
+    assert manager.wrap_command(["ffmpeg", "-i", "a"]) == ["ffmpeg", "-i", "a"]
+
+    manager.configure(priority="Ociosa")
+    assert manager.wrap_command(["ffmpeg"]) == ["/usr/bin/nice", "-n", "19", "/usr/bin/ionice", "-c", "3", "ffmpeg"]
+    assert manager.creation_flags() == 0
+
+    manager.configure(priority="Desconhecida")
+    assert manager.priority == "Ociosa"
+
+
+def test_core_blocks_split_cores_evenly():
+    assert FFmpegProcessManager._core_blocks(list(range(8)), 3) == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    assert FFmpegProcessManager._core_blocks([0, 1], 4) == [[0], [1]]
+
+
+def test_rebalance_gives_each_process_its_own_cores(monkeypatch):
+    pinned = {}
+    monkeypatch.setattr(module.os, "sched_getaffinity", lambda pid: set(range(4)), raising=False)
+    monkeypatch.setattr(FFmpegProcessManager, "_set_affinity", staticmethod(lambda pid, cores: pinned.__setitem__(pid, cores)))
+
+    manager = FFmpegProcessManager()
+    manager.pin_cores = True
+    manager.add(DummyProcess(10))
+    assert pinned == {10: [0, 1, 2, 3]}
+
+    manager.add(DummyProcess(20))
+    assert pinned == {10: [0, 1], 20: [2, 3]}
+    manager.terminate_all()
+
+
+def _process_state(pid):
+    with open(f"/proc/{pid}/stat", encoding="ascii") as src:
+        return src.read().rsplit(")", 1)[1].split()[0]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="requer /proc (Linux)")
+def test_pause_suspends_running_processes_until_resume():
+    manager = FFmpegProcessManager()
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        manager.add(process)
+        assert manager.pause() == 1
+        time.sleep(0.2)
+        assert _process_state(process.pid) == "T"
+
+        assert manager.resume() == 1
+        time.sleep(0.2)
+        assert _process_state(process.pid) != "T"
+    finally:
+        manager.terminate_all()
+
+
+def test_wait_if_paused_blocks_new_work_and_honours_cancel():
+    manager = FFmpegProcessManager()
+    assert manager.wait_if_paused()
+
+    manager.pause()
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    assert not manager.wait_if_paused(cancel)
+
+    threading.Timer(0.3, manager.resume).start()
+    assert manager.wait_if_paused(threading.Event())
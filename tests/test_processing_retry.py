@@ -0,0 +1,85 @@
+import threading
+from queue import Queue
+
+from processing import ffmpeg_pipeline
+from processing.ffmpeg_pipeline import FFmpegOutcome
+from processing.retry import RetryPolicy, retry_policy_for
+
+
+def test_retry_policy_for_merges_overrides():
+    params = {"ffmpeg_retry_policies": {"final": {"attempts": "4", "stall_abort_seconds": 30, "unknown": 1}}}
+
+    policy = retry_policy_for("final", params)
+
+    assert policy.attempts == 4
+    assert policy.stall_abort_seconds == 30.0
+    assert retry_policy_for("final").attempts == 2
+    assert retry_policy_for("desconhecida") == RetryPolicy()
+
+
+def test_retry_policy_delay_grows_exponentially():
+    policy = RetryPolicy(backoff_seconds=2, backoff_factor=3)
+
+    assert [policy.delay(n) for n in (1, 2, 3)] == [2, 6, 18]
+
+
+def _patch_runs(monkeypatch, outcomes):
+    calls = []
+
+    def fake_run(cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue, policy, time_offset=0.0):
+        calls.append(cmd)
+        return outcomes.pop(0)
+
+    monkeypatch.setattr(ffmpeg_pipeline, "_run_ffmpeg_process", fake_run)
+    return calls
+
+
+def test_execute_ffmpeg_retries_stalled_run(monkeypatch):
+    calls = _patch_runs(monkeypatch, [FFmpegOutcome(success=False, returncode=-1, stalled=True), FFmpegOutcome(success=True, returncode=0)])
+    queue: Queue = Queue()
+
+    result = ffmpeg_pipeline.execute_ffmpeg(
+        ["ffmpeg", "-i", "in.mp4", "out.mp4"], 1.0, None, threading.Event(), "Teste", queue,
+        policy=RetryPolicy(attempts=2, backoff_seconds=0),
+    )
+
+    assert result is True
+    assert len(calls) == 2
+    messages = [item[1] for item in list(queue.queue) if item[0] == "status"]
+    assert any("nova tentativa 2/2" in message for message in messages)
+
+
+def test_execute_ffmpeg_does_not_retry_permanent_errors(monkeypatch):
+    calls = _patch_runs(monkeypatch, [FFmpegOutcome(success=False, returncode=1, output="Invalid argument")])
+
+    result = ffmpeg_pipeline.execute_ffmpeg(
+        ["ffmpeg", "-i", "in.mp4", "out.mp4"], 1.0, None, threading.Event(), "Teste", Queue(),
+        policy=RetryPolicy(attempts=3, backoff_seconds=0),
+    )
+
+    assert result is False
+    assert len(calls) == 1
+
+
+def test_execute_ffmpeg_resumes_from_last_keyframe(monkeypatch, tmp_path):
+    output = tmp_path / "vid_0.ts"
+    output.write_bytes(b"partial")
+    calls = _patch_runs(monkeypatch, [
+        FFmpegOutcome(success=False, returncode=1, output="av_interleaved_write_frame(): Input/output error"),
+        FFmpegOutcome(success=True, returncode=0),  # recorte do segmento
+        FFmpegOutcome(success=True, returncode=0),  # nova tentativa
+        FFmpegOutcome(success=True, returncode=0),  # junção
+    ])
+    monkeypatch.setattr(ffmpeg_pipeline, "probe_last_keyframe", lambda path, ffmpeg_path: 12.5)
+    monkeypatch.setattr(ffmpeg_pipeline.os, "replace", lambda src, dst: None)
+
+    result = ffmpeg_pipeline.execute_ffmpeg(
+        ["ffmpeg", "-y", "-i", "in.mp4", str(output)], 30.0, None, threading.Event(), "Teste", Queue(),
+        policy=RetryPolicy(attempts=2, backoff_seconds=0, resume_partial=True),
+    )
+
+    assert result is True
+    trim_cmd, resumed_cmd, join_cmd = calls[1:]
+    assert trim_cmd[trim_cmd.index("-t") + 1] == "12.500"
+    assert resumed_cmd[-3:] == ["-ss", "12.500", str(output)]
+    assert join_cmd[join_cmd.index("-f") + 1] == "concat"
@@ -3,6 +3,7 @@ import threading
 from pathlib import Path
 from queue import Queue
 
+import pytest
 from PIL import ImageFont
 
 from processing import typing_renderer
@@ -18,7 +19,7 @@ def test_wrap_text_to_width_breaks_long_words():
 def test_create_typing_intro_clip_smoke(tmp_path, monkeypatch):
     created_outputs = []
 
-    def fake_execute(cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue):
+    def fake_execute(cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue, policy=None):
         output_path = Path(cmd[-1])
         output_path.touch()
         created_outputs.append(output_path)
@@ -54,13 +55,13 @@ def test_create_typing_intro_clip_respects_custom_durations(tmp_path, monkeypatc
     created_outputs = []
     captured = {}
 
-    def fake_execute(cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue):
+    def fake_execute(cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue, policy=None):
         output_path = Path(cmd[-1])
         output_path.touch()
         created_outputs.append(output_path)
         return True
 
-    def fake_generate(text, char_duration, hold_duration, output_path, sample_rate=44100):
+    def fake_generate(text, char_duration, hold_duration, output_path, sample_rate=44100, pitch_jitter=0.0):
         captured["char_duration"] = char_duration
         captured["hold_duration"] = hold_duration
         Path(output_path).touch()
@@ -104,13 +105,13 @@ def test_create_typing_intro_clip_invalid_durations_fallback(tmp_path, monkeypat
     created_outputs = []
     captured = {}
 
-    def fake_execute(cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue):
+    def fake_execute(cmd, duration, progress_callback, cancel_event, log_prefix, progress_queue, policy=None):
         output_path = Path(cmd[-1])
         output_path.touch()
         created_outputs.append(output_path)
         return True
 
-    def fake_generate(text, char_duration, hold_duration, output_path, sample_rate=44100):
+    def fake_generate(text, char_duration, hold_duration, output_path, sample_rate=44100, pitch_jitter=0.0):
         captured["char_duration"] = char_duration
         captured["hold_duration"] = hold_duration
         Path(output_path).touch()
@@ -152,3 +153,55 @@ def test_create_typing_intro_clip_invalid_durations_fallback(tmp_path, monkeypat
     expected_hold_frames = max(30, int(round(30 * typing_renderer.DEFAULT_HOLD_DURATION_SECONDS)))
     expected_hold_duration = expected_hold_frames / 30.0
     assert math.isclose(captured["hold_duration"], expected_hold_duration, rel_tol=1e-6)
+
+
+def _read_frames(path):
+    import wave
+
+    with wave.open(str(path), "rb") as wav_file:
+        return wav_file.getnframes(), wav_file.readframes(wav_file.getnframes())
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_generate_typing_audio_matches_per_sample_synthesis(tmp_path, monkeypatch, use_numpy):
+    from array import array
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(typing_renderer, "np", None)
+    sample_rate = 8000
+    char_duration = 0.01
+    text = "Oi mundo"
+    output = tmp_path / "typing.wav"
+
+    duration = typing_renderer.generate_typing_audio(text, char_duration, 0.05, str(output), sample_rate=sample_rate)
+
+    expected = array("h")
+    total = int(round(char_duration * sample_rate))
+    tone = int(round(total * typing_renderer.TYPING_TONE_RATIO))
+    for char in text:
+        samples = 0 if char.isspace() else tone
+        for n in range(samples):
+            env = math.sin(math.pi * (n / tone))
+            expected.append(int(env * typing_renderer.TYPING_TONE_AMPLITUDE * 32767 * math.sin(2 * math.pi * typing_renderer.TYPING_TONE_FREQUENCY * (n / sample_rate))))
+        expected.extend([0] * (total - samples))
+    expected.extend([0] * int(round(0.05 * sample_rate)))
+
+    frames, pcm = _read_frames(output)
+    assert frames == len(expected)
+    assert duration == len(expected) / sample_rate
+    assert pcm == expected.tobytes()
+
+
+def test_generate_typing_audio_pitch_jitter_is_reproducible(tmp_path):
+    first, second, plain = tmp_path / "a.wav", tmp_path / "b.wav", tmp_path / "c.wav"
+    text = "digitando com variação"
+
+    typing_renderer.generate_typing_audio(text, 0.02, 0.0, str(first), pitch_jitter=0.1)
+    typing_renderer.generate_typing_audio(text, 0.02, 0.0, str(second), pitch_jitter=0.1)
+    typing_renderer.generate_typing_audio(text, 0.02, 0.0, str(plain))
+
+    assert _read_frames(first) == _read_frames(second)
+    assert _read_frames(first)[0] == _read_frames(plain)[0]
+    assert _read_frames(first)[1] != _read_frames(plain)[1]
@@ -0,0 +1,103 @@
+import json
+import threading
+
+import pytest
+
+import render_cli
+
+
+def _write_params(tmp_path, **overrides):
+    params = {
+        'media_type': 'batch_video',
+        'ffmpeg_path': '/usr/bin/ffmpeg',
+        'output_folder': str(tmp_path / "saida"),
+        'batch_root_folder': str(tmp_path / "lote"),
+    }
+    params.update(overrides)
+    path = tmp_path / "job.json"
+    path.write_text(json.dumps(params), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def licensed(monkeypatch):
+    monkeypatch.setattr(render_cli, "enforce_runtime_safety", lambda: None)
+    monkeypatch.setattr(
+        render_cli.license_checker, "check_license_headless", lambda key=None: (True, {}, None)
+    )
+
+
+def test_main_streams_events_as_json_lines(tmp_path, monkeypatch, capsys, licensed):
+    received = {}
+
+    def fake_entrypoint(params, progress_queue, cancel_event):
+        received.update(params)
+        progress_queue.put(("status", "Iniciando", "info"))
+        progress_queue.put(("batch_progress", 0.5))
+        progress_queue.put(("finish", True))
+        return True
+
+    monkeypatch.setattr(render_cli, "process_entrypoint", fake_entrypoint)
+    path = _write_params(tmp_path)
+
+    code = render_cli.main([str(path), "--set", "music_volume=-20", "--set", "output_filename_single=final.mp4"])
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == render_cli.EXIT_OK
+    assert events == [
+        {'event': 'status', 'message': 'Iniciando', 'level': 'info'},
+        {'event': 'batch_progress', 'value': 0.5},
+        {'event': 'finish', 'success': True},
+    ]
+    assert received['music_volume'] == -20
+    assert received['output_filename_single'] == 'final.mp4'
+    assert received['resolution'] == render_cli._PARAM_DEFAULTS['resolution']
+    assert (tmp_path / "saida").is_dir()
+
+
+def test_main_reports_render_failure(tmp_path, monkeypatch, capsys, licensed):
+    monkeypatch.setattr(render_cli, "process_entrypoint", lambda params, q, cancel: False)
+
+    assert render_cli.main([str(_write_params(tmp_path)), "--no-progress"]) == render_cli.EXIT_RENDER_FAILED
+
+
+def test_main_rejects_invalid_params(tmp_path, capsys, licensed):
+    path = _write_params(tmp_path, media_type="desconhecido")
+
+    assert render_cli.main([str(path)]) == render_cli.EXIT_USAGE
+    assert "media_type" in capsys.readouterr().err
+
+
+def test_main_stops_without_license(tmp_path, monkeypatch, capsys):
+    called = []
+    monkeypatch.setattr(render_cli, "enforce_runtime_safety", lambda: None)
+    monkeypatch.setattr(
+        render_cli.license_checker, "check_license_headless", lambda key=None: (False, None, "expirada")
+    )
+    monkeypatch.setattr(render_cli, "process_entrypoint", lambda *args: called.append(args))
+
+    assert render_cli.main([str(_write_params(tmp_path))]) == render_cli.EXIT_LICENSE
+    assert called == []
+    assert "expirada" in capsys.readouterr().err
+
+
+def test_run_returns_cancelled_exit_code(tmp_path, monkeypatch):
+    cancel = threading.Event()
+
+    def fake_entrypoint(params, progress_queue, cancel_event):
+        cancel_event.set()
+        progress_queue.put(("finish", False))
+        return False
+
+    monkeypatch.setattr(render_cli, "process_entrypoint", fake_entrypoint)
+
+    class _Sink:
+        lines = []
+
+        def write(self, text):
+            self.lines.append(text)
+
+        def flush(self):
+            pass
+
+    assert render_cli.run({}, _Sink(), cancel) == render_cli.EXIT_CANCELLED
@@ -0,0 +1,124 @@
+import os
+import threading
+from queue import Queue
+
+from video_processing import batch, preflight
+from video_processing.fingerprint import is_output_up_to_date, render_fingerprint, write_render_sidecar
+from video_processing.journal import _render_params_hash
+
+
+def test_fingerprint_ignores_params_the_final_pass_does_not_use(tmp_path):
+    narration = tmp_path / "voz.mp3"
+    narration.write_bytes(b"0")
+    params = {'resolution': '1920x1080', 'music_volume': -15, 'output_folder': 'a', 'show_tech_logs': True}
+
+    base = render_fingerprint(params, [str(narration)])
+
+    assert render_fingerprint({**params, 'output_folder': 'b', 'show_tech_logs': False}, [str(narration)]) == base
+    assert render_fingerprint({**params, 'music_volume': -10}, [str(narration)]) != base
+    assert render_fingerprint({**params, 'banner_texts': {'PT': 'Olá'}}, [str(narration)]) != base
+
+    os.utime(narration, ns=(0, 0))
+    assert render_fingerprint(params, [str(narration)]) != base
+
+
+def test_fingerprint_covers_slideshow_and_music_playlist_params(tmp_path):
+    narration = tmp_path / "voz.mp3"
+    narration.write_bytes(b"0")
+    params = {
+        'resolution': '1920x1080',
+        'image_duration': 5,
+        'slideshow_fps': 30,
+        'slideshow_crf': 23,
+        'batch_music_behavior': 'loop',
+        'music_concat_bitrate': '192k',
+    }
+    base = render_fingerprint(params, [str(narration)])
+
+    for key, value in (
+        ('image_duration', 8),
+        ('slideshow_fps', 25),
+        ('slideshow_crf', 18),
+        ('slideshow_preset', 'slow'),
+        ('slideshow_video_codec', 'libx265'),
+        ('batch_music_behavior', 'random'),
+        ('music_concat_codec', 'libmp3lame'),
+        ('music_concat_bitrate', '320k'),
+    ):
+        assert render_fingerprint({**params, key: value}, [str(narration)]) != base, key
+
+
+def test_fingerprint_ignores_prerender_and_track_codec_switches(tmp_path):
+    narration = tmp_path / "voz.mp3"
+    narration.write_bytes(b"0")
+    params = {'resolution': '1920x1080', 'presenter_scale': 0.4, 'presenter_prerender_enabled': True, 'presenter_track_codec': 'prores'}
+    base = render_fingerprint(params, [str(narration)])
+
+    for key, value in (
+        ('presenter_prerender_enabled', False),
+        ('presenter_track_codec', 'vp9'),
+        ('effect_prerender_enabled', False),
+        ('subtitle_prerender_enabled', True),
+        ('audio_premix_enabled', False),
+    ):
+        assert render_fingerprint({**params, key: value}, [str(narration)]) == base, key
+        assert _render_params_hash({**params, key: value}) == _render_params_hash(params), key
+    assert render_fingerprint({**params, 'presenter_scale': 0.5}, [str(narration)]) != base
+
+
+def test_sidecar_round_trip_checks_size(tmp_path):
+    output = tmp_path / "video_final_a.mp4"
+    output.write_bytes(b"video")
+    write_render_sidecar(str(output), "abc")
+
+    assert is_output_up_to_date(str(output), "abc")
+    assert not is_output_up_to_date(str(output), "outro")
+
+    output.write_bytes(b"video regravado")
+    assert not is_output_up_to_date(str(output), "abc")
+
+
+def test_skip_unchanged_rerenders_only_after_relevant_change(tmp_path, monkeypatch):
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    for name in ("a.mp3", "b.mp3"):
+        (audio_dir / name).write_bytes(b"0")
+    image_dir = tmp_path / "imagens"
+    image_dir.mkdir()
+    (image_dir / "foto.png").write_bytes(b"0")
+    output_dir = tmp_path / "saida"
+    output_dir.mkdir()
+
+    monkeypatch.setattr(preflight, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '5.0'}, 'streams': []})
+    monkeypatch.setattr(batch, "_process_images_in_chunks", lambda *args, **kwargs: (str(tmp_path / "slideshow.mp4"), True))
+    rendered = []
+
+    def fake_final_pass(**kwargs):
+        name = kwargs['params']['output_filename_single']
+        rendered.append(name)
+        (output_dir / name).write_bytes(b"video")
+        return True
+
+    monkeypatch.setattr(batch, "_perform_final_pass", fake_final_pass)
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'batch_audio_folder': str(audio_dir),
+        'batch_image_parent_folder': str(image_dir),
+        'output_folder': str(output_dir),
+        'resolution': '1280x720',
+        'scratch_min_free_mb': 0,
+        'batch_resume_enabled': False,
+        'skip_unchanged_outputs': True,
+    }
+
+    assert batch._run_batch_image_processing(params, Queue(), threading.Event(), str(tmp_path))
+    assert batch._run_batch_image_processing({**params, 'show_tech_logs': True}, Queue(), threading.Event(), str(tmp_path))
+    assert rendered == ["video_final_a.mp4", "video_final_b.mp4"]
+
+    os.utime(audio_dir / "b.mp3", ns=(0, 0))
+    assert batch._run_batch_image_processing(params, Queue(), threading.Event(), str(tmp_path))
+    assert rendered[2:] == ["video_final_b.mp4"]
+
+    (image_dir / "outra.png").write_bytes(b"0")
+    assert batch._run_batch_image_processing(params, Queue(), threading.Event(), str(tmp_path))
+    assert rendered[3:] == ["video_final_a.mp4", "video_final_b.mp4"]
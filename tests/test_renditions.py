@@ -0,0 +1,73 @@
+import threading
+from queue import Queue
+
+from video_processing import final_pass
+from video_processing.renditions import OutputRendition, parse_renditions
+
+
+def test_parse_renditions_accepts_text_and_dicts():
+    renditions = parse_renditions(
+        {'output_renditions': "1280x720@4M, 1080x1920:_vertical, lixo, 1920x1080"},
+        primary=(1920, 1080),
+    )
+
+    assert renditions == [
+        OutputRendition(1280, 720, "_1280x720", "4M"),
+        OutputRendition(1080, 1920, "_vertical"),
+    ]
+    assert renditions[0].rate_args() == ['-maxrate', '4M', '-bufsize', '8M']
+    assert renditions[0].scale_filter((1920, 1080)) == "scale=1280:720,setsar=1"
+    assert "crop=1080:1920" in renditions[1].scale_filter((1920, 1080))
+    assert renditions[1].output_filename("video.mp4") == "video_vertical.mp4"
+
+    from_dicts = parse_renditions({'output_renditions': [{'resolution': '853x480', 'suffix': '_sd', 'audio_bitrate': '128k'}]})
+    assert from_dicts == [OutputRendition(852, 480, "_sd", None, "128k")]
+
+
+def test_final_pass_feeds_every_rendition_from_one_graph(tmp_path, monkeypatch):
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    narration = tmp_path / "voz.mp3"
+    narration.write_bytes(b"0")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1920x1080',
+        'subtitle_style': {},
+        'output_folder': str(output_dir),
+        'output_filename_single': 'final.mp4',
+        'narration_volume': 0,
+        'music_volume': 0,
+        'video_codec': 'Automático',
+        'available_encoders': [],
+        'output_renditions': "1280x720@4M, 1080x1920:_vertical",
+    }
+    captured = {}
+
+    def fake_execute(cmd, *args, **kwargs):
+        captured['cmd'] = cmd
+        for arg in cmd:
+            if arg.endswith('.part.mp4'):
+                open(arg, "wb").close()
+        return True
+
+    monkeypatch.setattr(final_pass, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(final_pass, "_maybe_create_intro_clip", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_create_styled_ass_from_srt", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '10.0'}})
+
+    assert final_pass._perform_final_pass(
+        params, str(base_video), str(narration), [], None, Queue(), threading.Event(), str(tmp_path), "teste"
+    )
+
+    cmd = captured['cmd']
+    assert cmd.count('-filter_complex') == 1
+    filter_complex = cmd[cmd.index('-filter_complex') + 1]
+    assert "split=3[vsplit0][vsplit1][vsplit2]" in filter_complex
+    assert "asplit=3[asplit0][asplit1][asplit2]" in filter_complex
+    assert "[vsplit1]scale=1280:720,setsar=1,format=yuv420p[vout1]" in filter_complex
+    assert "crop=1080:1920" in filter_complex
+    assert cmd.count('-c:v') == 3
+    assert cmd[cmd.index('-maxrate') + 1] == '4M'
+    assert sorted(path.name for path in output_dir.iterdir()) == ['final.mp4', 'final_1280x720.mp4', 'final_vertical.mp4']
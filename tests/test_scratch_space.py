@@ -0,0 +1,57 @@
+from collections import namedtuple
+from queue import Queue
+
+from video_processing import scratch as scratch_module
+from video_processing.scratch import ScratchSpace, _estimate_video_bytes
+
+_Usage = namedtuple("_Usage", "total used free")
+
+
+def test_create_uses_configured_root_and_cleans_up(tmp_path):
+    root = tmp_path / "fast"
+    root.mkdir()
+
+    space = ScratchSpace.create({'scratch_folder': str(root), 'scratch_quota_mb': '2'})
+    item = space.new_item_dir(prefix="item-")
+
+    assert space.path.startswith(str(root))
+    assert item.startswith(space.path)
+    assert space.quota_bytes == 2 * 1024 * 1024
+
+    space.cleanup()
+
+    assert list(root.iterdir()) == []
+
+
+def test_create_falls_back_when_root_is_missing(tmp_path):
+    space = ScratchSpace.create({'scratch_folder': str(tmp_path / "nao-existe")})
+    try:
+        assert not space.path.startswith(str(tmp_path))
+    finally:
+        space.cleanup()
+
+
+def test_ensure_space_enforces_quota_and_free_space(tmp_path, monkeypatch):
+    space = ScratchSpace.attach(str(tmp_path), {'scratch_quota_mb': 1, 'scratch_min_free_mb': 10})
+    item = space.new_item_dir(prefix="item-")
+    with open(f"{item}/slideshow.mp4", "wb") as fp:
+        fp.write(b"0" * 600 * 1024)
+
+    monkeypatch.setattr(scratch_module.shutil, "disk_usage", lambda path: _Usage(0, 0, 50 * 1024 * 1024))
+    queue = Queue()
+
+    assert space.ensure_space(100 * 1024, "música", queue, "teste")
+    assert not space.ensure_space(500 * 1024, "slideshow", queue, "teste")
+    assert "cota" in queue.get_nowait()[1]
+
+    space.release(item)
+    assert space.ensure_space(500 * 1024, "slideshow", queue, "teste")
+    assert not space.ensure_space(45 * 1024 * 1024, "passe final", queue, "teste")
+    assert "espaço livre insuficiente" in queue.get_nowait()[1]
+    assert tmp_path.exists()
+
+
+def test_video_estimate_scales_with_resolution_and_duration():
+    assert _estimate_video_bytes(0, (1920, 1080)) == 0
+    assert _estimate_video_bytes(10, (1920, 1080)) == 2 * _estimate_video_bytes(5, (1920, 1080))
+    assert _estimate_video_bytes(10, (1920, 1080)) > _estimate_video_bytes(10, (1280, 720))
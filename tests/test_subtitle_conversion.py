@@ -0,0 +1,69 @@
+from video_processing.utils import _create_styled_ass_from_srt, _iter_srt_cues
+
+
+def _dialogues(path):
+    with open(path, encoding="utf-8") as fp:
+        return [line for line in fp.read().splitlines() if line.startswith("Dialogue:")]
+
+
+def test_iter_srt_cues_tolerates_malformed_blocks():
+    srt = [
+        "1",
+        "00:00:01,000 --> 00:00:02,500",
+        "Olá",
+        "mundo",
+        "",
+        "lixo solto",
+        "",
+        "2",
+        "00:00:03.000 --> 00:00:04.000 X1:10 X2:20",
+        "Sem linha em branco",
+        "3",
+        "00:00:05,000 --> 00:00:06,000",
+        "2024",
+        "",
+        "4",
+        "00:00:07,000 --> 00:00:06,000",
+        "Fim antes do início",
+        "",
+        "5",
+        "00:00:08,000 --> 00:00:09,000",
+        "",
+    ]
+
+    cues = list(_iter_srt_cues(srt))
+
+    assert cues == [
+        (100, 250, "Olá\\Nmundo"),
+        (300, 400, "Sem linha em branco"),
+        (500, 600, "2024"),
+    ]
+
+
+def test_styled_ass_is_cached_by_content_style_and_resolution(tmp_path):
+    srt = tmp_path / "legenda.srt"
+    srt.write_text("1\r\n00:00:01,000 --> 00:00:02,000\r\nOi\r\n", encoding="utf-8-sig")
+    cache_dir = tmp_path / "cache"
+    style = {"fontsize": 30, "text_color": "#FFFFFF"}
+
+    first = _create_styled_ass_from_srt(str(srt), style, str(tmp_path / "a"), (1920, 1080), cache_dir=str(cache_dir))
+    second = _create_styled_ass_from_srt(str(srt), dict(style), str(tmp_path / "b"), (1920, 1080), cache_dir=str(cache_dir))
+    other_style = _create_styled_ass_from_srt(str(srt), {**style, "fontsize": 40}, str(tmp_path / "c"), (1920, 1080), cache_dir=str(cache_dir))
+    other_res = _create_styled_ass_from_srt(str(srt), style, str(tmp_path / "d"), (1280, 720), cache_dir=str(cache_dir))
+
+    assert first == second
+    assert len({first, other_style, other_res}) == 3
+    assert _dialogues(first) == ["Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0000,0000,0000,,Oi"]
+    assert not list(cache_dir.glob("*.part"))
+
+
+def test_styled_ass_falls_back_for_non_utf8_and_empty_files(tmp_path):
+    latin = tmp_path / "latin.srt"
+    latin.write_bytes("1\n00:00:01,000 --> 00:00:02,000\nAção\n".encode("cp1252"))
+    empty = tmp_path / "vazio.srt"
+    empty.write_text("sem cues\n", encoding="utf-8")
+
+    converted = _create_styled_ass_from_srt(str(latin), {}, str(tmp_path), (1920, 1080))
+
+    assert _dialogues(converted)[0].endswith(",,Ação")
+    assert _create_styled_ass_from_srt(str(empty), {}, str(tmp_path), (1920, 1080)) == str(empty)
@@ -0,0 +1,85 @@
+import threading
+from queue import Queue
+
+from video_processing import final_pass, subtitle_overlay
+
+
+def _srt(tmp_path):
+    srt = tmp_path / "item.srt"
+    srt.write_text("1\n00:00:01,000 --> 00:00:03,000\nOlá\n\n2\n00:00:05,000 --> 00:00:07,250\nTchau\n", encoding="utf-8")
+    return srt
+
+
+def test_prerender_builds_rgba_overlay_and_reuses_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_execute(cmd, duration, progress_cb, cancel_event, log_prefix, progress_queue, policy=None):
+        calls.append((cmd, duration))
+        with open(cmd[-1], "wb") as fp:
+            fp.write(b"mov")
+        return True
+
+    monkeypatch.setattr(subtitle_overlay, "_execute_ffmpeg", fake_execute)
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1920x1080',
+        'subtitle_style': {'fontsize': 40},
+        'render_cache_dir': str(tmp_path / "cache"),
+    }
+    srt = _srt(tmp_path)
+
+    first = subtitle_overlay._prerender_subtitle_overlay(params, str(srt), Queue(), threading.Event(), "teste")
+    second = subtitle_overlay._prerender_subtitle_overlay(params, str(srt), Queue(), threading.Event(), "teste")
+
+    assert first == second
+    assert first.endswith(".mov")
+    assert len(calls) == 1
+    cmd, duration = calls[0]
+    assert duration == 7.75
+    assert "qtrle" in cmd
+    assert any(arg.startswith("color=c=black@0.0:s=1920x1080") for arg in cmd)
+    assert cmd[cmd.index('-vf') + 1].endswith(":alpha=1")
+
+
+def test_final_pass_composites_prerendered_subtitles(tmp_path, monkeypatch):
+    base_video = tmp_path / "base.mp4"
+    base_video.write_bytes(b"0")
+    overlay = tmp_path / "subs.mov"
+    overlay.write_bytes(b"0")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'resolution': '1920x1080',
+        'subtitle_style': {},
+        'output_folder': str(output_dir),
+        'output_filename_single': 'final.mp4',
+        'narration_volume': 0,
+        'music_volume': 0,
+        'subtitle_prerender_enabled': True,
+        'subtitle_overlay_path': str(overlay),
+    }
+    captured = {}
+
+    def fake_execute(cmd, *args, **kwargs):
+        captured['cmd'] = cmd
+        return True
+
+    def unexpected_styling(*args, **kwargs):
+        raise AssertionError("subtitles= não deve ser usado com a camada pré-renderizada")
+
+    monkeypatch.setattr(final_pass, "_execute_ffmpeg", fake_execute)
+    monkeypatch.setattr(final_pass, "_maybe_create_intro_clip", lambda *args, **kwargs: None)
+    monkeypatch.setattr(final_pass, "_create_styled_ass_from_srt", unexpected_styling)
+    monkeypatch.setattr(final_pass, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '10.0'}})
+
+    assert final_pass._perform_final_pass(
+        params, str(base_video), None, [], str(_srt(tmp_path)), Queue(), threading.Event(), str(tmp_path), "teste"
+    )
+
+    cmd = captured['cmd']
+    filter_str = cmd[cmd.index('-filter_complex') + 1]
+    assert str(overlay) in cmd
+    assert "[1:v]overlay=0:0:format=auto:eof_action=pass[v_subs]" in filter_str
+    assert "subtitles=" not in filter_str
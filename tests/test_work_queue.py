@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from queue import Queue
+
+from video_processing import batch, preflight
+from video_processing.preflight import BatchItemPlan
+from video_processing.work_queue import WorkQueue
+
+
+def _item(name):
+    return BatchItemPlan(0, f"{name}.mp3", f"/lote/{name}.mp3", output_name=f"video_final_{name}.mp4")
+
+
+def test_only_one_worker_claims_an_item(tmp_path):
+    first = WorkQueue(str(tmp_path), worker_id="a")
+    second = WorkQueue(str(tmp_path), worker_id="b")
+    item = _item("x")
+
+    assert first.claim(item)
+    assert not second.claim(item)
+
+    first.complete(item, True)
+
+    assert not second.claim(item)
+    assert second.is_done(item)
+    assert not os.path.exists(tmp_path / "video_final_x.mp4.lock")
+    first.close()
+
+
+def test_failed_item_is_released_for_other_workers(tmp_path):
+    first = WorkQueue(str(tmp_path), worker_id="a")
+    second = WorkQueue(str(tmp_path), worker_id="b")
+    item = _item("x")
+
+    assert first.claim(item)
+    first.complete(item, False)
+
+    assert second.claim(item)
+    first.close()
+    second.close()
+
+
+def test_expired_lease_is_recovered(tmp_path):
+    dead = WorkQueue(str(tmp_path), worker_id="morto", lease_seconds=60)
+    alive = WorkQueue(str(tmp_path), worker_id="vivo", lease_seconds=60)
+    item = _item("x")
+    assert dead.claim(item)
+    dead._stop.set()
+
+    assert not alive.claim(item)
+
+    lock_path = tmp_path / "video_final_x.mp4.lock"
+    old = time.time() - 120
+    os.utime(lock_path, (old, old))
+
+    assert alive.claim(item)
+    assert alive._lock_owner(str(lock_path)) == "vivo"
+
+    # O worker antigo não pode apagar o lock que agora pertence a outro.
+    dead.complete(item, False)
+    assert lock_path.exists()
+    alive.close()
+
+
+def test_two_workers_breaking_the_same_stale_lock_do_not_both_claim(tmp_path):
+    dead = WorkQueue(str(tmp_path), worker_id="morto", lease_seconds=60)
+    first = WorkQueue(str(tmp_path), worker_id="a", lease_seconds=60)
+    second = WorkQueue(str(tmp_path), worker_id="b", lease_seconds=60)
+    item = _item("x")
+    assert dead.claim(item)
+    dead._stop.set()
+    lock_path = tmp_path / "video_final_x.mp4.lock"
+    old = time.time() - 120
+    os.utime(lock_path, (old, old))
+
+    original_expired = second._lease_expired
+    interleaved = []
+
+    def expired_then_first_wins(path):
+        result = original_expired(path)
+        if not interleaved:
+            # "b" já viu o lease expirado; "a" quebra o lock e cria o seu antes de "b" renomear.
+            interleaved.append(True)
+            assert first.claim(item)
+        return result
+
+    second._lease_expired = expired_then_first_wins
+
+    assert not second.claim(item)
+    assert first._lock_owner(str(lock_path)) == "a"
+    assert not list(tmp_path.glob("*.stale-*"))
+    first.close()
+    second.close()
+
+
+def test_iter_claims_waits_for_items_held_elsewhere(tmp_path):
+    other = WorkQueue(str(tmp_path), worker_id="outro")
+    worker = WorkQueue(str(tmp_path), worker_id="eu", poll_seconds=0.01)
+    busy, free = _item("ocupado"), _item("livre")
+    assert other.claim(busy)
+
+    claimed = []
+    for item in worker.iter_claims([busy, free], threading.Event()):
+        claimed.append(item.output_name)
+        worker.complete(item, True)
+        if item is free:
+            other.complete(busy, True)
+
+    assert claimed == ["video_final_livre.mp4"]
+    other.close()
+
+
+def test_hierarchical_batch_workers_split_items(tmp_path, monkeypatch):
+    root = tmp_path / "raiz"
+    (root / "PT").mkdir(parents=True)
+    for name in ("a.mp3", "b.mp3", "c.mp3"):
+        (root / "PT" / name).write_bytes(b"0")
+    media = tmp_path / "midia"
+    media.mkdir()
+    (media / "foto.png").write_bytes(b"0")
+    output_dir = tmp_path / "saida"
+    output_dir.mkdir()
+
+    monkeypatch.setattr(preflight, "_probe_media_properties", lambda path, ffmpeg: {'format': {'duration': '5.0'}, 'streams': []})
+    monkeypatch.setattr(batch, "_process_images_in_chunks", lambda *args, **kwargs: (str(tmp_path / "slideshow.mp4"), True))
+
+    held_by_other = WorkQueue(str(tmp_path / "fila"), worker_id="outro")
+    rendered = []
+
+    def fake_final_pass(**kwargs):
+        rendered.append(kwargs['params']['output_filename_single'])
+        return True
+
+    monkeypatch.setattr(batch, "_perform_final_pass", fake_final_pass)
+    params = {
+        'ffmpeg_path': 'ffmpeg',
+        'batch_root_folder': str(root),
+        'batch_image_parent_folder': str(media),
+        'output_folder': str(output_dir),
+        'resolution': '1280x720',
+        'scratch_min_free_mb': 0,
+        'batch_resume_enabled': False,
+        'work_queue_folder': str(tmp_path / "fila"),
+        'work_queue_poll_seconds': 0.01,
+    }
+    os.makedirs(params['work_queue_folder'])
+    held_item = BatchItemPlan(1, "b.mp3", str(root / "PT" / "b.mp3"), output_name="video_final_b.mp4")
+    assert held_by_other.claim(held_item)
+    held_by_other.complete(held_item, True)
+
+    assert batch._run_hierarchical_batch_image_processing(params, Queue(), threading.Event(), str(tmp_path))
+
+    assert rendered == ["video_final_a.mp4", "video_final_c.mp4"]
+    assert sorted(p.name for p in (tmp_path / "fila").iterdir()) == [
+        "video_final_a.mp4.done", "video_final_b.mp4.done", "video_final_c.mp4.done",
+    ]
+    held_by_other.close()
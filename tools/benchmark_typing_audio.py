@@ -0,0 +1,85 @@
+"""Mede a síntese do som de digitação para introduções longas.
+
+Compara ``generate_typing_audio`` com a síntese amostra a amostra usada
+anteriormente (mantida aqui só como referência)::
+
+    python tools/benchmark_typing_audio.py --chars 2000 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+import wave
+from array import array
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import typing_renderer  # noqa: E402
+
+
+def reference_typing_audio(text: str, char_duration: float, hold_duration: float, output_path: str, sample_rate: int = 44100) -> float:
+    data = array("h")
+    for char in text:
+        total_samples = max(1, int(round(char_duration * sample_rate)))
+        tone_samples = 0
+        if not char.isspace():
+            tone_samples = min(max(1, int(round(total_samples * typing_renderer.TYPING_TONE_RATIO))), total_samples)
+        for n in range(tone_samples):
+            env = math.sin(math.pi * (n / max(1, tone_samples)))
+            data.append(int(env * typing_renderer.TYPING_TONE_AMPLITUDE * 32767 * math.sin(2 * math.pi * typing_renderer.TYPING_TONE_FREQUENCY * (n / sample_rate))))
+        data.extend([0] * (total_samples - tone_samples))
+    data.extend([0] * max(0, int(round(hold_duration * sample_rate))))
+    with wave.open(output_path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(data.tobytes())
+    return len(data) / float(sample_rate)
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=2000, help="Tamanho do texto da introdução")
+    parser.add_argument("--char-duration", type=float, default=0.08, help="Segundos por caractere")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Variação de altura por tecla")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por variante (vale a melhor)")
+    args = parser.parse_args()
+
+    text = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (args.chars // 57 + 1))[: args.chars]
+    backend = "NumPy" if typing_renderer.np is not None else "array"
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "typing.wav")
+        reference = _best_of(args.repeat, lambda: reference_typing_audio(text, args.char_duration, 1.5, out))
+        typing_renderer._keystroke_tone.cache_clear()
+        cold = _best_of(1, lambda: typing_renderer.generate_typing_audio(text, args.char_duration, 1.5, out))
+        warm = _best_of(args.repeat, lambda: typing_renderer.generate_typing_audio(text, args.char_duration, 1.5, out))
+        jitter = _best_of(args.repeat, lambda: typing_renderer.generate_typing_audio(text, args.char_duration, 1.5, out, pitch_jitter=args.jitter))
+
+    print(f"{args.chars} caracteres, {args.char_duration:.3f}s por tecla (tons via {backend})")
+    rows = [
+        ("referência (amostra a amostra)", reference),
+        ("blocos pré-calculados (frio)", cold),
+        ("blocos pré-calculados (cache)", warm),
+        (f"com jitter de {args.jitter:.0%}", jitter),
+    ]
+    for label, elapsed in rows:
+        print(f"  {label + ':':<32}{elapsed * 1000:9.1f} ms  ({reference / elapsed:6.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
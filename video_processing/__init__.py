@@ -1,6 +1,6 @@
 """Modular building blocks for the AUTOM TICO video processing pipeline."""
 
-from . import intro, final_pass, batch, utils, shared, banner
+from . import intro, final_pass, batch, utils, shared, banner, cache, subtitle_overlay, scratch, preflight, journal, work_queue, fingerprint, presenter, effect_overlay, audio_mix, loudness, renditions, preview, frame_preview
 
 __all__ = [
     "intro",
@@ -9,4 +9,18 @@ __all__ = [
     "utils",
     "shared",
     "banner",
+    "cache",
+    "subtitle_overlay",
+    "scratch",
+    "preflight",
+    "journal",
+    "work_queue",
+    "fingerprint",
+    "presenter",
+    "effect_overlay",
+    "audio_mix",
+    "loudness",
+    "renditions",
+    "preview",
+    "frame_preview",
 ]
@@ -0,0 +1,173 @@
+"""Sorteio reprodutível e equilibrado das mídias partilhadas por um lote."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Generic, Hashable, Iterable, List, Optional, Sequence, TypeVar
+
+from .cache import resolve_cache_dir
+from .shared import logger
+
+__all__ = [
+    "ASSET_STRATEGIES",
+    "AssetAllocator",
+    "AssetPlanner",
+    "resolve_asset_seed",
+]
+
+ASSET_STRATEGIES = ('balanced', 'lru')
+_USAGE_FILE = "usage.json"
+
+T = TypeVar("T")
+
+
+def resolve_asset_seed(params: Dict[str, Any]) -> int:
+    """Semente do lote: ``params['asset_seed']`` quando definida, senão uma nova aleatória."""
+
+    raw = params.get('asset_seed')
+    if raw not in (None, ''):
+        try:
+            return int(raw)
+        except (TypeError, ValueError):
+            logger.warning("Semente de mídias inválida %r; sorteando uma nova.", raw)
+    return random.SystemRandom().randrange(1, 2 ** 31)
+
+
+class AssetAllocator(Generic[T]):
+    """Entrega as mídias de uma biblioteca em ordem reprodutível e com uso equilibrado.
+
+    ``balanced`` percorre permutações sorteadas da biblioteca: nenhuma mídia é
+    repetida antes de todas terem sido usadas, e a permutação seguinte não
+    começa pela última entregue. ``lru`` começa pelas mídias usadas há mais
+    tempo (segundo ``last_used``, de lotes anteriores) e segue em rodízio.
+    Cada chamada a :meth:`next` custa O(1) amortizado.
+    """
+
+    def __init__(
+        self,
+        assets: Sequence[T],
+        seed: Optional[int] = None,
+        label: str = "",
+        strategy: str = 'balanced',
+        last_used: Optional[Dict[str, float]] = None,
+        on_use: Optional[Callable[[T], None]] = None,
+    ) -> None:
+        if strategy not in ASSET_STRATEGIES:
+            logger.warning("Estratégia de sorteio desconhecida '%s'; usando 'balanced'.", strategy)
+            strategy = 'balanced'
+        self.assets = list(assets)
+        self.strategy = strategy
+        self._rng = random.Random(f"{seed}:{label}") if seed is not None else random.Random()
+        self._queue: Deque[T] = deque()
+        self._last: Optional[T] = None
+        self._on_use = on_use
+        if strategy == 'lru' and self.assets:
+            order = self._permutation()
+            usage = last_used or {}
+            order.sort(key=lambda asset: usage.get(str(asset), 0.0))
+            self._queue.extend(order)
+
+    def _permutation(self) -> List[T]:
+        order = list(self.assets)
+        self._rng.shuffle(order)
+        return order
+
+    def next(self) -> T:
+        if not self.assets:
+            raise IndexError("biblioteca de mídias vazia")
+        if not self._queue:
+            order = self._permutation()
+            if len(order) > 1 and order[0] == self._last:
+                order[0], order[-1] = order[-1], order[0]
+            self._queue.extend(order)
+        asset = self._queue.popleft()
+        if self.strategy == 'lru':
+            self._queue.append(asset)
+        self._last = asset
+        if self._on_use is not None:
+            self._on_use(asset)
+        return asset
+
+    def take(self, count: int) -> List[T]:
+        return [self.next() for _ in range(max(0, count))]
+
+
+class AssetPlanner:
+    """Um alocador por biblioteca, todos derivados da mesma semente do lote.
+
+    Com a estratégia ``lru`` a data de uso de cada mídia fica guardada na pasta
+    de cache, de modo que lotes seguintes comecem pelas menos usadas.
+    """
+
+    def __init__(self, params: Dict[str, Any], seed: Optional[int] = None) -> None:
+        self.seed = resolve_asset_seed(params) if seed is None else seed
+        self.strategy = params.get('asset_selection') or 'balanced'
+        self._params = params
+        self._allocators: Dict[Hashable, AssetAllocator] = {}
+        self._last_used: Optional[Dict[str, float]] = None
+        # Ordenado pela entrega mais recente (dict preserva a ordem de inserção).
+        self._used: Dict[str, None] = {}
+
+    def allocator(self, label: str, assets: Iterable[T]) -> AssetAllocator[T]:
+        """Alocador da biblioteca ``assets``; chamadas com o mesmo conjunto partilham o estado."""
+
+        assets = list(assets)
+        key = (label, tuple(str(asset) for asset in assets))
+        if key not in self._allocators:
+            last_used = self._load_usage() if self.strategy == 'lru' else None
+            self._allocators[key] = AssetAllocator(assets, self.seed, label, self.strategy, last_used, on_use=self._mark_used)
+        return self._allocators[key]
+
+    def choose(self, label: str, assets: Sequence[T]) -> T:
+        return self.allocator(label, assets).next()
+
+    def _usage_path(self) -> Optional[str]:
+        try:
+            return os.path.join(resolve_cache_dir(self._params, 'assets'), _USAGE_FILE)
+        except OSError as exc:
+            logger.warning("Histórico de uso das mídias indisponível: %s", exc)
+            return None
+
+    def _load_usage(self) -> Dict[str, float]:
+        if self._last_used is None:
+            self._last_used = {}
+            path = self._usage_path()
+            if path:
+                try:
+                    with open(path, 'r', encoding='utf-8') as src:
+                        data = json.load(src)
+                    if isinstance(data, dict):
+                        self._last_used = {str(key): float(value) for key, value in data.items()}
+                except (OSError, ValueError, TypeError):
+                    pass
+        return self._last_used
+
+    def save_usage(self) -> None:
+        """Marca como recém-usadas as mídias entregues (só na estratégia ``lru``)."""
+
+        if self.strategy != 'lru' or not self._used:
+            return
+        path = self._usage_path()
+        if not path:
+            return
+        usage = dict(self._load_usage())
+        now = time.time()
+        # Preserva a ordem de entrega: a última entregue é a mais recente.
+        for offset, asset in enumerate(self._used):
+            usage[asset] = now + offset * 1e-6
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as dst:
+                json.dump(usage, dst, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Não foi possível gravar o histórico de uso das mídias: %s", exc)
+
+    def _mark_used(self, asset: Any) -> None:
+        key = str(asset)
+        self._used.pop(key, None)
+        self._used[key] = None
@@ -0,0 +1,284 @@
+"""Narration + ducked music pre-mix, rendered apart from the video encode."""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .cache import cache_entry_lock, file_fingerprint, resolve_cache_dir, stable_hash
+from .loudness import combine_measurements, loudness_enabled, loudness_targets, loudnorm_filter, measure_cached
+from .shared import _execute_ffmpeg, _probe_media_properties, logger, retry_policy_for
+
+__all__ = [
+    "_audio_premix_enabled",
+    "_build_audio_mix_filters",
+    "_prerender_audio_mix",
+    "_start_audio_premix",
+    "_collect_audio_premix",
+    "_wait_audio_premix",
+]
+
+_AUDIO_MIX_VERSION = 3
+_AUDIO_CODEC_ARGS = ['-c:a', 'aac', '-b:a', '192k']
+
+_PREMIX_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="audio-premix")
+
+
+def _audio_premix_enabled(params: Dict[str, Any]) -> bool:
+    # Uma pré-mixagem que já falhou não é repetida, nem com a normalização de loudness ligada.
+    if params.get('audio_premix_attempted'):
+        return False
+    # A normalização de loudness só é aplicada na pré-mixagem.
+    return bool(params.get('audio_premix_enabled')) or loudness_enabled(params)
+
+
+def _fade_duration(params: Dict[str, Any]) -> float:
+    if not params.get('add_fade_out'):
+        return 0.0
+    try:
+        return max(0.0, float(params.get('fade_out_duration', 10)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _build_audio_mix_filters(
+    params: Dict[str, Any],
+    narration_idx: Optional[int],
+    music_idx: Optional[int],
+    fade_start_time: float,
+    loudness_filters: Optional[Dict[str, str]] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """Volumes, ducking da música pela narração, mixagem e fade-out final.
+
+    ``loudness_filters`` traz, por faixa (``narration``/``music``), o
+    ``loudnorm`` aplicado antes do ganho em dB. O alvo vale para cada faixa:
+    com 0 dB a narração sai no loudness pedido e a música, já abaixada, soma-se
+    por baixo; por isso o ``amix`` não divide as entradas nesse caso. Sem
+    normalização a mixagem mantém a divisão padrão, com a qual os volumes
+    configurados foram ajustados. Retorna as partes do ``filter_complex`` e o
+    rótulo do áudio resultante (``None`` quando não há narração nem música).
+    """
+
+    loudness_filters = loudness_filters or {}
+    narration_pre = f"{loudness_filters['narration']}," if loudness_filters.get('narration') else ""
+    music_pre = f"{loudness_filters['music']}," if loudness_filters.get('music') else ""
+    parts: List[str] = []
+    last_audio_stream: Optional[str] = None
+    if narration_idx is not None and music_idx is not None:
+        parts.append(f"[{narration_idx}:a]{narration_pre}volume={params['narration_volume']}dB[narr_vol]")
+        parts.append(f"[{music_idx}:a]{music_pre}volume={params['music_volume']}dB[music_vol]")
+        parts.append(f"[narr_vol]asplit=2[narr_main][narr_side]")
+        parts.append(f"[music_vol][narr_side]sidechaincompress=release=250[music_ducked]")
+        normalize = ":normalize=0" if loudness_filters else ""
+        parts.append(f"[narr_main][music_ducked]amix=inputs=2:duration=longest:dropout_transition=3{normalize}[a_mix]")
+        last_audio_stream = "[a_mix]"
+    elif narration_idx is not None:
+        parts.append(f"[{narration_idx}:a]{narration_pre}volume={params['narration_volume']}dB[aout]")
+        last_audio_stream = "[aout]"
+    elif music_idx is not None:
+        parts.append(f"[{music_idx}:a]{music_pre}volume={params['music_volume']}dB[aout]")
+        last_audio_stream = "[aout]"
+
+    fade_duration = _fade_duration(params)
+    if params.get('add_fade_out') and last_audio_stream:
+        parts.append(f"{last_audio_stream}afade=t=out:st={fade_start_time}:d={fade_duration}[a_fadeout]")
+        last_audio_stream = "[a_fadeout]"
+    return parts, last_audio_stream
+
+
+def _audio_mix_cache_path(
+    params: Dict[str, Any],
+    narration_path: str,
+    music_sources: Sequence[str],
+) -> Tuple[str, str]:
+    cache_key = stable_hash([
+        _AUDIO_MIX_VERSION,
+        file_fingerprint(narration_path),
+        [file_fingerprint(path) for path in music_sources],
+        params.get('narration_volume'),
+        params.get('music_volume'),
+        bool(params.get('add_fade_out')),
+        _fade_duration(params),
+        list(loudness_targets(params)) if loudness_enabled(params) else None,
+        _AUDIO_CODEC_ARGS,
+    ])
+    mix_dir = resolve_cache_dir(params, 'audio_mixes')
+    return cache_key, os.path.join(mix_dir, f"mix_{Path(narration_path).stem}_{cache_key[:16]}.m4a")
+
+
+def _prerender_audio_mix(
+    params: Dict[str, Any],
+    narration_path: Optional[str],
+    music_path: Optional[str],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+    music_sources: Optional[Sequence[str]] = None,
+) -> Optional[str]:
+    """Renderiza a mixagem final (AAC) de narração e música, com o fade-out.
+
+    ``music_sources`` são as músicas originais da playlist: entram na chave do
+    cache no lugar de ``music_path``, que costuma ser uma concatenação
+    temporária. A mixagem fica no cache enquanto as mídias, os volumes e o
+    fade forem os mesmos, mesmo que as opções de vídeo mudem. Retorna ``None``
+    sem narração ou quando a mixagem falha, para que o passe final misture o
+    áudio como antes.
+    """
+
+    if not narration_path or not os.path.isfile(narration_path):
+        return None
+    if music_path and not os.path.isfile(music_path):
+        music_path = None
+    if music_sources is None:
+        music_sources = [music_path] if music_path else []
+
+    cache_key, output_path = _audio_mix_cache_path(params, narration_path, music_sources)
+    with cache_entry_lock(cache_key):
+        if os.path.isfile(output_path):
+            logger.info("[%s] Reutilizando mixagem de áudio: %s", log_prefix, output_path)
+            return output_path
+
+        narration_duration = 0.0
+        props = _probe_media_properties(narration_path, params['ffmpeg_path'])
+        if props and 'format' in props and 'duration' in props['format']:
+            try:
+                narration_duration = float(props['format']['duration'])
+            except (TypeError, ValueError):
+                narration_duration = 0.0
+        if narration_duration <= 0:
+            return None
+
+        inputs = ['-i', narration_path]
+        if music_path:
+            inputs.extend(['-i', music_path])
+        loudness_filters: Dict[str, str] = {}
+        if loudness_enabled(params):
+            progress_queue.put(("status", f"[{log_prefix}] Medindo loudness (EBU R128)...", "info"))
+            measurements = {'narration': measure_cached(narration_path, params)}
+            if music_path:
+                measurements['music'] = combine_measurements(measure_cached(path, params) for path in music_sources)
+            if any(measurement is None for measurement in measurements.values()):
+                # Sem todas as medições a mixagem não iria para o cache com a chave normalizada.
+                progress_queue.put(("status", f"[{log_prefix}] Não foi possível medir o loudness; usando apenas os volumes fixos.", "warning"))
+                return None
+            loudness_filters = {track: loudnorm_filter(measurement, params) for track, measurement in measurements.items()}
+        filter_parts, last_audio_stream = _build_audio_mix_filters(
+            params, 0, 1 if music_path else None, narration_duration, loudness_filters
+        )
+
+        partial_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.part"
+        cmd = [
+            params['ffmpeg_path'], '-y',
+            *inputs,
+            '-filter_complex', ";".join(filter_parts),
+            '-map', last_audio_stream,
+            '-vn',
+            *_AUDIO_CODEC_ARGS,
+            '-f', 'mp4',
+            partial_path,
+        ]
+
+        progress_queue.put(("status", f"[{log_prefix}] Mixando narração e música em paralelo ao vídeo...", "info"))
+        success = _execute_ffmpeg(
+            cmd,
+            narration_duration + _fade_duration(params),
+            None,
+            cancel_event,
+            f"{log_prefix} (Mixagem)",
+            progress_queue,
+            policy=retry_policy_for('audio_mix', params),
+        )
+        if not success or not os.path.isfile(partial_path):
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            return None
+
+        os.replace(partial_path, output_path)
+        return output_path
+
+
+def _mixed_music_sources(music_files: Sequence[str], music_sources: Sequence[str]) -> List[str]:
+    """Músicas que a mixagem realmente cobre, para a chave do cache.
+
+    Uma concatenação temporária representa a playlist inteira; quando a
+    preparação volta só com faixas da própria playlist (por exemplo, apenas a
+    primeira, depois de uma concatenação recusada), a chave usa essas faixas.
+    """
+
+    if music_files and all(path in music_sources for path in music_files):
+        return list(music_files)
+    return list(music_sources) if music_files else []
+
+
+def _start_audio_premix(
+    params: Dict[str, Any],
+    narration_path: Optional[str],
+    music_sources: Sequence[str],
+    prepare_music: Callable[[], List[str]],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+) -> Optional["Future[Tuple[List[str], Optional[str]]]"]:
+    """Prepara as músicas e a mixagem em segundo plano, enquanto o vídeo base é montado."""
+
+    if not _audio_premix_enabled(params) or not narration_path:
+        return None
+
+    def run() -> Tuple[List[str], Optional[str]]:
+        _cache_key, cached_path = _audio_mix_cache_path(params, narration_path, music_sources)
+        if os.path.isfile(cached_path):
+            logger.info("[%s] Reutilizando mixagem de áudio: %s", log_prefix, cached_path)
+            return [], cached_path
+        music_files = prepare_music()
+        mix_path = _prerender_audio_mix(
+            params,
+            narration_path,
+            music_files[0] if music_files else None,
+            progress_queue,
+            cancel_event,
+            log_prefix,
+            music_sources=_mixed_music_sources(music_files, music_sources),
+        )
+        return music_files, mix_path
+
+    return _PREMIX_EXECUTOR.submit(run)
+
+
+def _collect_audio_premix(
+    future: Optional["Future[Tuple[List[str], Optional[str]]]"],
+    prepare_music: Callable[[], List[str]],
+    final_pass_params: Dict[str, Any],
+    log_prefix: str,
+) -> List[str]:
+    """Aguarda a mixagem e repassa-a ao passe final; retorna as músicas preparadas."""
+
+    if future is None:
+        return prepare_music()
+    try:
+        music_files, mix_path = future.result()
+    except Exception as exc:  # pragma: no cover - falha inesperada na thread
+        logger.error("[%s] Falha na mixagem de áudio: %s", log_prefix, exc, exc_info=True)
+        music_files, mix_path = [], None
+    if mix_path:
+        final_pass_params['audio_mix_path'] = mix_path
+        return music_files
+    # Evita uma segunda tentativa no passe final; o áudio é mixado junto com o vídeo.
+    final_pass_params['audio_premix_attempted'] = True
+    return music_files or prepare_music()
+
+
+def _wait_audio_premix(future: Optional["Future[Tuple[List[str], Optional[str]]]"]) -> None:
+    """Aguarda uma mixagem que não será usada antes de liberar a pasta temporária do item."""
+
+    if future is None:
+        return
+    try:
+        future.result()
+    except Exception:  # pragma: no cover - falha inesperada na thread
+        pass
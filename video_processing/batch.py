@@ -2,30 +2,46 @@
 
 from __future__ import annotations
 
+import math
 import os
-import random
-import shutil
 import tempfile
 import threading
 from pathlib import Path
 from queue import Queue
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .final_pass import _perform_final_pass
+from .assets import AssetPlanner
+from .audio_mix import _collect_audio_premix, _start_audio_premix, _wait_audio_premix
+from .fingerprint import is_output_up_to_date, pool_fingerprint, render_fingerprint
+from .folder_index import (
+    IMAGE_EXTENSIONS,
+    MUSIC_EXTENSIONS,
+    NARRATION_EXTENSIONS,
+    VIDEO_EXTENSIONS,
+    FolderIndex,
+)
+from .journal import BatchJournal
+from .preflight import BatchItemPlan, BatchPlan, BatchProgress, _run_preflight
+from .preview import preview_enabled
+from .scratch import ScratchSpace, _estimate_audio_bytes, _estimate_video_bytes
 from .shared import (
     _execute_ffmpeg,
     _infer_language_code_from_filename,
     _infer_language_code_from_name,
     _normalize_language_code,
-    _probe_media_properties,
     logger,
+    process_manager,
+    retry_policy_for,
 )
+from .subtitle_overlay import _collect_subtitle_prerender, _discard_subtitle_prerender, _start_subtitle_prerender
 from .utils import (
     _create_concatenated_audio,
     _get_music_playlist,
     _parse_resolution,
     _process_images_in_chunks,
 )
+from .work_queue import WorkQueue
 
 __all__ = [
     "_run_batch_video_processing",
@@ -53,14 +69,251 @@ def _apply_tail_extension(base_duration: float, params: Dict[str, Any]) -> float
     return duration + tail
 
 
+def _find_batch_subtitle(srt_index: Optional[FolderIndex], audio_filename: str) -> Optional[str]:
+    if srt_index is None:
+        return None
+    return srt_index.find(srt_index.root, Path(audio_filename).stem, 'subtitle')
+
+
+def _scan_folder(
+    folder: str,
+    params: Dict[str, Any],
+    progress_queue: Queue,
+    description: str,
+    recursive: bool = False,
+) -> Optional[FolderIndex]:
+    try:
+        return FolderIndex.scan(folder, recursive=recursive, params=params)
+    except OSError as e:
+        progress_queue.put(("status", f"Erro ao ler {description} '{folder}': {e}", "error"))
+        return None
+
+
+def _scan_srt_folder(params: Dict[str, Any]) -> Optional[FolderIndex]:
+    srt_folder = params.get('batch_srt_folder')
+    if not srt_folder or not os.path.isdir(srt_folder):
+        return None
+    try:
+        return FolderIndex.scan(srt_folder, params=params)
+    except OSError as e:
+        logger.warning("Não foi possível ler a pasta de legendas '%s': %s", srt_folder, e)
+        return None
+
+
+def _scan_music_folder(params: Dict[str, Any], progress_queue: Queue) -> Optional[FolderIndex]:
+    music_folder = params.get('music_folder_path')
+    if not music_folder or not os.path.isdir(music_folder):
+        return None
+    try:
+        music_index = FolderIndex.scan(music_folder, params=params)
+    except OSError as e:
+        progress_queue.put(("status", f"Aviso: Não foi possível ler a pasta de músicas: {e}", "warning"))
+        return None
+    music_count = len(music_index.files('audio', MUSIC_EXTENSIONS))
+    if music_count:
+        progress_queue.put(("status", f"{music_count} músicas de fundo carregadas.", "info"))
+    return music_index
+
+
+def _guess_item_language(audio_filename: str, subtitle_file: Optional[str]) -> Optional[str]:
+    inferred_lang = _infer_language_code_from_filename(audio_filename)
+    if inferred_lang:
+        return inferred_lang
+    language_guess = _infer_language_code_from_name(Path(audio_filename).stem)
+    if not language_guess and subtitle_file:
+        language_guess = _infer_language_code_from_name(Path(subtitle_file).stem)
+    return language_guess
+
+
+def _plan_batch(
+    items: List[BatchItemPlan],
+    params: Dict[str, Any],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+    asset_paths: Iterable[Any] = (),
+    music_paths: Iterable[str] = (),
+    indexes: Iterable[Optional[FolderIndex]] = (),
+    video_pool: Sequence[Any] = (),
+    image_pool: Sequence[Any] = (),
+    **kwargs: Any,
+) -> Optional[BatchPlan]:
+    """Executa a pré-verificação e reporta os problemas; ``None`` se nada pode ser renderizado.
+
+    ``asset_paths`` é a biblioteca de mídias partilhada pelos itens; entra na
+    impressão digital de cada saída junto com as músicas de fundo. ``indexes``
+    fornece o ``stat`` já lido na varredura das pastas.
+
+    O plano já sai com as mídias de cada item sorteadas: vídeo base (dos
+    candidatos do item ou de ``video_pool``), sequência de imagens (de
+    ``image_pool``, quando não há vídeo) e playlist de músicas.
+    """
+
+    music_paths = list(music_paths)
+    planner = AssetPlanner(params)
+    plan = _run_preflight(
+        items,
+        params,
+        progress_queue,
+        cancel_event,
+        log_prefix,
+        tail_extension=lambda duration: _apply_tail_extension(duration, params),
+        choose_video=lambda item, videos: planner.choose('videos', videos),
+        extra_audio=music_paths,
+        **kwargs,
+    )
+    if cancel_event.is_set():
+        return None
+    _allocate_assets(plan, params, planner, music_paths, video_pool, image_pool)
+    progress_queue.put((
+        "status",
+        f"[{log_prefix}] Semente do sorteio de mídias: {planner.seed} (use 'asset_seed' para repetir).",
+        "info",
+    ))
+
+    plan.journal = BatchJournal.open(params)
+    if plan.journal is not None:
+        for item in plan.valid_items:
+            item.completed = plan.journal.is_complete(item)
+
+    if preview_enabled(params):
+        # A pré-visualização renderiza só o primeiro item e não deixa rastros no diário nem nos sidecars.
+        plan.journal = None
+        plan.item_limit = 1
+    else:
+        plan.output_folder = params.get('output_folder')
+    known_fingerprints: Dict[str, str] = {}
+    for index in indexes:
+        if index is not None:
+            known_fingerprints.update(index.fingerprints())
+    asset_paths = [str(path) for path in asset_paths]
+    music_pool = pool_fingerprint(music_paths, known_fingerprints)
+    # Itens do mesmo idioma partilham os vídeos candidatos: o hash de cada conjunto é calculado uma vez.
+    asset_pools: Dict[Tuple[str, ...], str] = {}
+    skip_unchanged = bool(params.get('skip_unchanged_outputs')) and plan.output_folder
+    for item in plan.valid_items:
+        pool_key = tuple(asset_paths + [str(path) for path in item.candidate_videos or []])
+        if pool_key not in asset_pools:
+            asset_pools[pool_key] = pool_fingerprint(pool_key, known_fingerprints)
+        item.render_fingerprint = render_fingerprint(
+            {**params, 'current_language_code': item.language_code},
+            [item.narration_path, item.subtitle_path],
+            [asset_pools[pool_key], music_pool],
+        )
+        if skip_unchanged and not item.completed:
+            item.completed = is_output_up_to_date(os.path.join(plan.output_folder, item.output_name), item.render_fingerprint)
+    plan.report(progress_queue, log_prefix)
+    if not plan.valid_items:
+        progress_queue.put(("status", f"[{log_prefix}] Erro: Nenhum item válido para renderizar.", "error"))
+        return None
+    return plan
+
+
+def _allocate_assets(
+    plan: BatchPlan,
+    params: Dict[str, Any],
+    planner: AssetPlanner,
+    music_paths: List[str],
+    video_pool: Sequence[Any],
+    image_pool: Sequence[Any],
+) -> None:
+    """Sorteia as mídias de todos os itens válidos, na ordem do lote.
+
+    Itens já concluídos também recebem a sua parte, para que retomar ou pular
+    itens não altere o que os demais recebem com a mesma semente.
+    """
+
+    plan.asset_seed = planner.seed
+    usable_videos = plan.playable(video_pool)
+    image_duration = max(0.1, float(params.get('image_duration', 5)))
+    for item in plan.valid_items:
+        if item.candidate_videos is None and usable_videos:
+            item.base_video_path = str(planner.choose('library-videos', usable_videos))
+        elif item.candidate_videos is None and image_pool:
+            slide_count = max(1, int(math.ceil(item.duration / image_duration)))
+            item.image_sequence = planner.allocator('images', image_pool).take(slide_count)
+        if music_paths:
+            item.music_playlist = _get_music_playlist(
+                music_paths, item.duration, params, params['ffmpeg_path'],
+                allocator=planner.allocator('music', music_paths), durations=plan.media_durations,
+            )
+    if not preview_enabled(params):
+        # A pré-visualização não conta como uso: o próximo lote LRU recebe as mesmas mídias.
+        planner.save_usage()
+
+
+def _prepare_item_music(
+    music_playlist: List[str],
+    target_duration: float,
+    params: Dict[str, Any],
+    item_temp_dir: str,
+    scratch: ScratchSpace,
+    cancel_event: threading.Event,
+    progress_queue: Queue,
+    log_prefix: str,
+) -> List[str]:
+    if len(music_playlist) <= 1:
+        return music_playlist
+
+    if scratch.ensure_space(_estimate_audio_bytes(target_duration), "concatenação de músicas", progress_queue, log_prefix):
+        concatenated_music_path = os.path.join(item_temp_dir, "concatenated_music.m4a")
+        if _create_concatenated_audio(music_playlist, concatenated_music_path, item_temp_dir, params, cancel_event, progress_queue, log_prefix):
+            return [concatenated_music_path]
+    progress_queue.put(("status", f"[{log_prefix}] Falha ao concatenar músicas, usando apenas a primeira.", "warning"))
+    return [music_playlist[0]]
+
+
+def _finish_item(plan: BatchPlan, batch_progress: BatchProgress, item: BatchItemPlan, success: bool, log_prefix: str) -> None:
+    """Conta o item no progresso do lote e registra o resultado no diário, com sucesso ou não."""
+
+    batch_progress.item_finished(item, log_prefix)
+    plan.record(item, 'done' if success else 'failed')
+
+
+def _start_item_audio(
+    item: BatchItemPlan,
+    target_duration: float,
+    params: Dict[str, Any],
+    item_temp_dir: str,
+    scratch: ScratchSpace,
+    cancel_event: threading.Event,
+    progress_queue: Queue,
+    log_prefix: str,
+):
+    """Prepara as músicas do item; com a pré-mixagem ativa, junto com a mixagem e em paralelo ao vídeo base."""
+
+    def prepare_music() -> List[str]:
+        if not item.music_playlist:
+            return []
+        return _prepare_item_music(
+            item.music_playlist, target_duration, params, item_temp_dir, scratch, cancel_event, progress_queue, log_prefix
+        )
+
+    future = _start_audio_premix(
+        params, item.narration_path, item.music_playlist or [], prepare_music, progress_queue, cancel_event, log_prefix
+    )
+    return future, prepare_music
+
+
+def _slideshow_scratch_bytes(params: Dict[str, Any], duration: float) -> int:
+    return _estimate_video_bytes(duration, _parse_resolution(params.get('resolution', '')), params.get('output_fps') or 30)
+
+
+def _final_pass_scratch_bytes(params: Dict[str, Any], duration: float) -> int:
+    """Espaço que o passe final ocupa no rascunho (só grava lá quando há introdução)."""
+
+    if not params.get('intro_enabled'):
+        return 0
+    return _slideshow_scratch_bytes(params, duration)
+
+
 def _run_batch_video_processing(params: Dict[str, Any], progress_queue: Queue, cancel_event: threading.Event, temp_dir: str) -> bool:
     if cancel_event.is_set():
         return False
+    scratch = ScratchSpace.attach(temp_dir, params)
 
     audio_folder = params.get('batch_audio_folder')
     video_parent_folder = params.get('batch_video_parent_folder')
-    srt_folder = params.get('batch_srt_folder')
-    music_folder = params.get('music_folder_path')
 
     lang_code_to_folder_name_map = {
         "ALE": "Alemão", "BUL": "Búlgaro", "ESP": "Espanhol", "FRAN": "Francês", "GREGO": "Grego",
@@ -74,114 +327,106 @@ def _run_batch_video_processing(params: Dict[str, Any], progress_queue: Queue, c
         progress_queue.put(("status", "Erro: Pasta de Vídeos Base do lote inválida.", "error"))
         return False
 
-    audio_files = sorted([f for f in os.listdir(audio_folder) if os.path.isfile(os.path.join(audio_folder, f)) and f.lower().endswith(('.mp3', '.wav', '.aac'))])
+    audio_index = _scan_folder(audio_folder, params, progress_queue, "a pasta de narrações")
+    if audio_index is None:
+        return False
+    audio_files = [f.name for f in audio_index.files('audio', NARRATION_EXTENSIONS)]
     if not audio_files:
         progress_queue.put(("status", "Erro: Nenhum arquivo de narração (áudio) encontrado na pasta de lote.", "error"))
         return False
+    srt_index = _scan_srt_folder(params)
 
-    available_music_files: List[str] = []
-    if music_folder and os.path.isdir(music_folder):
-        try:
-            music_ext = ('.mp3', '.wav', '.aac', '.flac', '.ogg')
-            available_music_files = [os.path.join(music_folder, f) for f in os.listdir(music_folder) if os.path.isfile(os.path.join(music_folder, f)) and f.lower().endswith(music_ext)]
-            if available_music_files:
-                progress_queue.put(("status", f"{len(available_music_files)} músicas de fundo carregadas.", "info"))
-        except OSError as e:
-            progress_queue.put(("status", f"Aviso: Não foi possível ler a pasta de músicas: {e}", "warning"))
+    music_index = _scan_music_folder(params, progress_queue)
+    available_music_files = music_index.paths('audio', MUSIC_EXTENSIONS) if music_index else []
 
-    try:
-        video_subfolders = [d for d in os.listdir(video_parent_folder) if os.path.isdir(os.path.join(video_parent_folder, d))]
-    except OSError as e:
-        progress_queue.put(("status", f"Erro ao ler subpastas de vídeo: {e}", "error"))
+    video_parent_index = _scan_folder(video_parent_folder, params, progress_queue, "as subpastas de vídeo")
+    if video_parent_index is None:
         return False
+    video_subfolders = video_parent_index.subdirs
+    video_indexes: Dict[str, Optional[FolderIndex]] = {}
+    videos_by_folder: Dict[str, List[str]] = {}
 
     total_files = len(audio_files)
+    plan_items: List[BatchItemPlan] = []
     for i, audio_filename in enumerate(audio_files):
-        if cancel_event.is_set():
-            return False
+        item = BatchItemPlan(
+            index=i,
+            name=audio_filename,
+            narration_path=os.path.join(audio_folder, audio_filename),
+            output_name=f"video_final_{Path(audio_filename).stem}.mp4",
+            subtitle_path=_find_batch_subtitle(srt_index, audio_filename),
+        )
+        plan_items.append(item)
 
-        progress_queue.put(("batch_progress", (i) / total_files))
-        log_prefix = f"Lote Vídeo {i+1}/{total_files}"
-        progress_queue.put(("status", f"--- Iniciando {log_prefix}: {audio_filename} ---", "info"))
-
-        try:
-            parts = Path(audio_filename).stem.split()
-            if len(parts) < 2:
-                raise IndexError("Formato de nome de arquivo inválido.")
-            lang_code = _normalize_language_code(parts[1]) or parts[1].upper()
-            language_name = lang_code_to_folder_name_map.get(lang_code)
-            if not language_name:
-                progress_queue.put(("status", f"[{log_prefix}] Aviso: Código '{lang_code}' não mapeado. Pulando.", "warning"))
-                continue
-        except IndexError:
-            progress_queue.put(("status", f"[{log_prefix}] Aviso: Nome de áudio '{audio_filename}' inválido. Pulando.", "warning"))
+        parts = Path(audio_filename).stem.split()
+        if len(parts) < 2:
+            item.problems.append("nome de áudio inválido (esperado '<nome> <IDIOMA>').")
+            continue
+        lang_code = _normalize_language_code(parts[1]) or parts[1].upper()
+        language_name = lang_code_to_folder_name_map.get(lang_code)
+        if not language_name:
+            item.problems.append(f"código de idioma '{lang_code}' não mapeado.")
             continue
+        item.language_code = _normalize_language_code(lang_code) or _normalize_language_code(language_name) or lang_code
 
         target_video_folder = next((os.path.join(video_parent_folder, d) for d in video_subfolders if d.lower().startswith(language_name.lower())), None)
-
         if not target_video_folder:
-            progress_queue.put(("status", f"[{log_prefix}] Aviso: Pasta de vídeo para '{language_name}' não encontrada. Pulando.", "warning"))
+            item.problems.append(f"pasta de vídeo para '{language_name}' não encontrada.")
             continue
+        if target_video_folder not in videos_by_folder:
+            video_index = _scan_folder(target_video_folder, params, progress_queue, "os vídeos de")
+            video_indexes[target_video_folder] = video_index
+            videos_by_folder[target_video_folder] = video_index.paths('video', VIDEO_EXTENSIONS) if video_index else []
+        item.candidate_videos = videos_by_folder[target_video_folder]
+        if not item.candidate_videos:
+            item.problems.append(f"nenhum vídeo encontrado em '{target_video_folder}'.")
+
+    plan = _plan_batch(
+        plan_items, params, progress_queue, cancel_event, "Lote Vídeo",
+        music_paths=available_music_files, indexes=[music_index, *video_indexes.values()],
+    )
+    if plan is None:
+        return False
 
-        try:
-            available_videos = sorted([os.path.join(target_video_folder, f) for f in os.listdir(target_video_folder) if f.lower().endswith(('.mp4', '.mov', '.mkv', '.avi'))])
-        except OSError as e:
-            progress_queue.put(("status", f"[{log_prefix}] Erro ao ler vídeos de '{target_video_folder}': {e}. Pulando.", "error"))
-            continue
+    batch_progress = BatchProgress(plan, progress_queue)
+    for item in plan.pending_items:
+        if not process_manager.wait_if_paused(cancel_event):
+            return False
 
-        if not available_videos:
-            progress_queue.put(("status", f"[{log_prefix}] Aviso: Nenhum vídeo encontrado em '{target_video_folder}'. Pulando.", "warning"))
-            continue
+        batch_progress.item_started(item)
+        plan.record(item, 'started')
+        log_prefix = f"Lote Vídeo {item.index+1}/{total_files}"
+        progress_queue.put(("status", f"--- Iniciando {log_prefix}: {item.name} ---", "info"))
 
-        subtitle_file = None
-        if srt_folder and os.path.isdir(srt_folder):
-            potential_srt = os.path.join(srt_folder, f"{Path(audio_filename).stem}.srt")
-            if os.path.isfile(potential_srt):
-                subtitle_file = potential_srt
-
-        item_temp_dir = tempfile.mkdtemp(prefix=f"kyle-batch-vid-item-{i}-", dir=temp_dir)
-
-        music_files_for_pass: List[str] = []
-        if available_music_files:
-            narration_full_path = os.path.join(audio_folder, audio_filename)
-            narration_props = _probe_media_properties(narration_full_path, params['ffmpeg_path'])
-            target_duration = _apply_tail_extension(
-                narration_props['format']['duration'] if narration_props and narration_props.get('format') else 0,
-                params,
-            )
-
-            music_playlist = _get_music_playlist(available_music_files, target_duration, params, params['ffmpeg_path'])
-            if len(music_playlist) > 1:
-                concatenated_music_path = os.path.join(item_temp_dir, "concatenated_music.m4a")
-                if _create_concatenated_audio(music_playlist, concatenated_music_path, item_temp_dir, params, cancel_event, progress_queue, log_prefix):
-                    music_files_for_pass = [concatenated_music_path]
-                else:
-                    progress_queue.put(("status", f"[{log_prefix}] Falha ao concatenar músicas, usando apenas a primeira.", "warning"))
-                    music_files_for_pass = [music_playlist[0]]
-            else:
-                music_files_for_pass = music_playlist
+        subtitle_future = _start_subtitle_prerender(params, item.subtitle_path, progress_queue, cancel_event, log_prefix)
+        item_temp_dir = scratch.new_item_dir(prefix=f"kyle-batch-vid-item-{item.index}-")
+        audio_future, prepare_music = _start_item_audio(item, item.duration, params, item_temp_dir, scratch, cancel_event, progress_queue, log_prefix)
 
         final_pass_params = {**params,
-            'output_filename_single': f"video_final_{Path(audio_filename).stem}.mp4"
+            'output_filename_single': item.output_name
         }
-        final_pass_params['current_language_code'] = lang_code
+        final_pass_params['current_language_code'] = item.language_code
+        _collect_subtitle_prerender(subtitle_future, final_pass_params, log_prefix)
+        music_files_for_pass = _collect_audio_premix(audio_future, prepare_music, final_pass_params, log_prefix)
 
-        normalized_lang = _normalize_language_code(lang_code) or _normalize_language_code(language_name)
-        if normalized_lang:
-            final_pass_params['current_language_code'] = normalized_lang
+        if not scratch.ensure_space(_final_pass_scratch_bytes(final_pass_params, item.duration), "passe final", progress_queue, log_prefix):
+            scratch.release(item_temp_dir)
+            _finish_item(plan, batch_progress, item, False, log_prefix)
+            continue
 
         final_success = _perform_final_pass(
             params=final_pass_params,
-            base_video_path=random.choice(available_videos),
-            narration_path=os.path.join(audio_folder, audio_filename),
+            base_video_path=item.base_video_path,
+            narration_path=item.narration_path,
             music_paths=music_files_for_pass,
-            subtitle_path=subtitle_file,
+            subtitle_path=item.subtitle_path,
             progress_queue=progress_queue,
             cancel_event=cancel_event,
             temp_dir=item_temp_dir,
             log_prefix=log_prefix
         )
-        shutil.rmtree(item_temp_dir)
+        scratch.release(item_temp_dir)
+        _finish_item(plan, batch_progress, item, final_success, log_prefix)
 
         if not final_success and not cancel_event.is_set():
             progress_queue.put(("status", f"[{log_prefix}] Falha ao processar o item. Continuando...", "error"))
@@ -193,11 +438,10 @@ def _run_batch_video_processing(params: Dict[str, Any], progress_queue: Queue, c
 def _run_batch_image_processing(params: Dict[str, Any], progress_queue: Queue, cancel_event: threading.Event, temp_dir: str) -> bool:
     if cancel_event.is_set():
         return False
+    scratch = ScratchSpace.attach(temp_dir, params)
 
     audio_folder = params.get('batch_audio_folder')
     image_folder = params.get('batch_image_parent_folder')
-    srt_folder = params.get('batch_srt_folder')
-    music_folder = params.get('music_folder_path')
 
     if not audio_folder or not os.path.isdir(audio_folder):
         progress_queue.put(("status", "Erro: Pasta de Narrações (Áudio) do lote inválida.", "error"))
@@ -206,55 +450,77 @@ def _run_batch_image_processing(params: Dict[str, Any], progress_queue: Queue, c
         progress_queue.put(("status", "Erro: Pasta de Imagens Base do lote inválida.", "error"))
         return False
 
-    audio_files = sorted([f for f in os.listdir(audio_folder) if os.path.isfile(os.path.join(audio_folder, f)) and f.lower().endswith(('.mp3', '.wav', '.aac'))])
+    audio_index = _scan_folder(audio_folder, params, progress_queue, "a pasta de narrações")
+    if audio_index is None:
+        return False
+    audio_files = [f.name for f in audio_index.files('audio', NARRATION_EXTENSIONS)]
     if not audio_files:
         progress_queue.put(("status", "Erro: Nenhum arquivo de narração (áudio) encontrado na pasta de lote.", "error"))
         return False
+    srt_index = _scan_srt_folder(params)
 
-    supported_ext = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
-    all_images = [p for p in Path(image_folder).iterdir() if p.is_file() and p.suffix.lower() in supported_ext]
+    image_index = _scan_folder(image_folder, params, progress_queue, "a pasta de imagens")
+    all_images = [Path(p) for p in image_index.paths('image', IMAGE_EXTENSIONS)] if image_index else []
     if not all_images:
         progress_queue.put(("status", f"Erro: Nenhuma imagem encontrada na pasta de imagens selecionada: {image_folder}", "error"))
         return False
 
-    available_music_files: List[str] = []
-    if music_folder and os.path.isdir(music_folder):
-        try:
-            music_ext = ('.mp3', '.wav', '.aac', '.flac', '.ogg')
-            available_music_files = [os.path.join(music_folder, f) for f in os.listdir(music_folder) if f.lower().endswith(music_ext)]
-            if available_music_files:
-                progress_queue.put(("status", f"{len(available_music_files)} músicas de fundo carregadas.", "info"))
-        except OSError as e:
-            progress_queue.put(("status", f"Aviso: Não foi possível ler a pasta de músicas: {e}", "warning"))
+    music_index = _scan_music_folder(params, progress_queue)
+    available_music_files = music_index.paths('audio', MUSIC_EXTENSIONS) if music_index else []
 
     total_files = len(audio_files)
-    for i, audio_filename in enumerate(audio_files):
-        if cancel_event.is_set():
+    plan_items = [
+        BatchItemPlan(
+            index=i,
+            name=audio_filename,
+            narration_path=os.path.join(audio_folder, audio_filename),
+            output_name=f"video_final_{Path(audio_filename).stem}.mp4",
+            subtitle_path=_find_batch_subtitle(srt_index, audio_filename),
+        )
+        for i, audio_filename in enumerate(audio_files)
+    ]
+    for item in plan_items:
+        item.language_code = _guess_item_language(item.name, item.subtitle_path)
+
+    plan = _plan_batch(
+        plan_items, params, progress_queue, cancel_event, "Lote Imagem",
+        asset_paths=all_images, music_paths=available_music_files, indexes=[image_index, music_index],
+        image_pool=all_images,
+    )
+    if plan is None:
+        return False
+
+    batch_progress = BatchProgress(plan, progress_queue)
+    for item in plan.pending_items:
+        if not process_manager.wait_if_paused(cancel_event):
             return False
 
-        progress_queue.put(("batch_progress", (i) / total_files))
-        log_prefix = f"Lote Imagem {i+1}/{total_files}"
-        progress_queue.put(("status", f"--- Iniciando {log_prefix}: {audio_filename} ---", "info"))
+        batch_progress.item_started(item)
+        plan.record(item, 'started')
+        log_prefix = f"Lote Imagem {item.index+1}/{total_files}"
+        progress_queue.put(("status", f"--- Iniciando {log_prefix}: {item.name} ---", "info"))
 
-        narration_path = os.path.join(audio_folder, audio_filename)
-        narration_props = _probe_media_properties(narration_path, params['ffmpeg_path'])
-        if not narration_props or 'format' not in narration_props or 'duration' not in narration_props['format']:
-            progress_queue.put(("status", f"[{log_prefix}] Erro: Não foi possível ler duração de '{audio_filename}'. Pulando.", "error"))
-            continue
+        final_duration = item.duration
 
-        final_duration = _apply_tail_extension(narration_props['format']['duration'], params)
+        images_for_this_video = item.image_sequence or all_images
+        progress_queue.put(("status", f"[{log_prefix}] {len(images_for_this_video)} imagens sorteadas para este vídeo.", "info"))
 
-        images_for_this_video = all_images.copy()
-        random.shuffle(images_for_this_video)
-        progress_queue.put(("status", f"[{log_prefix}] {len(images_for_this_video)} imagens embaralhadas para este vídeo.", "info"))
-
-        item_temp_dir = tempfile.mkdtemp(prefix=f"kyle-batch-img-item-{i}-", dir=temp_dir)
+        item_temp_dir = scratch.new_item_dir(prefix=f"kyle-batch-img-item-{item.index}-")
+        if not scratch.ensure_space(_slideshow_scratch_bytes(params, final_duration), "slideshow", progress_queue, log_prefix):
+            scratch.release(item_temp_dir)
+            _finish_item(plan, batch_progress, item, False, log_prefix)
+            continue
+        subtitle_future = _start_subtitle_prerender(params, item.subtitle_path, progress_queue, cancel_event, log_prefix)
+        audio_future, prepare_music = _start_item_audio(item, final_duration, params, item_temp_dir, scratch, cancel_event, progress_queue, log_prefix)
         base_video_path, success = _process_images_in_chunks(params, images_for_this_video, final_duration, item_temp_dir, progress_queue, cancel_event, log_prefix)
 
         if not success:
             if not cancel_event.is_set():
                 progress_queue.put(("status", f"[{log_prefix}] Falha ao gerar vídeo base. Continuando...", "error"))
-            shutil.rmtree(item_temp_dir)
+            _wait_audio_premix(audio_future)
+            _discard_subtitle_prerender(subtitle_future)
+            scratch.release(item_temp_dir)
+            _finish_item(plan, batch_progress, item, False, log_prefix)
             continue
 
         if cancel_event.is_set():
@@ -262,42 +528,22 @@ def _run_batch_image_processing(params: Dict[str, Any], progress_queue: Queue, c
 
         progress_queue.put(("status", f"[{log_prefix}] Adicionando narrações (áudio) e legendas...", "info"))
 
-        subtitle_file = None
-        if srt_folder and os.path.isdir(srt_folder):
-            potential_srt = os.path.join(srt_folder, f"{Path(audio_filename).stem}.srt")
-            if os.path.isfile(potential_srt):
-                subtitle_file = potential_srt
-
-        music_files_for_pass: List[str] = []
-        if available_music_files:
-            music_playlist = _get_music_playlist(available_music_files, final_duration, params, params['ffmpeg_path'])
-            if len(music_playlist) > 1:
-                concatenated_music_path = os.path.join(item_temp_dir, "concatenated_music.m4a")
-                if _create_concatenated_audio(music_playlist, concatenated_music_path, item_temp_dir, params, cancel_event, progress_queue, log_prefix):
-                    music_files_for_pass = [concatenated_music_path]
-                else:
-                    progress_queue.put(("status", f"[{log_prefix}] Falha ao concatenar músicas, usando apenas a primeira.", "warning"))
-                    music_files_for_pass = [music_playlist[0]]
-            else:
-                music_files_for_pass = music_playlist
-
-        language_guess = _infer_language_code_from_name(Path(audio_filename).stem)
-        if not language_guess and subtitle_file:
-            language_guess = _infer_language_code_from_name(Path(subtitle_file).stem)
-
-        final_pass_params = {**params, 'output_filename_single': f"video_final_{Path(audio_filename).stem}.mp4"}
-        final_pass_params['current_language_code'] = language_guess
+        final_pass_params = {**params, 'output_filename_single': item.output_name}
+        final_pass_params['current_language_code'] = item.language_code
+        _collect_subtitle_prerender(subtitle_future, final_pass_params, log_prefix)
+        music_files_for_pass = _collect_audio_premix(audio_future, prepare_music, final_pass_params, log_prefix)
 
-        inferred_lang = _infer_language_code_from_filename(audio_filename)
-        if inferred_lang:
-            final_pass_params['current_language_code'] = inferred_lang
+        if not scratch.ensure_space(_final_pass_scratch_bytes(final_pass_params, final_duration), "passe final", progress_queue, log_prefix):
+            scratch.release(item_temp_dir)
+            _finish_item(plan, batch_progress, item, False, log_prefix)
+            continue
 
         final_success = _perform_final_pass(
             params=final_pass_params,
             base_video_path=base_video_path,
-            narration_path=narration_path,
+            narration_path=item.narration_path,
             music_paths=music_files_for_pass,
-            subtitle_path=subtitle_file,
+            subtitle_path=item.subtitle_path,
             progress_queue=progress_queue,
             cancel_event=cancel_event,
             temp_dir=item_temp_dir,
@@ -307,7 +553,8 @@ def _run_batch_image_processing(params: Dict[str, Any], progress_queue: Queue, c
         if not final_success and not cancel_event.is_set():
             progress_queue.put(("status", f"[{log_prefix}] Falha ao finalizar o vídeo. Continuando...", "error"))
 
-        shutil.rmtree(item_temp_dir)
+        scratch.release(item_temp_dir)
+        _finish_item(plan, batch_progress, item, final_success, log_prefix)
 
     progress_queue.put(("batch_progress", 1.0))
     return True
@@ -316,13 +563,12 @@ def _run_batch_image_processing(params: Dict[str, Any], progress_queue: Queue, c
 def _run_batch_mixed_processing(params: Dict[str, Any], progress_queue: Queue, cancel_event: threading.Event, temp_dir: str) -> bool:
     if cancel_event.is_set():
         return False
+    scratch = ScratchSpace.attach(temp_dir, params)
 
     log_prefix_main = "Lote Misto"
 
     audio_folder = params.get('batch_audio_folder')
     mixed_media_folder = params.get('batch_mixed_media_folder')
-    srt_folder = params.get('batch_srt_folder')
-    music_folder = params.get('music_folder_path')
 
     if not audio_folder or not os.path.isdir(audio_folder):
         progress_queue.put(("status", f"[{log_prefix_main}] Erro: Pasta de Narrações (Áudio) do lote inválida.", "error"))
@@ -332,19 +578,60 @@ def _run_batch_mixed_processing(params: Dict[str, Any], progress_queue: Queue, c
         return False
 
     progress_queue.put(("status", f"[{log_prefix_main}] Analisando Pasta de Mídia Base (Vídeos/Imagens) para criar vídeo base...", "info"))
-    all_files = list(Path(mixed_media_folder).iterdir())
-    supported_img_ext = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
-    supported_vid_ext = ('.mp4', '.mov', '.mkv', '.avi')
-    images = sorted([p for p in all_files if p.is_file() and p.suffix.lower() in supported_img_ext])
-    videos = sorted([p for p in all_files if p.is_file() and p.suffix.lower() in supported_vid_ext])
+    media_index = _scan_folder(mixed_media_folder, params, progress_queue, "a Pasta de Mídia Base")
+    if media_index is None:
+        return False
+    images = [Path(p) for p in media_index.paths('image', IMAGE_EXTENSIONS)]
+    videos = [Path(p) for p in media_index.paths('video', VIDEO_EXTENSIONS)]
 
     if not images and not videos:
         progress_queue.put(("status", f"[{log_prefix_main}] Erro: Nenhuma mídia encontrada na Pasta de Mídia Base: {mixed_media_folder}", "error"))
         return False
+
+    audio_index = _scan_folder(audio_folder, params, progress_queue, "a pasta de narrações")
+    if audio_index is None:
+        return False
+    audio_files = [f.name for f in audio_index.files('audio', NARRATION_EXTENSIONS)]
+    if not audio_files:
+        progress_queue.put(("status", f"[{log_prefix_main}] Erro: Nenhum arquivo de narração (áudio) encontrado.", "error"))
+        return False
+    srt_index = _scan_srt_folder(params)
+    music_index = _scan_music_folder(params, progress_queue)
+    available_music_files = music_index.paths('audio', MUSIC_EXTENSIONS) if music_index else []
+
+    plan_items = [
+        BatchItemPlan(
+            index=i,
+            name=audio_filename,
+            narration_path=os.path.join(audio_folder, audio_filename),
+            output_name=f"video_final_{Path(audio_filename).stem}.mp4",
+            subtitle_path=_find_batch_subtitle(srt_index, audio_filename),
+        )
+        for i, audio_filename in enumerate(audio_files)
+    ]
+    for item in plan_items:
+        item.language_code = _guess_item_language(item.name, item.subtitle_path)
+
+    plan = _plan_batch(
+        plan_items, params, progress_queue, cancel_event, log_prefix_main,
+        asset_paths=images + videos, music_paths=available_music_files, indexes=[media_index, music_index],
+        extra_videos=videos,
+    )
+    if plan is None:
+        return False
+    if not plan.pending_items:
+        progress_queue.put(("batch_progress", 1.0))
+        return True
+    videos = plan.playable(videos)
+    if not images and not videos:
+        progress_queue.put(("status", f"[{log_prefix_main}] Erro: Nenhum vídeo utilizável na Pasta de Mídia Base: {mixed_media_folder}", "error"))
+        return False
     progress_queue.put(("status", f"[{log_prefix_main}] Encontrados {len(videos)} vídeos e {len(images)} imagens.", "info"))
 
     base_video_path = None
-    base_video_creation_temp_dir = tempfile.mkdtemp(prefix="kyle-base-video-", dir=temp_dir)
+    if not scratch.ensure_space(0, "vídeo base", progress_queue, log_prefix_main):
+        return False
+    base_video_creation_temp_dir = scratch.new_item_dir(prefix="kyle-base-video-")
 
     try:
         files_to_concat_ts: List[str] = []
@@ -364,7 +651,7 @@ def _run_batch_mixed_processing(params: Dict[str, Any], progress_queue: Queue, c
                     ts_path
                 ]
                 progress_queue.put(("status", f"[{log_prefix_main}] Processando vídeo {idx+1}/{len(videos)}: {video_path.name}", "info"))
-                if not _execute_ffmpeg(cmd_reencode, 1, None, cancel_event, f"{log_prefix_main} (Vídeo {idx+1})", progress_queue):
+                if not _execute_ffmpeg(cmd_reencode, 1, None, cancel_event, f"{log_prefix_main} (Vídeo {idx+1})", progress_queue, policy=retry_policy_for('base_video', params)):
                     raise ValueError(f"Falha ao padronizar o vídeo {video_path.name}")
                 files_to_concat_ts.append(ts_path)
 
@@ -380,7 +667,7 @@ def _run_batch_mixed_processing(params: Dict[str, Any], progress_queue: Queue, c
 
             slideshow_ts_path = os.path.join(base_video_creation_temp_dir, "slideshow.ts")
             cmd_reencode_ss = [params['ffmpeg_path'], '-y', '-i', slideshow_mp4_path, '-c', 'copy', slideshow_ts_path]
-            if not _execute_ffmpeg(cmd_reencode_ss, 1, None, cancel_event, f"{log_prefix_main} (Conv. Slideshow)", progress_queue):
+            if not _execute_ffmpeg(cmd_reencode_ss, 1, None, cancel_event, f"{log_prefix_main} (Conv. Slideshow)", progress_queue, policy=retry_policy_for('base_video', params)):
                 raise ValueError("Falha ao converter slideshow para formato de montagem.")
             files_to_concat_ts.append(slideshow_ts_path)
 
@@ -395,87 +682,55 @@ def _run_batch_mixed_processing(params: Dict[str, Any], progress_queue: Queue, c
 
         base_video_path = os.path.normpath(os.path.join(base_video_creation_temp_dir, "combined_base_video.mp4"))
         cmd_concat = [params['ffmpeg_path'], '-y', '-f', 'concat', '-safe', '0', '-i', concat_list_path, '-c', 'copy', base_video_path]
-        if not _execute_ffmpeg(cmd_concat, 1, None, cancel_event, f"{log_prefix_main} (Montagem)", progress_queue):
+        if not _execute_ffmpeg(cmd_concat, 1, None, cancel_event, f"{log_prefix_main} (Montagem)", progress_queue, policy=retry_policy_for('base_video', params)):
             raise ValueError("Falha ao montar o vídeo base final.")
 
     except (ValueError, InterruptedError, Exception) as e:
         if not cancel_event.is_set():
             progress_queue.put(("status", f"[{log_prefix_main}] Erro ao criar vídeo base: {e}", "error"))
-        shutil.rmtree(base_video_creation_temp_dir)
+        scratch.release(base_video_creation_temp_dir)
         return False
 
-    audio_files = sorted([f for f in os.listdir(audio_folder) if os.path.isfile(os.path.join(audio_folder, f)) and f.lower().endswith(('.mp3', '.wav', '.aac'))])
-    if not audio_files:
-        progress_queue.put(("status", f"[{log_prefix_main}] Erro: Nenhum arquivo de narração (áudio) encontrado.", "error"))
-        return False
-
-    available_music_files: List[str] = []
-    if music_folder and os.path.isdir(music_folder):
-        music_ext = ('.mp3', '.wav', '.aac', '.flac', '.ogg')
-        available_music_files = [os.path.join(music_folder, f) for f in os.listdir(music_folder) if f.lower().endswith(music_ext)]
-
     total_files = len(audio_files)
-    for i, audio_filename in enumerate(audio_files):
-        if cancel_event.is_set():
+    batch_progress = BatchProgress(plan, progress_queue)
+    for item in plan.pending_items:
+        if not process_manager.wait_if_paused(cancel_event):
             break
 
-        progress_queue.put(("batch_progress", (i) / total_files))
-        log_prefix = f"Lote Misto {i+1}/{total_files}"
-        progress_queue.put(("status", f"--- Iniciando {log_prefix}: {audio_filename} ---", "info"))
-
-        narration_path = os.path.join(audio_folder, audio_filename)
-        subtitle_file = None
-        if srt_folder and os.path.isdir(srt_folder):
-            potential_srt = os.path.join(srt_folder, f"{Path(audio_filename).stem}.srt")
-            if os.path.isfile(potential_srt):
-                subtitle_file = potential_srt
-
-        item_temp_dir = tempfile.mkdtemp(prefix=f"kyle-mixed-item-{i}-", dir=temp_dir)
-
-        music_files_for_pass: List[str] = []
-        if available_music_files:
-            narration_props = _probe_media_properties(narration_path, params['ffmpeg_path'])
-            target_duration = _apply_tail_extension(
-                narration_props['format']['duration'] if narration_props and narration_props.get('format') else 0,
-                params,
-            )
+        batch_progress.item_started(item)
+        plan.record(item, 'started')
+        log_prefix = f"Lote Misto {item.index+1}/{total_files}"
+        progress_queue.put(("status", f"--- Iniciando {log_prefix}: {item.name} ---", "info"))
 
-            music_playlist = _get_music_playlist(available_music_files, target_duration, params, params['ffmpeg_path'])
-            if len(music_playlist) > 1:
-                concatenated_music_path = os.path.join(item_temp_dir, "concatenated_music.m4a")
-                if _create_concatenated_audio(music_playlist, concatenated_music_path, item_temp_dir, params, cancel_event, progress_queue, log_prefix):
-                    music_files_for_pass = [concatenated_music_path]
-                else:
-                    progress_queue.put(("status", f"[{log_prefix}] Falha ao concatenar músicas, usando apenas a primeira.", "warning"))
-                    music_files_for_pass = [music_playlist[0]]
-            else:
-                music_files_for_pass = music_playlist
+        subtitle_future = _start_subtitle_prerender(params, item.subtitle_path, progress_queue, cancel_event, log_prefix)
+        item_temp_dir = scratch.new_item_dir(prefix=f"kyle-mixed-item-{item.index}-")
+        audio_future, prepare_music = _start_item_audio(item, item.duration, params, item_temp_dir, scratch, cancel_event, progress_queue, log_prefix)
 
-        language_guess = _infer_language_code_from_name(Path(audio_filename).stem)
-        if not language_guess and subtitle_file:
-            language_guess = _infer_language_code_from_name(Path(subtitle_file).stem)
+        final_pass_params = {**params, 'output_filename_single': item.output_name}
+        final_pass_params['current_language_code'] = item.language_code
+        _collect_subtitle_prerender(subtitle_future, final_pass_params, log_prefix)
+        music_files_for_pass = _collect_audio_premix(audio_future, prepare_music, final_pass_params, log_prefix)
 
-        final_pass_params = {**params, 'output_filename_single': f"video_final_{Path(audio_filename).stem}.mp4"}
-        final_pass_params['current_language_code'] = language_guess
-
-        inferred_lang = _infer_language_code_from_filename(audio_filename)
-        if inferred_lang:
-            final_pass_params['current_language_code'] = inferred_lang
+        if not scratch.ensure_space(_final_pass_scratch_bytes(final_pass_params, item.duration), "passe final", progress_queue, log_prefix):
+            scratch.release(item_temp_dir)
+            _finish_item(plan, batch_progress, item, False, log_prefix)
+            continue
 
-        _perform_final_pass(
+        final_success = _perform_final_pass(
             params=final_pass_params,
             base_video_path=base_video_path,
-            narration_path=narration_path,
+            narration_path=item.narration_path,
             music_paths=music_files_for_pass,
-            subtitle_path=subtitle_file,
+            subtitle_path=item.subtitle_path,
             progress_queue=progress_queue,
             cancel_event=cancel_event,
             temp_dir=item_temp_dir,
             log_prefix=log_prefix
         )
-        shutil.rmtree(item_temp_dir)
+        scratch.release(item_temp_dir)
+        _finish_item(plan, batch_progress, item, final_success, log_prefix)
 
-    shutil.rmtree(base_video_creation_temp_dir)
+    scratch.release(base_video_creation_temp_dir)
     progress_queue.put(("batch_progress", 1.0))
     return not cancel_event.is_set()
 
@@ -483,10 +738,10 @@ def _run_batch_mixed_processing(params: Dict[str, Any], progress_queue: Queue, c
 def _run_hierarchical_batch_image_processing(params: Dict[str, Any], progress_queue: Queue, cancel_event: threading.Event, temp_dir: str) -> bool:
     if cancel_event.is_set():
         return False
+    scratch = ScratchSpace.attach(temp_dir, params)
 
     root_folder = params.get('batch_root_folder')
     media_folder = params.get('batch_image_parent_folder')
-    music_folder = params.get('music_folder_path')
 
     if not root_folder or not os.path.isdir(root_folder):
         progress_queue.put(("status", "Erro: Pasta Raiz do Lote inválida.", "error"))
@@ -496,139 +751,152 @@ def _run_hierarchical_batch_image_processing(params: Dict[str, Any], progress_qu
         return False
 
     progress_queue.put(("status", f"Buscando arquivos de narração (áudio) em subpastas de '{Path(root_folder).name}'...", "info"))
-    audio_files_to_process: List[Path] = []
-    try:
-        audio_ext = ('.mp3', '.wav', '.aac')
-        for f in Path(root_folder).rglob('*'):
-            if f.is_file() and f.suffix.lower() in audio_ext:
-                audio_files_to_process.append(f)
-
-        audio_files_to_process.sort()
-    except OSError as e:
-        progress_queue.put(("status", f"Erro ao buscar arquivos de narração (áudio): {e}", "error"))
+    root_index = _scan_folder(root_folder, params, progress_queue, "os arquivos de narração (áudio) em", recursive=True)
+    if root_index is None:
         return False
+    audio_files_to_process = [Path(p) for p in root_index.paths('audio', NARRATION_EXTENSIONS)]
 
     if not audio_files_to_process:
         progress_queue.put(("status", "Erro: Nenhum arquivo de narração (áudio) encontrado nas subpastas.", "error"))
         return False
     progress_queue.put(("status", f"Encontrados {len(audio_files_to_process)} arquivos de narração (áudio) para processar.", "info"))
 
-    media_path = Path(media_folder)
-    supported_img_ext = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
-    supported_vid_ext = ('.mp4', '.mov', '.mkv', '.avi', '.m4v')
+    media_index = _scan_folder(media_folder, params, progress_queue, "a biblioteca de vídeos/imagens")
+    if media_index is None:
+        return False
+    available_videos = [Path(p) for p in media_index.paths('video', VIDEO_EXTENSIONS)]
+    available_images = [Path(p) for p in media_index.paths('image', IMAGE_EXTENSIONS)]
+
+    if not available_videos and not available_images:
+        progress_queue.put(("status", f"Erro: Nenhum vídeo ou imagem encontrado em {media_folder}", "error"))
+        return False
+    music_index = _scan_music_folder(params, progress_queue)
+    available_music_files = music_index.paths('audio', MUSIC_EXTENSIONS) if music_index else []
 
-    available_videos = [p for p in media_path.iterdir() if p.is_file() and p.suffix.lower() in supported_vid_ext]
-    available_images = [p for p in media_path.iterdir() if p.is_file() and p.suffix.lower() in supported_img_ext]
+    plan_items: List[BatchItemPlan] = []
+    for i, audio_filepath in enumerate(audio_files_to_process):
+        subtitle_file = root_index.find(str(audio_filepath.parent), audio_filepath.stem, 'subtitle')
+        plan_items.append(BatchItemPlan(
+            index=i,
+            name=audio_filepath.name,
+            narration_path=str(audio_filepath),
+            output_name=f"video_final_{audio_filepath.stem}.mp4",
+            subtitle_path=subtitle_file,
+            language_code=_guess_item_language(audio_filepath.name, subtitle_file),
+        ))
+
+    plan = _plan_batch(
+        plan_items, params, progress_queue, cancel_event, "Lote Hierárquico",
+        asset_paths=available_videos + available_images, music_paths=available_music_files,
+        indexes=[media_index, music_index], extra_videos=available_videos,
+        video_pool=available_videos, image_pool=available_images,
+    )
+    if plan is None:
+        return False
 
+    available_videos = plan.playable(available_videos)
     use_video_assets = bool(available_videos)
-
     if not available_videos and not available_images:
-        progress_queue.put(("status", f"Erro: Nenhum vídeo ou imagem encontrado em {media_folder}", "error"))
+        progress_queue.put(("status", f"Erro: Nenhum vídeo utilizável ou imagem encontrado em {media_folder}", "error"))
         return False
 
     if use_video_assets:
-        random.shuffle(available_videos)
         progress_queue.put(("status", f"{len(available_videos)} vídeos disponíveis na pasta selecionada.", "info"))
     else:
         progress_queue.put(("status", f"{len(available_images)} imagens disponíveis na pasta selecionada.", "info"))
 
-    available_music_files: List[str] = []
-    if music_folder and os.path.isdir(music_folder):
-        try:
-            music_ext = ('.mp3', '.wav', '.aac', '.flac', '.ogg')
-            available_music_files = [os.path.join(music_folder, f) for f in os.listdir(music_folder) if f.lower().endswith(music_ext)]
-            if available_music_files:
-                progress_queue.put(("status", f"{len(available_music_files)} músicas de fundo carregadas.", "info"))
-        except OSError as e:
-            progress_queue.put(("status", f"Aviso: Não foi possível ler a pasta de músicas: {e}", "warning"))
-
     total_files = len(audio_files_to_process)
-    video_index = 0
-    for i, audio_filepath in enumerate(audio_files_to_process):
-        if cancel_event.is_set():
-            return False
-
-        progress_queue.put(("batch_progress", (i) / total_files))
-        log_prefix = f"Lote Hierárquico {i+1}/{total_files}"
-        progress_queue.put(("status", f"--- Iniciando {log_prefix}: {audio_filepath.name} ---", "info"))
-
-        narration_path = str(audio_filepath)
-        subtitle_path = audio_filepath.with_suffix('.srt')
-        subtitle_file = str(subtitle_path) if subtitle_path.is_file() else None
-        if subtitle_file:
-            progress_queue.put(("status", f"[{log_prefix}] Legenda encontrada: {Path(subtitle_file).name}", "info"))
-
-        narration_props = _probe_media_properties(narration_path, params['ffmpeg_path'])
-        if not narration_props or 'format' not in narration_props or 'duration' not in narration_props['format']:
-            progress_queue.put(("status", f"[{log_prefix}] Erro: Não foi possível ler duração de '{audio_filepath.name}'. Pulando.", "error"))
-            continue
-
-        final_duration = _apply_tail_extension(narration_props['format']['duration'], params)
-
-        item_temp_dir = tempfile.mkdtemp(prefix=f"kyle-h-batch-item-{i}-", dir=temp_dir)
-        if use_video_assets:
-            base_video_path = str(available_videos[video_index % len(available_videos)])
-            video_index += 1
-            success = True
-            progress_queue.put(("status", f"[{log_prefix}] Vídeo base selecionado: {Path(base_video_path).name}", "info"))
-        else:
-            images_for_this_video = available_images.copy()
-            random.shuffle(images_for_this_video)
-            base_video_path, success = _process_images_in_chunks(params, images_for_this_video, final_duration, item_temp_dir, progress_queue, cancel_event, log_prefix)
 
-        if not success:
-            if not cancel_event.is_set():
-                progress_queue.put(("status", f"[{log_prefix}] Falha ao gerar vídeo base. Pulando para o próximo item.", "error"))
-            shutil.rmtree(item_temp_dir)
-            continue
-
-        if cancel_event.is_set():
-            return False
+    work_queue = WorkQueue.open(params)
+    if work_queue is not None:
+        progress_queue.put(("status", f"Modo distribuído: worker '{work_queue.worker_id}' usando a fila em '{work_queue.folder}'.", "info"))
+        items_to_render = work_queue.iter_claims(plan.pending_items, cancel_event, progress_queue, "Lote Hierárquico")
+    else:
+        items_to_render = iter(plan.pending_items)
 
-        music_files_for_pass: List[str] = []
-        if available_music_files:
-            music_playlist = _get_music_playlist(available_music_files, final_duration, params, params['ffmpeg_path'])
-            if len(music_playlist) > 1:
-                concatenated_music_path = os.path.join(item_temp_dir, "concatenated_music.m4a")
-                if _create_concatenated_audio(music_playlist, concatenated_music_path, item_temp_dir, params, cancel_event, progress_queue, log_prefix):
-                    music_files_for_pass = [concatenated_music_path]
-                else:
-                    progress_queue.put(("status", f"[{log_prefix}] Falha ao concatenar músicas, usando apenas a primeira.", "warning"))
-                    music_files_for_pass = [music_playlist[0]]
+    batch_progress = BatchProgress(plan, progress_queue)
+    try:
+        for item in items_to_render:
+            if not process_manager.wait_if_paused(cancel_event):
+                return False
+
+            batch_progress.item_started(item)
+            plan.record(item, 'started')
+            log_prefix = f"Lote Hierárquico {item.index+1}/{total_files}"
+            progress_queue.put(("status", f"--- Iniciando {log_prefix}: {item.name} ---", "info"))
+
+            subtitle_file = item.subtitle_path
+            if subtitle_file:
+                progress_queue.put(("status", f"[{log_prefix}] Legenda encontrada: {Path(subtitle_file).name}", "info"))
+
+            final_duration = item.duration
+
+            subtitle_future = _start_subtitle_prerender(params, subtitle_file, progress_queue, cancel_event, log_prefix)
+            item_temp_dir = scratch.new_item_dir(prefix=f"kyle-h-batch-item-{item.index}-")
+            audio_future, prepare_music = _start_item_audio(item, final_duration, params, item_temp_dir, scratch, cancel_event, progress_queue, log_prefix)
+            if use_video_assets:
+                base_video_path = item.base_video_path
+                success = True
+                progress_queue.put(("status", f"[{log_prefix}] Vídeo base selecionado: {Path(base_video_path).name}", "info"))
             else:
-                music_files_for_pass = music_playlist
+                images_for_this_video = item.image_sequence or available_images
+                if scratch.ensure_space(_slideshow_scratch_bytes(params, final_duration), "slideshow", progress_queue, log_prefix):
+                    base_video_path, success = _process_images_in_chunks(params, images_for_this_video, final_duration, item_temp_dir, progress_queue, cancel_event, log_prefix)
+                else:
+                    base_video_path, success = None, False
 
-        language_guess = _infer_language_code_from_name(audio_filepath.stem)
-        if not language_guess and subtitle_file:
-            language_guess = _infer_language_code_from_name(Path(subtitle_file).stem)
+            if not success:
+                if not cancel_event.is_set():
+                    progress_queue.put(("status", f"[{log_prefix}] Falha ao gerar vídeo base. Pulando para o próximo item.", "error"))
+                _wait_audio_premix(audio_future)
+                _discard_subtitle_prerender(subtitle_future)
+                scratch.release(item_temp_dir)
+                _finish_item(plan, batch_progress, item, False, log_prefix)
+                if work_queue is not None:
+                    work_queue.complete(item, False)
+                continue
 
-        final_pass_params = {**params, 'output_filename_single': f"video_final_{audio_filepath.stem}.mp4"}
-        final_pass_params['current_language_code'] = language_guess
+            if cancel_event.is_set():
+                return False
 
-        inferred_lang = _infer_language_code_from_filename(audio_filepath.name)
-        if inferred_lang:
-            final_pass_params['current_language_code'] = inferred_lang
+            final_pass_params = {**params, 'output_filename_single': item.output_name}
+            final_pass_params['current_language_code'] = item.language_code
+            _collect_subtitle_prerender(subtitle_future, final_pass_params, log_prefix)
+            music_files_for_pass = _collect_audio_premix(audio_future, prepare_music, final_pass_params, log_prefix)
 
-        final_pass_params['mov_overlay_path'] = None
-        final_pass_params['intro_phrase_text'] = ""
-        final_pass_params['intro_phrase_enabled'] = False
+            final_pass_params['mov_overlay_path'] = None
+            final_pass_params['intro_phrase_text'] = ""
+            final_pass_params['intro_phrase_enabled'] = False
 
-        final_success = _perform_final_pass(
-            params=final_pass_params,
-            base_video_path=base_video_path,
-            narration_path=narration_path,
-            music_paths=music_files_for_pass,
-            subtitle_path=subtitle_file,
-            progress_queue=progress_queue,
-            cancel_event=cancel_event,
-            temp_dir=item_temp_dir,
-            log_prefix=log_prefix
-        )
+            if not scratch.ensure_space(_final_pass_scratch_bytes(final_pass_params, final_duration), "passe final", progress_queue, log_prefix):
+                scratch.release(item_temp_dir)
+                _finish_item(plan, batch_progress, item, False, log_prefix)
+                if work_queue is not None:
+                    work_queue.complete(item, False)
+                continue
 
-        if not final_success and not cancel_event.is_set():
-            progress_queue.put(("status", f"[{log_prefix}] Falha ao finalizar o vídeo. Continuando...", "error"))
+            final_success = _perform_final_pass(
+                params=final_pass_params,
+                base_video_path=base_video_path,
+                narration_path=item.narration_path,
+                music_paths=music_files_for_pass,
+                subtitle_path=subtitle_file,
+                progress_queue=progress_queue,
+                cancel_event=cancel_event,
+                temp_dir=item_temp_dir,
+                log_prefix=log_prefix
+            )
+
+            if not final_success and not cancel_event.is_set():
+                progress_queue.put(("status", f"[{log_prefix}] Falha ao finalizar o vídeo. Continuando...", "error"))
 
-        shutil.rmtree(item_temp_dir)
+            scratch.release(item_temp_dir)
+            _finish_item(plan, batch_progress, item, final_success, log_prefix)
+            if work_queue is not None:
+                work_queue.complete(item, final_success)
+    finally:
+        if work_queue is not None:
+            work_queue.close()
 
     progress_queue.put(("batch_progress", 1.0))
     return True
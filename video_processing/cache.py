@@ -0,0 +1,74 @@
+"""Persistent cache helpers shared by the pipeline stages."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+__all__ = [
+    "CACHE_DIR_NAME",
+    "file_fingerprint",
+    "stat_fingerprint",
+    "stable_hash",
+    "resolve_cache_dir",
+    "cache_entry_lock",
+]
+
+CACHE_DIR_NAME = "kyle-editor-cache"
+
+_ENTRY_LOCKS: Dict[str, threading.Lock] = {}
+_ENTRY_LOCKS_GUARD = threading.Lock()
+
+
+def file_fingerprint(path: Optional[str]) -> Optional[str]:
+    """Identifica um arquivo pelo caminho absoluto, tamanho e ``mtime``.
+
+    Evita ler o conteúdo (as mídias costumam ter vários GB); qualquer
+    alteração no arquivo muda o tamanho ou a data de modificação.
+    """
+
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat_fingerprint(path, stat.st_size, stat.st_mtime_ns)
+
+
+def stat_fingerprint(path: str, size: int, mtime_ns: int) -> str:
+    """Mesma impressão de :func:`file_fingerprint` para um ``stat`` já conhecido."""
+
+    payload = f"{os.path.abspath(path)}|{size}|{mtime_ns}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def stable_hash(value: Any) -> str:
+    """Hash determinístico de estruturas JSON (dicts, listas, números, textos)."""
+
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def resolve_cache_dir(params: Optional[Dict[str, Any]], namespace: str) -> str:
+    """Retorna (criando se necessário) a pasta de cache para ``namespace``.
+
+    A raiz vem de ``params['render_cache_dir']``; sem ela é usada uma pasta
+    fixa no diretório temporário do sistema, partilhada entre lotes.
+    """
+
+    root = (params or {}).get('render_cache_dir') or os.path.join(tempfile.gettempdir(), CACHE_DIR_NAME)
+    path = os.path.join(root, namespace)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_entry_lock(key: str) -> threading.Lock:
+    """Trava por entrada de cache: itens paralelos de um lote renderizam cada entrada uma vez."""
+
+    with _ENTRY_LOCKS_GUARD:
+        return _ENTRY_LOCKS.setdefault(key, threading.Lock())
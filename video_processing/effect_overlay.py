@@ -0,0 +1,98 @@
+"""One-time transcode of effect overlay clips to the output resolution."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from queue import Queue
+from typing import Any, Dict, Optional, Tuple
+
+from .cache import cache_entry_lock, file_fingerprint, resolve_cache_dir, stable_hash
+from .shared import _execute_ffmpeg, _probe_media_properties, logger, retry_policy_for
+
+__all__ = [
+    "_effect_prerender_enabled",
+    "_prerender_effect_overlay",
+]
+
+# Só quadros-chave (GOP 1): o ``-stream_loop`` recomeça sem saltos e cada quadro decodifica sozinho.
+_EFFECT_CODEC_ARGS = ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '16', '-g', '1', '-pix_fmt', 'yuv420p']
+
+
+def _effect_prerender_enabled(params: Dict[str, Any]) -> bool:
+    return bool(params.get('effect_prerender_enabled', True))
+
+
+def _prerender_effect_overlay(
+    params: Dict[str, Any],
+    resolution: Tuple[int, int],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+) -> Optional[str]:
+    """Converte o vídeo de efeito, uma única vez, para a resolução da saída.
+
+    Os efeitos costumam ser clipes 4K; a versão reduzida fica no cache,
+    partilhada entre lotes, enquanto o arquivo e a resolução forem os mesmos.
+    A cadência original é mantida, como no efeito escalado no próprio passe
+    final. Retorna ``None`` quando a conversão está desativada ou falha,
+    para que o passe final escale o original como antes.
+    """
+
+    source_path = params.get('effect_overlay_path')
+    if not _effect_prerender_enabled(params) or not source_path or not os.path.isfile(source_path):
+        return None
+
+    width, height = resolution
+    cache_key = stable_hash([
+        file_fingerprint(source_path),
+        [width, height],
+        _EFFECT_CODEC_ARGS,
+    ])
+    effect_dir = resolve_cache_dir(params, 'effect_overlays')
+    output_path = os.path.join(effect_dir, f"effect_{Path(source_path).stem}_{cache_key[:16]}.mp4")
+
+    with cache_entry_lock(cache_key):
+        if os.path.isfile(output_path):
+            logger.info("[%s] Reutilizando efeito pré-escalado: %s", log_prefix, output_path)
+            return output_path
+
+        duration = 0.0
+        props = _probe_media_properties(source_path, params['ffmpeg_path'])
+        if props and 'format' in props and 'duration' in props['format']:
+            try:
+                duration = float(props['format']['duration'])
+            except (TypeError, ValueError):
+                duration = 0.0
+
+        partial_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.part"
+        cmd = [
+            params['ffmpeg_path'], '-y',
+            '-i', source_path,
+            '-vf', f"scale={width}:{height},setsar=1",
+            '-an',
+            *_EFFECT_CODEC_ARGS,
+            '-f', 'mp4',
+            partial_path,
+        ]
+
+        progress_queue.put(("status", f"[{log_prefix}] Pré-escalando vídeo de efeito para {width}x{height}...", "info"))
+        success = _execute_ffmpeg(
+            cmd,
+            duration,
+            None,
+            cancel_event,
+            f"{log_prefix} (Efeito)",
+            progress_queue,
+            policy=retry_policy_for('effect', params),
+        )
+        if not success or not os.path.isfile(partial_path):
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            return None
+
+        os.replace(partial_path, output_path)
+        return output_path
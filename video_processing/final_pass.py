@@ -4,20 +4,37 @@ from __future__ import annotations
 
 import os
 import time
+from dataclasses import dataclass
 from pathlib import Path
 from queue import Queue
 from typing import Any, Dict, List, Optional, Tuple
 import threading
 
+from .audio_mix import _audio_premix_enabled, _build_audio_mix_filters, _prerender_audio_mix
 from .banner import BANNER_HEIGHT_RATIO, BannerRenderConfig, generate_banner_image
+from .cache import resolve_cache_dir
 from .intro import _maybe_create_intro_clip, _combine_intro_with_main, _prepare_intro_text
+from .effect_overlay import _prerender_effect_overlay
+from .journal import _partial_output_path
+from .renditions import OutputRendition, parse_renditions
+from .presenter import _prerender_presenter_track, _presenter_filter, _presenter_overlay_position
+from .preview import (
+    PREVIEW_CODEC_ARGS,
+    join_preview_windows,
+    preview_enabled,
+    preview_output_filename,
+    preview_windows,
+    rebase_preview_streams,
+    seek_inputs,
+)
 from .shared import (
-    _escape_ffmpeg_path,
     _execute_ffmpeg,
     _get_codec_params,
     _probe_media_properties,
     logger,
+    retry_policy_for,
 )
+from .subtitle_overlay import _build_subtitles_filter, _prerender_subtitle_overlay, _subtitle_prerender_enabled
 from .utils import _parse_resolution, _create_styled_ass_from_srt
 
 __all__ = ["_perform_final_pass"]
@@ -25,6 +42,50 @@ __all__ = ["_perform_final_pass"]
 
 DEFAULT_BANNER_FONT_SCALE = BannerRenderConfig.__dataclass_fields__['font_scale'].default
 
+# Codecs que o contêiner MP4 de saída aceita por cópia direta.
+_STREAM_COPY_CODECS = ('h264', 'hevc')
+
+
+def _video_matches_output(video_props: Optional[Dict[str, Any]], resolution: Tuple[int, int]) -> bool:
+    """``True`` quando o vídeo base já tem a resolução, o SAR e o formato da saída.
+
+    Nesse caso ``scale``/``setsar``/``format`` seriam no-ops e, sem outros
+    filtros de vídeo, o passe final pode copiar o vídeo sem recodificar.
+    """
+
+    streams = (video_props or {}).get('streams') or []
+    video = next((stream for stream in streams if stream.get('codec_type') == 'video'), None)
+    if not video:
+        return False
+    try:
+        size = (int(video.get('width', 0)), int(video.get('height', 0)))
+    except (TypeError, ValueError):
+        return False
+    return (
+        size == tuple(resolution)
+        and video.get('codec_name') in _STREAM_COPY_CODECS
+        and video.get('pix_fmt') == 'yuv420p'
+        and video.get('sample_aspect_ratio', '1:1') in ('1:1', '0:1', 'N/A')
+    )
+
+
+def _discard_partial_output(partial_output_path: str) -> None:
+    try:
+        os.remove(partial_output_path)
+    except OSError:
+        pass
+
+
+def _publish_partial_output(partial_output_path: str, final_output_path: str) -> bool:
+    if not os.path.exists(partial_output_path):
+        return True
+    try:
+        os.replace(partial_output_path, final_output_path)
+    except OSError as exc:
+        logger.error("Não foi possível mover '%s' para '%s': %s", partial_output_path, final_output_path, exc)
+        return False
+    return True
+
 
 def _prepare_banner_overlay(
     params: Dict[str, Any],
@@ -132,21 +193,65 @@ def _prepare_banner_overlay(
     }
 
 
-def _perform_final_pass(
-    params: Dict,
-    base_video_path: str,
-    narration_path: Optional[str],
-    music_paths: List[str],
-    subtitle_path: Optional[str],
+@dataclass
+class _Timeline:
+    """Durações que definem o fade-out, a faixa e o ``-t`` do passe final."""
+
+    video_props: Optional[Dict[str, Any]]
+    narration_duration: float
+    content_duration: float
+    fade_tail_duration: float
+    total_duration: float
+
+
+@dataclass
+class _VideoGraph:
+    """Entradas e cadeia de filtros de vídeo do passe final, antes do áudio e do encoder."""
+
+    inputs: List[str]
+    input_map: Dict[str, int]
+    filter_parts: List[str]
+    video_stream: str
+
+
+def _finish_with_intro(
+    rendition: Optional[OutputRendition],
+    intro_info: Dict[str, Any],
+    content_only_output_path: str,
+    partial_output_path: str,
+    params: Dict[str, Any],
+    temp_dir: str,
     progress_queue: Queue,
     cancel_event: threading.Event,
-    temp_dir: str,
     log_prefix: str,
 ) -> bool:
+    """Junta a introdução ao conteúdo; versões adicionais recebem uma introdução na própria resolução."""
+
+    combine_params = params
+    if rendition is not None:
+        combine_params = {**params, 'resolution': f"{rendition.width}x{rendition.height}"}
+        intro_info = _maybe_create_intro_clip(combine_params, temp_dir, rendition.resolution, progress_queue, cancel_event, log_prefix) or {}
+    combined = bool(intro_info) and _combine_intro_with_main(
+        intro_info, content_only_output_path, partial_output_path, combine_params, progress_queue, cancel_event, log_prefix
+    )
+    if os.path.exists(content_only_output_path):
+        try:
+            os.remove(content_only_output_path)
+        except OSError:
+            pass
+    if not combined:
+        _discard_partial_output(partial_output_path)
+    return combined
 
-    if not base_video_path or not os.path.exists(base_video_path):
-        progress_queue.put(("status", f"[{log_prefix}] Erro Interno: Arquivo de vídeo base não foi encontrado.", "error"))
-        return False
+
+def _measure_timeline(
+    params: Dict[str, Any],
+    base_video_path: str,
+    narration_path: Optional[str],
+    progress_queue: Queue,
+    log_prefix: str,
+) -> _Timeline:
+    """Durações do vídeo base e da narração, e até onde o vídeo final vai (com a cauda do fade-out)."""
 
     narration_duration = 0.0
     narration_props = _probe_media_properties(narration_path, params['ffmpeg_path']) if narration_path and os.path.isfile(narration_path) else None
@@ -179,9 +284,31 @@ def _perform_final_pass(
     narration_with_tail = narration_duration + fade_tail_duration if narration_duration > 0 else 0.0
     total_duration = max(content_duration, narration_with_tail)
 
+    return _Timeline(video_props, narration_duration, content_duration, fade_tail_duration, total_duration)
+
+
+def _build_video_graph(
+    params: Dict[str, Any],
+    base_video_path: str,
+    timeline: _Timeline,
+    subtitle_path: Optional[str],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    temp_dir: str,
+    log_prefix: str,
+) -> _VideoGraph:
+    """Entradas e filtros de vídeo: base, efeito, apresentador, logo PNG, faixa, fade-out e legendas.
+
+    É o mesmo grafo usado pelo passe final e pela pré-visualização de quadro
+    único (:mod:`video_processing.frame_preview`).
+    """
+
+    video_props = timeline.video_props
+    narration_duration = timeline.narration_duration
+    content_duration = timeline.content_duration
+    total_duration = timeline.total_duration
     inputs: List[str] = []
     filter_complex_parts: List[str] = []
-    map_args: List[str] = []
     input_map: Dict[str, int] = {}
     current_idx = 0
     banner_overlay_info: Optional[Dict[str, Any]] = None
@@ -191,54 +318,40 @@ def _perform_final_pass(
     current_idx += 1
     last_video_stream = f"[{input_map['main_video']}:v]"
 
+    W, H = _parse_resolution(params['resolution'])
+    effect_track: Optional[str] = None
     if params.get('effect_overlay_path') and os.path.isfile(params['effect_overlay_path']):
-        inputs.extend(["-stream_loop", "-1", "-i", params['effect_overlay_path']])
+        effect_track = _prerender_effect_overlay(params, (W, H), progress_queue, cancel_event, log_prefix)
+        inputs.extend(["-stream_loop", "-1", "-i", effect_track or params['effect_overlay_path']])
         input_map['effect'] = current_idx
         current_idx += 1
     if params.get('png_overlay_path') and os.path.isfile(params['png_overlay_path']):
         inputs.extend(["-i", params['png_overlay_path']])
         input_map['png'] = current_idx
         current_idx += 1
+    presenter_track: Optional[str] = None
     if params.get('presenter_video_path') and os.path.isfile(params['presenter_video_path']):
-        inputs.extend(["-stream_loop", "-1", "-i", params['presenter_video_path']])
+        presenter_track = _prerender_presenter_track(params, (W, H), progress_queue, cancel_event, log_prefix)
+        inputs.extend(["-stream_loop", "-1", "-i", presenter_track or params['presenter_video_path']])
         input_map['presenter'] = current_idx
         current_idx += 1
 
-    W, H = _parse_resolution(params['resolution'])
     banner_overlay_info = _prepare_banner_overlay(params, temp_dir, (W, H), total_duration)
     if banner_overlay_info and os.path.isfile(banner_overlay_info['path']):
         inputs.extend(["-loop", "1", "-i", banner_overlay_info['path']])
         input_map['banner'] = current_idx
         current_idx += 1
 
-    if narration_path and os.path.isfile(narration_path):
-        inputs.extend(["-i", narration_path])
-        input_map['narration'] = current_idx
-        current_idx += 1
-    if music_paths and music_paths[0] and os.path.isfile(music_paths[0]):
-        inputs.extend(["-i", music_paths[0]])
-        input_map['music'] = current_idx
-        current_idx += 1
-
-    progress_queue.put(("status", f"[{log_prefix}] Construindo filtros de vídeo...", "info"))
-    intro_info = _maybe_create_intro_clip(params, temp_dir, (W, H), progress_queue, cancel_event, log_prefix)
-    if intro_info:
-        label = intro_info.get('language_label') or "Padrão"
-        if intro_info.get('translation_applied'):
-            label = f"{label} - tradução automática"
-        progress_queue.put((
-            "status",
-            f"[{log_prefix}] Introdução digitada aplicada ({label}).",
-            "info",
-        ))
-
-    filter_complex_parts.append(f"{last_video_stream}scale={W}:{H},setsar=1[v_scaled]")
-    last_video_stream = "[v_scaled]"
+    if not _video_matches_output(video_props, (W, H)):
+        filter_complex_parts.append(f"{last_video_stream}scale={W}:{H},setsar=1[v_scaled]")
+        last_video_stream = "[v_scaled]"
 
     if 'effect' in input_map:
         blend_mode = params.get('effect_blend_mode', 'screen').lower()
         effect_opacity = float(params.get('effect_blend_opacity', 0.25))
-        filter_complex_parts.append(f"[{input_map['effect']}:v]scale={W}:{H},format=rgba[effect_scaled]")
+        # A versão pré-escalada já tem a resolução da saída; só o original precisa de ``scale``.
+        effect_scale = "" if effect_track else f"scale={W}:{H},"
+        filter_complex_parts.append(f"[{input_map['effect']}:v]{effect_scale}format=rgba[effect_scaled]")
         filter_complex_parts.append(
             f"{last_video_stream}[effect_scaled]"
             f"blend=all_mode={blend_mode}:all_opacity={effect_opacity}[v_effect]"
@@ -246,30 +359,14 @@ def _perform_final_pass(
         last_video_stream = "[v_effect]"
 
     if 'presenter' in input_map:
-        pos = params.get('presenter_position', 'Inferior Central')
-        pos_x = {'Inferior Esquerdo': '10', 'Inferior Central': '(W-w)/2', 'Inferior Direito': 'W-w-10'}.get(pos, '(W-w)/2')
-        scale = float(params.get('presenter_scale', 0.40))
-        target_h = int(H * scale)
-        position = f"{pos_x}:H-h"
-
-        if params.get('presenter_chroma_enabled'):
-            chroma_hex = params.get('presenter_chroma_color', '#00FF00').replace('#', '0x')
-            raw_sim = float(params.get('presenter_chroma_similarity', 0.20))
-            raw_smth = float(params.get('presenter_chroma_blend', 0.10))
-            raw_sim = max(0.0, min(raw_sim, 1.0))
-            raw_smth = max(0.0, min(raw_smth, 1.0))
-            sim = 0.05 + 0.45 * raw_sim
-            smth = 0.02 + 0.28 * raw_smth
-            filter_complex_parts.append(
-                f"[{input_map['presenter']}:v]"
-                f"scale=w=-1:h={target_h},format=rgba,chromakey={chroma_hex}:{sim}:{smth}"
-                f"[presenter_keyed]"
-            )
-            filter_complex_parts.append(f"{last_video_stream}[presenter_keyed]overlay={position}:format=auto[v_presenter]")
+        position = _presenter_overlay_position(params)
+        if presenter_track:
+            # Faixa já escalada e com alpha: o passe final só sobrepõe.
+            presenter_stream = f"[{input_map['presenter']}:v]"
         else:
-            filter_complex_parts.append(f"[{input_map['presenter']}:v]scale=w=-1:h={target_h}[presenter_scaled]")
-            filter_complex_parts.append(f"{last_video_stream}[presenter_scaled]overlay={position}:format=auto[v_presenter]")
-
+            filter_complex_parts.append(f"[{input_map['presenter']}:v]{_presenter_filter(params, (W, H))}[presenter_keyed]")
+            presenter_stream = "[presenter_keyed]"
+        filter_complex_parts.append(f"{last_video_stream}{presenter_stream}overlay={position}:format=auto[v_presenter]")
         last_video_stream = "[v_presenter]"
 
     if 'png' in input_map:
@@ -314,82 +411,212 @@ def _perform_final_pass(
         filter_complex_parts.append(f"{last_video_stream}fade=t=out:st={fade_start_time}:d={fade_duration}:c=black[v_fadeout]")
         last_video_stream = "[v_fadeout]"
 
-    styled_subtitle_path = _create_styled_ass_from_srt(subtitle_path, params['subtitle_style'], temp_dir, (W, H))
-    if styled_subtitle_path and os.path.isfile(styled_subtitle_path):
-        escaped_sub_path = _escape_ffmpeg_path(styled_subtitle_path)
-        font_file_path = params.get('subtitle_style', {}).get('font_file')
-
-        subtitle_filter = f"subtitles=filename='{escaped_sub_path}'"
-        if font_file_path and os.path.isfile(font_file_path):
-            font_dir = Path(font_file_path).parent
-            escaped_font_dir = _escape_ffmpeg_path(str(font_dir.resolve()))
-            subtitle_filter += f":fontsdir='{escaped_font_dir}'"
+    subtitle_overlay_path = params.get('subtitle_overlay_path')
+    if not subtitle_overlay_path and _subtitle_prerender_enabled(params):
+        subtitle_overlay_path = _prerender_subtitle_overlay(params, subtitle_path, progress_queue, cancel_event, log_prefix)
 
-        filter_complex_parts.append(f"{last_video_stream}{subtitle_filter}[v_subs]")
+    if subtitle_overlay_path and os.path.isfile(subtitle_overlay_path):
+        inputs.extend(["-i", subtitle_overlay_path])
+        input_map['subtitles'] = current_idx
+        current_idx += 1
+        filter_complex_parts.append(
+            f"{last_video_stream}[{input_map['subtitles']}:v]overlay=0:0:format=auto:eof_action=pass[v_subs]"
+        )
         last_video_stream = "[v_subs]"
-
-    progress_queue.put(("status", f"[{log_prefix}] Construindo filtros de áudio...", "info"))
-    last_audio_stream: Optional[str] = None
-    if 'narration' in input_map and 'music' in input_map:
-        filter_complex_parts.append(f"[{input_map['narration']}:a]volume={params['narration_volume']}dB[narr_vol]")
-        filter_complex_parts.append(f"[{input_map['music']}:a]volume={params['music_volume']}dB[music_vol]")
-        filter_complex_parts.append(f"[narr_vol]asplit=2[narr_main][narr_side]")
-        filter_complex_parts.append(f"[music_vol][narr_side]sidechaincompress=release=250[music_ducked]")
-        filter_complex_parts.append(f"[narr_main][music_ducked]amix=inputs=2:duration=longest:dropout_transition=3[a_mix]")
-        last_audio_stream = "[a_mix]"
-    elif 'narration' in input_map:
-        filter_complex_parts.append(f"[{input_map['narration']}:a]volume={params['narration_volume']}dB[aout]")
-        last_audio_stream = "[aout]"
-    elif 'music' in input_map:
-        filter_complex_parts.append(f"[{input_map['music']}:a]volume={params['music_volume']}dB[aout]")
-        last_audio_stream = "[aout]"
-
-    if params.get('add_fade_out') and last_audio_stream:
-        fade_duration = max(0.0, float(params.get('fade_out_duration', 10)))
-        fade_start_time = narration_duration if narration_duration > 0 else max(0.0, content_duration - fade_duration)
-        filter_complex_parts.append(f"{last_audio_stream}afade=t=out:st={fade_start_time}:d={fade_duration}[a_fadeout]")
-        last_audio_stream = "[a_fadeout]"
-
-    final_output_path = str(Path(params['output_folder']) / params['output_filename_single'])
-    content_only_output_path = final_output_path
-    if intro_info:
-        content_only_output_path = os.path.join(
+    else:
+        styled_subtitle_path = _create_styled_ass_from_srt(
+            subtitle_path,
+            params['subtitle_style'],
             temp_dir,
-            f"main-content-{Path(params['output_filename_single']).stem}.mp4",
+            (W, H),
+            cache_dir=resolve_cache_dir(params, 'subtitles'),
         )
+        if styled_subtitle_path and os.path.isfile(styled_subtitle_path):
+            subtitle_filter = _build_subtitles_filter(styled_subtitle_path, params)
+            filter_complex_parts.append(f"{last_video_stream}{subtitle_filter}[v_subs]")
+            last_video_stream = "[v_subs]"
 
-    cmd_prefix = [params['ffmpeg_path'], '-y', *inputs]
+    return _VideoGraph(inputs, input_map, filter_complex_parts, last_video_stream)
 
-    filter_complex_parts.append(f"{last_video_stream}format=yuv420p[vout]")
-    map_args.extend(["-map", "[vout]"])
 
-    if last_audio_stream:
-        map_args.extend(["-map", last_audio_stream])
-    elif 'main_video' in input_map:
-        map_args.extend(["-map", f"{input_map['main_video']}:a?"])
+def _perform_final_pass(
+    params: Dict,
+    base_video_path: str,
+    narration_path: Optional[str],
+    music_paths: List[str],
+    subtitle_path: Optional[str],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    temp_dir: str,
+    log_prefix: str,
+) -> bool:
 
-    final_filter_str = ""
-    if filter_complex_parts:
-        final_filter_str = ";".join(filter_complex_parts)
-        logger.debug(f"[{log_prefix}] Cadeia de Filtros Completa:\n{final_filter_str}")
-        cmd_prefix.extend(['-filter_complex', final_filter_str])
+    if not base_video_path or not os.path.exists(base_video_path):
+        progress_queue.put(("status", f"[{log_prefix}] Erro Interno: Arquivo de vídeo base não foi encontrado.", "error"))
+        return False
+
+    timeline = _measure_timeline(params, base_video_path, narration_path, progress_queue, log_prefix)
+    video_props = timeline.video_props
+    narration_duration = timeline.narration_duration
+    content_duration = timeline.content_duration
+    fade_tail_duration = timeline.fade_tail_duration
+    total_duration = timeline.total_duration
 
-    cmd_prefix.extend(map_args)
+    progress_queue.put(("status", f"[{log_prefix}] Construindo filtros de vídeo...", "info"))
+    graph = _build_video_graph(params, base_video_path, timeline, subtitle_path, progress_queue, cancel_event, temp_dir, log_prefix)
+    inputs = graph.inputs
+    input_map = graph.input_map
+    filter_complex_parts = graph.filter_parts
+    last_video_stream = graph.video_stream
+    current_idx = len(input_map)
+    W, H = _parse_resolution(params['resolution'])
+
+    music_path = music_paths[0] if music_paths and music_paths[0] and os.path.isfile(music_paths[0]) else None
+    audio_mix_path = params.get('audio_mix_path')
+    if not audio_mix_path and _audio_premix_enabled(params):
+        audio_mix_path = _prerender_audio_mix(params, narration_path, music_path, progress_queue, cancel_event, log_prefix)
+    if audio_mix_path and os.path.isfile(audio_mix_path):
+        # Mixagem pronta (com ducking e fade): o passe final só a multiplexa.
+        inputs.extend(["-i", audio_mix_path])
+        input_map['audio_mix'] = current_idx
+        current_idx += 1
+    else:
+        if narration_path and os.path.isfile(narration_path):
+            inputs.extend(["-i", narration_path])
+            input_map['narration'] = current_idx
+            current_idx += 1
+        if music_path:
+            inputs.extend(["-i", music_path])
+            input_map['music'] = current_idx
+            current_idx += 1
 
-    force_reencode = any(s in final_filter_str for s in ['scale=', 'blend=', 'overlay=', 'fade=', 'subtitles='])
-    primary_codec_params = _get_codec_params(params, force_reencode)
+    intro_info = _maybe_create_intro_clip(params, temp_dir, (W, H), progress_queue, cancel_event, log_prefix)
+    if intro_info:
+        label = intro_info.get('language_label') or "Padrão"
+        if intro_info.get('translation_applied'):
+            label = f"{label} - tradução automática"
+        progress_queue.put((
+            "status",
+            f"[{log_prefix}] Introdução digitada aplicada ({label}).",
+            "info",
+        ))
 
-    audio_args = ['-c:a', 'aac', '-b:a', '192k'] if last_audio_stream else ['-c:a', 'copy']
+    progress_queue.put(("status", f"[{log_prefix}] Construindo filtros de áudio...", "info"))
+    fade_start_time = narration_duration if narration_duration > 0 else max(0.0, content_duration - fade_tail_duration)
+    audio_filters, last_audio_stream = _build_audio_mix_filters(
+        params, input_map.get('narration'), input_map.get('music'), fade_start_time
+    )
+    filter_complex_parts.extend(audio_filters)
+
+    preview = preview_enabled(params)
+    render_duration = total_duration
+    windows: List[Tuple[float, float]] = [(0.0, total_duration)]
+    if preview:
+        # Pré-visualização: o mesmo grafo, renderizado só no início e no trecho do fade-out,
+        # com as entradas procuradas no começo de cada trecho.
+        windows = preview_windows(total_duration, params)
+        if not last_audio_stream:
+            if 'audio_mix' in input_map:
+                last_audio_stream = f"[{input_map['audio_mix']}:a]"
+            elif any(stream.get('codec_type') == 'audio' for stream in (video_props or {}).get('streams', [])):
+                last_audio_stream = f"[{input_map['main_video']}:a]"
+        last_video_stream, last_audio_stream = rebase_preview_streams(
+            filter_complex_parts, last_video_stream, last_audio_stream, float(params.get('output_fps') or 30)
+        )
+        render_duration = sum(end - start for start, end in windows)
+        progress_queue.put((
+            "status",
+            f"[{log_prefix}] Pré-visualização em {W}x{H}: "
+            + " + ".join(f"{start:.0f}s–{end:.0f}s" for start, end in windows) + ".",
+            "info",
+        ))
 
-    time_args: List[str] = []
-    if total_duration > 0:
-        time_args.extend(["-t", f"{total_duration:.6f}"])
-    time_args.append("-shortest")
+    renditions = parse_renditions(params, (W, H))
+    if renditions:
+        progress_queue.put((
+            "status",
+            f"[{log_prefix}] Gerando {len(renditions) + 1} versões na mesma passagem: "
+            + ", ".join([f"{W}x{H}", *(f"{r.width}x{r.height}" for r in renditions)]) + ".",
+            "info",
+        ))
 
-    output_args = ['-movflags', '+faststart', content_only_output_path]
+    # (rendição, caminho final, caminho parcial, conteúdo sem introdução); ``None`` = saída principal.
+    outputs: List[Tuple[Optional[OutputRendition], str, str, str]] = []
+    for rendition in [None, *renditions]:
+        filename = rendition.output_filename(params['output_filename_single']) if rendition else params['output_filename_single']
+        if preview:
+            filename = preview_output_filename(filename)
+        final_output_path = str(Path(params['output_folder']) / filename)
+        # O FFmpeg grava num nome temporário; só um arquivo completo recebe o nome final.
+        partial_output_path = _partial_output_path(final_output_path)
+        content_only_output_path = partial_output_path
+        if intro_info:
+            content_only_output_path = os.path.join(temp_dir, f"main-content-{Path(filename).stem}.mp4")
+        outputs.append((rendition, final_output_path, partial_output_path, content_only_output_path))
+
+
+    # Sem nenhum filtro de vídeo, o vídeo base segue por cópia direta e só o áudio é codificado.
+    # Com introdução, não: a junção usa ``xfade``, que exige a mesma base de tempo nos dois clipes.
+    force_reencode = last_video_stream != f"[{input_map['main_video']}:v]" or bool(renditions) or bool(intro_info)
+    video_maps: List[str] = []
+    if renditions:
+        # Uma única decodificação e composição alimentam todos os encoders.
+        split_labels = [f"[vsplit{i}]" for i in range(len(outputs))]
+        filter_complex_parts.append(f"{last_video_stream}split={len(outputs)}{''.join(split_labels)}")
+        filter_complex_parts.append(f"{split_labels[0]}format=yuv420p[vout]")
+        video_maps.append("[vout]")
+        for i, rendition in enumerate(renditions, start=1):
+            filter_complex_parts.append(f"{split_labels[i]}{rendition.scale_filter((W, H))},format=yuv420p[vout{i}]")
+            video_maps.append(f"[vout{i}]")
+    elif force_reencode:
+        filter_complex_parts.append(f"{last_video_stream}format=yuv420p[vout]")
+        video_maps.append("[vout]")
+    else:
+        progress_queue.put(("status", f"[{log_prefix}] Vídeo base já no formato de saída; copiando o vídeo sem recodificar.", "info"))
+        video_maps.append(f"{input_map['main_video']}:v:0")
+
+    audio_maps: List[Optional[str]] = [None] * len(outputs)
+    if last_audio_stream and renditions:
+        split_labels = [f"[asplit{i}]" for i in range(len(outputs))]
+        filter_complex_parts.append(f"{last_audio_stream}asplit={len(outputs)}{''.join(split_labels)}")
+        audio_maps = split_labels
+    elif last_audio_stream:
+        audio_maps = [last_audio_stream]
+    elif 'audio_mix' in input_map:
+        audio_maps = [f"{input_map['audio_mix']}:a:0"] * len(outputs)
+    elif 'main_video' in input_map:
+        audio_maps = [f"{input_map['main_video']}:a?"] * len(outputs)
 
-    def build_cmd(codec_params: List[str]) -> List[str]:
-        return [*cmd_prefix, *codec_params, *audio_args, *time_args, *output_args]
+    filter_args: List[str] = []
+    if filter_complex_parts:
+        final_filter_str = ";".join(filter_complex_parts)
+        logger.debug(f"[{log_prefix}] Cadeia de Filtros Completa:\n{final_filter_str}")
+        filter_args = ['-filter_complex', final_filter_str]
+
+    primary_codec_params = list(PREVIEW_CODEC_ARGS) if preview else _get_codec_params(params, force_reencode)
+
+    def output_args(index: int, codec_params: List[str], duration: float, content_path: str) -> List[str]:
+        rendition = outputs[index][0]
+        args = ["-map", video_maps[index]]
+        if audio_maps[index]:
+            args.extend(["-map", audio_maps[index]])
+        args.extend(codec_params)
+        if rendition:
+            args.extend(rendition.rate_args())
+        if last_audio_stream:
+            args.extend(['-c:a', 'aac', '-b:a', rendition.audio_bitrate if rendition else '192k'])
+        else:
+            args.extend(['-c:a', 'copy'])
+        if duration > 0:
+            args.extend(["-t", f"{duration:.6f}"])
+        return [*args, "-shortest", '-movflags', '+faststart', content_path]
+
+    def build_cmd(codec_params: List[str], start: float = 0.0, duration: float = render_duration, window_path: Optional[str] = None) -> List[str]:
+        cmd = [params['ffmpeg_path'], '-y', *(seek_inputs(inputs, input_map, start, params['ffmpeg_path']) if start > 0 else inputs)]
+        cmd.extend(filter_args)
+        for index in range(len(outputs)):
+            cmd.extend(output_args(index, codec_params, duration, window_path or outputs[index][3]))
+        return cmd
 
     codec_attempts: List[Tuple[str, List[str]]] = []
 
@@ -413,6 +640,36 @@ def _perform_final_pass(
     def final_progress_callback(pct: float) -> None:
         progress_queue.put(("progress", pct))
 
+    def render_windows(codec_params: List[str], label: str) -> bool:
+        """Um processo por trecho da pré-visualização, juntos por cópia direta no fim."""
+
+        content_path = outputs[0][3]
+        stem, ext = os.path.splitext(content_path)
+        segments: List[str] = []
+        done = 0.0
+        for number, (start, end) in enumerate(windows):
+            segment_path = f"{stem}.window{number}{ext}"
+            segments.append(segment_path)
+            offset = done
+
+            def window_progress(pct: float, offset: float = offset, length: float = end - start) -> None:
+                final_progress_callback((offset + length * pct) / render_duration)
+
+            if not _execute_ffmpeg(
+                build_cmd(codec_params, start, end - start, segment_path),
+                end - start,
+                window_progress,
+                cancel_event,
+                f"{log_prefix} (Final - {label}, trecho {number + 1}/{len(windows)})",
+                progress_queue,
+                policy=retry_policy_for('final', params),
+            ):
+                for segment in segments:
+                    _discard_partial_output(segment)
+                return False
+            done += end - start
+        return join_preview_windows(params, segments, content_path, progress_queue, cancel_event, log_prefix)
+
     success = False
     total_attempts = len(codec_attempts)
     for attempt_idx, (label, codec_params) in enumerate(codec_attempts, start=1):
@@ -424,15 +681,18 @@ def _perform_final_pass(
             ))
             progress_queue.put(("progress", 0.0))
 
-        cmd_final_attempt = build_cmd(codec_params)
-        success = _execute_ffmpeg(
-            cmd_final_attempt,
-            total_duration,
-            final_progress_callback,
-            cancel_event,
-            f"{log_prefix} (Final - {label})",
-            progress_queue,
-        )
+        if len(windows) > 1:
+            success = render_windows(codec_params, label)
+        else:
+            success = _execute_ffmpeg(
+                build_cmd(codec_params),
+                render_duration,
+                final_progress_callback,
+                cancel_event,
+                f"{log_prefix} (Final - {label})",
+                progress_queue,
+                policy=retry_policy_for('final', params),
+            )
 
         if success or cancel_event.is_set():
             break
@@ -445,15 +705,20 @@ def _perform_final_pass(
             ))
 
     if not success:
+        for _rendition, _final_path, partial_output_path, content_path in outputs:
+            _discard_partial_output(partial_output_path)
+            if content_path != partial_output_path:
+                _discard_partial_output(content_path)
         return False
 
-    if not intro_info:
-        return True
-
-    combined = _combine_intro_with_main(intro_info, content_only_output_path, final_output_path, params, progress_queue, cancel_event, log_prefix)
-    if combined and content_only_output_path != final_output_path and os.path.exists(content_only_output_path):
-        try:
-            os.remove(content_only_output_path)
-        except OSError:
-            pass
-    return combined
+    all_published = True
+    for rendition, final_output_path, partial_output_path, content_only_output_path in outputs:
+        if intro_info:
+            all_published = _finish_with_intro(
+                rendition, intro_info, content_only_output_path, partial_output_path,
+                params, temp_dir, progress_queue, cancel_event, log_prefix,
+            ) and all_published
+            if not os.path.exists(partial_output_path):
+                continue
+        all_published = _publish_partial_output(partial_output_path, final_output_path) and all_published
+    return all_published
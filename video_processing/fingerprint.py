@@ -0,0 +1,134 @@
+"""Render fingerprints that let a re-run skip outputs that are already up to date."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+from .cache import file_fingerprint, stable_hash
+from .shared import logger
+
+__all__ = [
+    "RENDER_SIDECAR_SUFFIX",
+    "pool_fingerprint",
+    "render_fingerprint",
+    "read_render_sidecar",
+    "write_render_sidecar",
+    "is_output_up_to_date",
+    "_relevant_params",
+]
+
+RENDER_SIDECAR_SUFFIX = ".render.json"
+_FINGERPRINT_VERSION = 1
+
+# Parâmetros lidos por ``_perform_final_pass`` (e pela introdução/banner) que mudam o vídeo final,
+# além dos que montam o slideshow e a playlist de músicas dos lotes de imagens e mistos.
+_FINAL_PASS_PARAM_KEYS = (
+    'add_fade_out',
+    'batch_music_behavior',
+    'current_language_code',
+    'effect_blend_mode',
+    'effect_blend_opacity',
+    'fade_out_duration',
+    'image_duration',
+    'music_volume',
+    'narration_volume',
+    'output_fps',
+    'output_renditions',
+    'resolution',
+    'subtitle_style',
+    'video_codec',
+)
+_FINAL_PASS_PARAM_PREFIXES = ('banner_', 'intro_', 'loudnorm_', 'music_concat_', 'png_overlay_', 'presenter_', 'slideshow_')
+# Chaves dos prefixos acima que só escolhem como o passe final é feito (cache, formato intermediário).
+_IMPLEMENTATION_PARAM_KEYS = (
+    'presenter_prerender_enabled',
+    'presenter_track_codec',
+)
+# Parâmetros que apontam para arquivos: entra a impressão digital, não o caminho.
+_FINAL_PASS_FILE_KEYS = (
+    'effect_overlay_path',
+    'png_overlay_path',
+    'presenter_video_path',
+    'subtitle_font_file',
+)
+
+
+def _relevant_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    relevant: Dict[str, Any] = {}
+    for key, value in params.items():
+        if key in _FINAL_PASS_FILE_KEYS:
+            relevant[key] = file_fingerprint(value) if value else None
+        elif key in _IMPLEMENTATION_PARAM_KEYS:
+            continue
+        elif key in _FINAL_PASS_PARAM_KEYS or key.startswith(_FINAL_PASS_PARAM_PREFIXES):
+            relevant[key] = value
+    return relevant
+
+
+def pool_fingerprint(paths: Iterable[Any], known: Optional[Mapping[str, str]] = None) -> str:
+    """Hash do conjunto ``paths``; ``known`` traz impressões já calculadas (ex.: pelo índice de pastas)."""
+
+    known = known or {}
+    fingerprints = (known.get(str(path)) or file_fingerprint(str(path)) for path in paths)
+    return stable_hash(sorted(fp for fp in fingerprints if fp))
+
+
+def render_fingerprint(
+    params: Dict[str, Any],
+    inputs: Iterable[Optional[str]],
+    asset_pools: Iterable[Union[str, Iterable[Any]]] = (),
+) -> str:
+    """Hash estável das entradas do item e dos parâmetros que afetam o passe final.
+
+    ``inputs`` são os arquivos próprios do item (narração, legenda). Os
+    ``asset_pools`` (vídeos, imagens e músicas sorteados) entram como conjunto:
+    o sorteio muda a cada execução, mas o resultado só é considerado obsoleto
+    quando o conteúdo das pastas muda. Um pool pode vir já resumido por
+    :func:`pool_fingerprint`, para não refazer o hash das pastas a cada item.
+    """
+
+    return stable_hash({
+        'version': _FINGERPRINT_VERSION,
+        'inputs': [file_fingerprint(path) if path else None for path in inputs],
+        'pools': [pool if isinstance(pool, str) else pool_fingerprint(pool) for pool in asset_pools],
+        'params': _relevant_params(params),
+    })
+
+
+def _sidecar_path(output_path: str) -> str:
+    return output_path + RENDER_SIDECAR_SUFFIX
+
+
+def read_render_sidecar(output_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_sidecar_path(output_path), 'r', encoding='utf-8') as src:
+            data = json.load(src)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_render_sidecar(output_path: str, fingerprint: str) -> None:
+    """Grava a impressão digital ao lado do vídeo, junto com o tamanho publicado."""
+
+    try:
+        payload = {'fingerprint': fingerprint, 'size': os.path.getsize(output_path)}
+        sidecar = _sidecar_path(output_path)
+        tmp_path = sidecar + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as dst:
+            json.dump(payload, dst)
+        os.replace(tmp_path, sidecar)
+    except OSError as exc:
+        logger.warning("Não foi possível gravar a impressão digital de '%s': %s", output_path, exc)
+
+
+def is_output_up_to_date(output_path: str, fingerprint: str) -> bool:
+    sidecar = read_render_sidecar(output_path)
+    if not sidecar or sidecar.get('fingerprint') != fingerprint:
+        return False
+    try:
+        return os.path.getsize(output_path) == sidecar.get('size')
+    except OSError:
+        return False
@@ -0,0 +1,206 @@
+"""Índice das pastas de entrada dos lotes, montado com ``os.scandir``."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cache import resolve_cache_dir, stable_hash, stat_fingerprint
+from .shared import logger
+
+__all__ = [
+    "NARRATION_EXTENSIONS",
+    "MUSIC_EXTENSIONS",
+    "VIDEO_EXTENSIONS",
+    "IMAGE_EXTENSIONS",
+    "SUBTITLE_EXTENSIONS",
+    "IndexedFile",
+    "FolderIndex",
+]
+
+NARRATION_EXTENSIONS = ('.mp3', '.wav', '.aac')
+MUSIC_EXTENSIONS = ('.mp3', '.wav', '.aac', '.flac', '.ogg')
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.mkv', '.avi', '.m4v')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+SUBTITLE_EXTENSIONS = ('.srt',)
+
+_KIND_BY_EXTENSION: Dict[str, str] = {
+    **{ext: 'audio' for ext in MUSIC_EXTENSIONS},
+    **{ext: 'video' for ext in VIDEO_EXTENSIONS},
+    **{ext: 'image' for ext in IMAGE_EXTENSIONS},
+    **{ext: 'subtitle' for ext in SUBTITLE_EXTENSIONS},
+}
+_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    """Arquivo de mídia encontrado na varredura, com o ``stat`` já lido."""
+
+    path: str
+    kind: str
+    size: int
+    mtime_ns: int
+    # ``False`` quando veio do índice persistido sem reler a pasta.
+    fresh: bool = True
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def stem(self) -> str:
+        return os.path.splitext(self.name)[0]
+
+    @property
+    def suffix(self) -> str:
+        return os.path.splitext(self.path)[1].lower()
+
+    @property
+    def fingerprint(self) -> str:
+        return stat_fingerprint(self.path, self.size, self.mtime_ns)
+
+
+def _scan_directory(directory: str, with_dir_mtimes: bool) -> Tuple[List[IndexedFile], List[Tuple[str, bool, Optional[int]]]]:
+    """Lê uma pasta; retorna os arquivos de mídia e ``(nome, é_link, mtime_ns)`` das subpastas."""
+
+    files: List[IndexedFile] = []
+    subdirs: List[Tuple[str, bool, Optional[int]]] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    mtime_ns = entry.stat().st_mtime_ns if with_dir_mtimes else None
+                    subdirs.append((entry.name, entry.is_symlink(), mtime_ns))
+                    continue
+                kind = _KIND_BY_EXTENSION.get(os.path.splitext(entry.name)[1].lower())
+                if kind is None or not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append(IndexedFile(entry.path, kind, stat.st_size, stat.st_mtime_ns))
+    return files, subdirs
+
+
+class FolderIndex:
+    """Arquivos de áudio, vídeo, imagem e legenda de uma pasta (opcionalmente recursiva).
+
+    Cada pasta é lida uma única vez com ``os.scandir``, aproveitando os tipos e
+    o ``stat`` que o sistema já devolve junto com a listagem. Com
+    ``params['folder_index_cache']`` o índice é guardado na pasta de cache e,
+    na próxima execução, só as pastas cujo ``mtime`` mudou são relidas.
+    """
+
+    def __init__(self, root: str, recursive: bool, files: Iterable[IndexedFile], subdirs: Iterable[str]) -> None:
+        self.root = root
+        self.recursive = recursive
+        self._files = sorted(files, key=lambda item: item.path)
+        self.subdirs = sorted(subdirs)
+        self._by_kind: Dict[str, List[IndexedFile]] = {}
+        self._lookup: Dict[str, Dict[Tuple[str, str], str]] = {}
+        for item in self._files:
+            self._by_kind.setdefault(item.kind, []).append(item)
+
+    @classmethod
+    def scan(cls, root: str, recursive: bool = False, params: Optional[Dict[str, Any]] = None) -> "FolderIndex":
+        """Indexa ``root``; ``OSError`` se a própria raiz não puder ser lida."""
+
+        root = os.path.abspath(root)
+        cache_path = cls._cache_path(root, recursive, params)
+        cached_dirs = cls._load_cache(cache_path, root, recursive) if cache_path else {}
+
+        dirs: Dict[str, Dict[str, Any]] = {}
+        files: List[IndexedFile] = []
+        pending: List[Tuple[str, Optional[int]]] = [(root, None)]
+        reused = 0
+        while pending:
+            directory, mtime_ns = pending.pop()
+            if mtime_ns is None and cache_path:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            cached = cached_dirs.get(directory)
+            if cached is not None and mtime_ns is not None and cached.get('mtime_ns') == mtime_ns:
+                dir_files = [IndexedFile(os.path.join(directory, name), kind, size, mtime, fresh=False) for name, kind, size, mtime in cached['files']]
+                # O ``mtime`` guardado das subpastas pode estar velho: cada uma é conferida ao ser visitada.
+                subdirs = [(name, is_link, None) for name, is_link, _mtime in cached['subdirs']]
+                reused += 1
+            else:
+                try:
+                    dir_files, subdirs = _scan_directory(directory, bool(cache_path and recursive))
+                except OSError:
+                    if directory == root:
+                        raise
+                    logger.warning("Não foi possível ler a pasta '%s'; ignorando.", directory)
+                    continue
+            files.extend(dir_files)
+            dirs[directory] = {
+                'mtime_ns': mtime_ns,
+                'files': [[item.name, item.kind, item.size, item.mtime_ns] for item in dir_files],
+                'subdirs': [list(subdir) for subdir in subdirs],
+            }
+            if recursive:
+                # Links simbólicos para pastas não são seguidos, evitando ciclos.
+                pending.extend((os.path.join(directory, name), sub_mtime) for name, is_link, sub_mtime in subdirs if not is_link)
+
+        if cache_path:
+            if reused:
+                logger.debug("Índice de '%s': %d de %d pasta(s) reaproveitadas do cache.", root, reused, len(dirs))
+            cls._save_cache(cache_path, root, recursive, dirs)
+        return cls(root, recursive, files, (name for name, _is_link, _mtime in dirs[root]['subdirs']))
+
+    @staticmethod
+    def _cache_path(root: str, recursive: bool, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        if not (params or {}).get('folder_index_cache'):
+            return None
+        try:
+            folder = resolve_cache_dir(params, 'folder-index')
+        except OSError as exc:
+            logger.warning("Índice de pastas persistente indisponível: %s", exc)
+            return None
+        return os.path.join(folder, f"{stable_hash([root, recursive])}.json")
+
+    @staticmethod
+    def _load_cache(cache_path: str, root: str, recursive: bool) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as src:
+                data = json.load(src)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != _INDEX_VERSION or data.get('root') != root or data.get('recursive') != recursive:
+            return {}
+        dirs = data.get('dirs')
+        return dirs if isinstance(dirs, dict) else {}
+
+    @staticmethod
+    def _save_cache(cache_path: str, root: str, recursive: bool, dirs: Dict[str, Dict[str, Any]]) -> None:
+        payload = {'version': _INDEX_VERSION, 'root': root, 'recursive': recursive, 'dirs': dirs}
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as dst:
+                json.dump(payload, dst, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as exc:
+            logger.warning("Não foi possível gravar o índice de '%s': %s", root, exc)
+
+    def files(self, kind: str, extensions: Optional[Tuple[str, ...]] = None) -> List[IndexedFile]:
+        items = self._by_kind.get(kind, [])
+        if extensions is None:
+            return list(items)
+        return [item for item in items if item.suffix in extensions]
+
+    def paths(self, kind: str, extensions: Optional[Tuple[str, ...]] = None) -> List[str]:
+        return [item.path for item in self.files(kind, extensions)]
+
+    def find(self, directory: str, stem: str, kind: str) -> Optional[str]:
+        """Caminho do arquivo ``kind`` chamado ``stem`` em ``directory`` (ex.: a legenda de uma narração)."""
+
+        if kind not in self._lookup:
+            self._lookup[kind] = {(os.path.dirname(item.path), item.stem): item.path for item in self._by_kind.get(kind, [])}
+        return self._lookup[kind].get((os.path.abspath(directory), stem))
+
+    def fingerprints(self) -> Dict[str, str]:
+        """Impressões digitais dos arquivos cujo ``stat`` foi lido nesta varredura."""
+
+        return {item.path: item.fingerprint for item in self._files if item.fresh}
@@ -0,0 +1,105 @@
+"""Single composite frames rendered with the real final-pass graph."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+from collections import OrderedDict
+from queue import Queue
+from typing import Any, Dict, Optional
+
+from .cache import stable_hash
+from .final_pass import _build_video_graph, _measure_timeline
+from .fingerprint import render_fingerprint
+from .preview import seek_inputs
+from .shared import capture_frame, logger
+
+__all__ = [
+    "FRAME_CACHE_SIZE",
+    "render_composite_frame",
+    "clear_frame_cache",
+]
+
+FRAME_CACHE_SIZE = 48
+
+# Sem pré-renderizações: o quadro sai das mídias originais, com o mesmo resultado visual.
+_FRAME_OVERRIDES = {
+    'effect_prerender_enabled': False,
+    'presenter_prerender_enabled': False,
+    'subtitle_prerender_enabled': False,
+    'subtitle_overlay_path': None,
+}
+
+_FRAME_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+_FRAME_CACHE_LOCK = threading.Lock()
+
+
+def clear_frame_cache() -> None:
+    with _FRAME_CACHE_LOCK:
+        _FRAME_CACHE.clear()
+
+
+def render_composite_frame(
+    params: Dict[str, Any],
+    base_video_path: str,
+    timestamp: float,
+    narration_path: Optional[str] = None,
+    subtitle_path: Optional[str] = None,
+    max_width: Optional[int] = None,
+    timeout: float = 30.0,
+) -> Optional[bytes]:
+    """PNG de um único quadro do vídeo final em ``timestamp`` segundos.
+
+    Monta o mesmo grafo de vídeo do passe final (base, efeito, apresentador,
+    logo PNG, faixa, fade-out e legendas) e decodifica só o necessário para
+    um quadro, que volta em memória. ``max_width`` reduz o quadro para a
+    tela. Os quadros ficam num cache LRU por entradas, configurações e
+    instante; retorna ``None`` se o FFmpeg falhar. O tempo é o do conteúdo,
+    sem a introdução digitada.
+    """
+
+    cache_key = stable_hash([
+        render_fingerprint(params, [base_video_path, narration_path, subtitle_path]),
+        round(max(0.0, float(timestamp)), 3),
+        max_width,
+    ])
+    with _FRAME_CACHE_LOCK:
+        cached = _FRAME_CACHE.get(cache_key)
+        if cached is not None:
+            _FRAME_CACHE.move_to_end(cache_key)
+            return cached
+
+    frame_params = {**params, **_FRAME_OVERRIDES}
+    messages: Queue = Queue()
+    cancel_event = threading.Event()
+    log_prefix = "Quadro"
+    with tempfile.TemporaryDirectory(prefix="frame_preview_") as temp_dir:
+        timeline = _measure_timeline(frame_params, base_video_path, narration_path, messages, log_prefix)
+        # O último quadro existe um pouco antes do fim: sem a margem o FFmpeg não gera nada.
+        timestamp = min(max(0.0, float(timestamp)), max(0.0, timeline.total_duration - 0.1))
+        graph = _build_video_graph(frame_params, base_video_path, timeline, subtitle_path, messages, cancel_event, temp_dir, log_prefix)
+
+        scale = f"scale=w='min(iw,{int(max_width)})':h=-2," if max_width else ""
+        filter_parts = [*graph.filter_parts, f"{graph.video_stream}{scale}format=rgb24[frame]"]
+        cmd = [
+            frame_params['ffmpeg_path'], '-hide_banner', '-nostats', '-v', 'error',
+            *seek_inputs(graph.inputs, graph.input_map, timestamp, frame_params['ffmpeg_path']),
+            '-filter_complex', ";".join(filter_parts),
+            '-map', '[frame]',
+            '-frames:v', '1',
+            '-an',
+            '-f', 'image2pipe',
+            '-c:v', 'png',
+            'pipe:1',
+        ]
+        logger.debug("[%s] Quadro em %.3fs: %s", log_prefix, timestamp, " ".join(cmd))
+        frame = capture_frame(cmd, timeout)
+
+    if frame is None:
+        return None
+    with _FRAME_CACHE_LOCK:
+        _FRAME_CACHE[cache_key] = frame
+        _FRAME_CACHE.move_to_end(cache_key)
+        while len(_FRAME_CACHE) > FRAME_CACHE_SIZE:
+            _FRAME_CACHE.popitem(last=False)
+    return frame
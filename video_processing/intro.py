@@ -15,6 +15,7 @@ from .shared import (
     _probe_media_properties,
     LANGUAGE_CODE_MAP,
     logger,
+    retry_policy_for,
 )
 
 __all__ = [
@@ -259,6 +260,7 @@ def _combine_intro_with_main(
             cancel_event,
             f"{log_prefix} (Intro Merge - {label})",
             progress_queue,
+            policy=retry_policy_for('intro', params),
         )
 
         if success or cancel_event.is_set():
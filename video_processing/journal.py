@@ -0,0 +1,124 @@
+"""Append-only job journal that lets an interrupted batch resume where it stopped."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .cache import file_fingerprint, stable_hash
+from .fingerprint import _relevant_params
+from .shared import logger
+
+__all__ = [
+    "JOURNAL_FILENAME",
+    "BatchJournal",
+    "_partial_output_path",
+    "_render_params_hash",
+]
+
+JOURNAL_FILENAME = ".kyle-editor-journal.jsonl"
+
+
+def _render_params_hash(params: Dict[str, Any]) -> str:
+    # Os mesmos parâmetros da impressão digital do passe final: uma só lista do que altera o vídeo.
+    return stable_hash(_relevant_params(params))
+
+
+def _partial_output_path(final_output_path: str) -> str:
+    """Nome temporário no mesmo diretório, preservando a extensão para o muxer."""
+
+    folder, filename = os.path.split(final_output_path)
+    stem, ext = os.path.splitext(filename)
+    return os.path.join(folder, f"{stem}.part{ext}")
+
+
+class BatchJournal:
+    """Diário JSON-lines guardado na pasta de saída do lote.
+
+    Cada linha registra o estado de um item (``started``, ``done`` ou
+    ``failed``) com a impressão digital das entradas e o hash dos parâmetros.
+    Ao reabrir o diário vale a última linha de cada saída; linhas truncadas
+    por uma queda no meio da escrita são ignoradas.
+    """
+
+    def __init__(self, path: str, params_key: str) -> None:
+        self.path = path
+        self.params_key = params_key
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def open(cls, params: Dict[str, Any]) -> Optional["BatchJournal"]:
+        if not params.get('batch_resume_enabled', True):
+            return None
+        output_folder = params.get('output_folder')
+        if not output_folder or not os.path.isdir(output_folder):
+            return None
+        return cls(os.path.join(output_folder, JOURNAL_FILENAME), _render_params_hash(params))
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as src:
+                for line in src:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict) and entry.get('output'):
+                        self._entries[entry['output']] = entry
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            logger.warning("Não foi possível ler o diário do lote '%s': %s", self.path, exc)
+
+    @staticmethod
+    def inputs_key(item: Any) -> str:
+        return stable_hash([
+            file_fingerprint(item.narration_path),
+            file_fingerprint(item.subtitle_path),
+            item.language_code,
+        ])
+
+    def output_path(self, item: Any) -> str:
+        return os.path.join(os.path.dirname(self.path), item.output_name)
+
+    def is_complete(self, item: Any) -> bool:
+        entry = self._entries.get(item.output_name)
+        if not entry or entry.get('status') != 'done':
+            return False
+        if entry.get('params') != self.params_key or entry.get('inputs') != self.inputs_key(item):
+            return False
+        try:
+            return os.path.getsize(self.output_path(item)) == entry.get('size')
+        except OSError:
+            return False
+
+    def record(self, item: Any, status: str) -> None:
+        entry: Dict[str, Any] = {
+            'output': item.output_name,
+            'status': status,
+            'inputs': self.inputs_key(item),
+            'params': self.params_key,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        if status == 'done':
+            try:
+                entry['size'] = os.path.getsize(self.output_path(item))
+            except OSError:
+                entry['status'] = 'failed'
+
+        line = json.dumps(entry, ensure_ascii=False, sort_keys=True)
+        with self._lock:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as dst:
+                    dst.write(line + "\n")
+                    dst.flush()
+                    os.fsync(dst.fileno())
+            except OSError as exc:
+                logger.warning("Não foi possível gravar no diário do lote '%s': %s", self.path, exc)
+                return
+            self._entries[item.output_name] = entry
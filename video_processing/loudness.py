@@ -0,0 +1,147 @@
+"""EBU R128 loudness normalization with measurements cached per file."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cache import cache_entry_lock, file_fingerprint, resolve_cache_dir
+from .shared import _probe_media_properties, logger, measure_loudness
+
+__all__ = [
+    "LoudnessMeasurement",
+    "loudness_enabled",
+    "loudness_targets",
+    "measure_cached",
+    "combine_measurements",
+    "loudnorm_filter",
+]
+
+DEFAULT_TARGET_I = -16.0
+DEFAULT_TARGET_TP = -1.5
+DEFAULT_TARGET_LRA = 11.0
+
+
+@dataclass(frozen=True)
+class LoudnessMeasurement:
+    """Resultado da primeira passagem do ``loudnorm`` para um arquivo."""
+
+    input_i: float
+    input_tp: float
+    input_lra: float
+    input_thresh: float
+    duration: float = 0.0
+
+
+def loudness_enabled(params: Dict[str, Any]) -> bool:
+    return bool(params.get('loudnorm_enabled'))
+
+
+def loudness_targets(params: Dict[str, Any]) -> Tuple[float, float, float]:
+    """``(I, TP, LRA)`` pedidos, limitados às faixas aceitas pelo ``loudnorm``."""
+
+    def read(key: str, default: float, low: float, high: float) -> float:
+        try:
+            value = float(params.get(key, default))
+        except (TypeError, ValueError):
+            value = default
+        return max(low, min(high, value))
+
+    return (
+        read('loudnorm_target_i', DEFAULT_TARGET_I, -70.0, -5.0),
+        read('loudnorm_target_tp', DEFAULT_TARGET_TP, -9.0, 0.0),
+        read('loudnorm_target_lra', DEFAULT_TARGET_LRA, 1.0, 50.0),
+    )
+
+
+def measure_cached(path: str, params: Dict[str, Any]) -> Optional[LoudnessMeasurement]:
+    """Mede ``path`` uma única vez; as medições ficam no cache pela impressão digital do arquivo.
+
+    Os valores ``input_*`` do ``loudnorm`` não dependem do alvo, por isso a
+    mesma medição serve para qualquer configuração de loudness.
+    """
+
+    fingerprint = file_fingerprint(path)
+    if not fingerprint:
+        return None
+    try:
+        cache_path = os.path.join(resolve_cache_dir(params, 'loudness'), f"{fingerprint}.json")
+    except OSError as exc:
+        logger.warning("Cache de loudness indisponível: %s", exc)
+        cache_path = None
+
+    with cache_entry_lock(f"loudness:{fingerprint}"):
+        if cache_path:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as src:
+                    return LoudnessMeasurement(**json.load(src))
+            except (OSError, ValueError, TypeError):
+                pass
+
+        target_i, target_tp, target_lra = loudness_targets(params)
+        values = measure_loudness(path, params['ffmpeg_path'], target_i, target_tp, target_lra)
+        if values is None:
+            return None
+        duration = 0.0
+        props = _probe_media_properties(path, params['ffmpeg_path'])
+        if props and 'format' in props and 'duration' in props['format']:
+            try:
+                duration = float(props['format']['duration'])
+            except (TypeError, ValueError):
+                duration = 0.0
+        measurement = LoudnessMeasurement(duration=duration, **values)
+
+        if cache_path:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as dst:
+                    json.dump(asdict(measurement), dst)
+                os.replace(tmp_path, cache_path)
+            except OSError as exc:
+                logger.warning("Não foi possível gravar a medição de loudness: %s", exc)
+        return measurement
+
+
+def _energy_mean(values: Iterable[Tuple[float, float]]) -> float:
+    pairs: List[Tuple[float, float]] = list(values)
+    total = sum(weight for _value, weight in pairs)
+    if total <= 0:
+        return max(value for value, _weight in pairs)
+    energy = sum(weight * 10 ** (value / 10) for value, weight in pairs) / total
+    return 10 * math.log10(energy)
+
+
+def combine_measurements(measurements: Iterable[Optional[LoudnessMeasurement]]) -> Optional[LoudnessMeasurement]:
+    """Aproxima a medição de uma playlist concatenada a partir das medições das faixas.
+
+    O loudness integrado é a média de energia ponderada pela duração; o pico e
+    a faixa de loudness usam o pior caso. Sem todas as medições retorna ``None``.
+    """
+
+    items = list(measurements)
+    if not items or any(item is None for item in items):
+        return None
+    if len(items) == 1:
+        return items[0]
+    return LoudnessMeasurement(
+        input_i=_energy_mean((item.input_i, item.duration) for item in items),
+        input_tp=max(item.input_tp for item in items),
+        input_lra=max(item.input_lra for item in items),
+        input_thresh=_energy_mean((item.input_thresh, item.duration) for item in items),
+        duration=sum(item.duration for item in items),
+    )
+
+
+def loudnorm_filter(measurement: LoudnessMeasurement, params: Dict[str, Any], sample_rate: int = 48000) -> str:
+    """Segunda passagem: normalização linear com os valores medidos."""
+
+    target_i, target_tp, target_lra = loudness_targets(params)
+    return (
+        f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}"
+        f":measured_I={measurement.input_i:.2f}:measured_TP={measurement.input_tp:.2f}"
+        f":measured_LRA={measurement.input_lra:.2f}:measured_thresh={measurement.input_thresh:.2f}"
+        f":linear=true:print_format=none,aresample={sample_rate}"
+    )
@@ -0,0 +1,276 @@
+"""Fail-fast validation of every batch item before any rendering starts."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from queue import Queue
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .fingerprint import write_render_sidecar
+from .shared import _probe_media_properties, logger
+from .utils import _iter_srt_cues
+
+__all__ = [
+    "BatchItemPlan",
+    "BatchPlan",
+    "BatchProgress",
+    "_run_preflight",
+]
+
+_DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class BatchItemPlan:
+    """Um item do lote já validado: durações, idioma e mídias escolhidas."""
+
+    index: int
+    name: str
+    narration_path: str
+    output_name: str = ""
+    subtitle_path: Optional[str] = None
+    language_code: Optional[str] = None
+    candidate_videos: Optional[List[str]] = None
+    base_video_path: Optional[str] = None
+    image_sequence: Optional[List[Any]] = None
+    music_playlist: Optional[List[str]] = None
+    narration_duration: float = 0.0
+    duration: float = 0.0
+    completed: bool = False
+    render_fingerprint: Optional[str] = None
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.problems
+
+
+@dataclass
+class BatchPlan:
+    items: List[BatchItemPlan]
+    playable_videos: Dict[str, bool] = field(default_factory=dict)
+    problems: List[str] = field(default_factory=list)
+    journal: Optional[Any] = None
+    output_folder: Optional[str] = None
+    media_durations: Dict[str, float] = field(default_factory=dict)
+    asset_seed: Optional[int] = None
+    item_limit: Optional[int] = None
+
+    @property
+    def valid_items(self) -> List[BatchItemPlan]:
+        return [item for item in self.items if item.valid]
+
+    @property
+    def pending_items(self) -> List[BatchItemPlan]:
+        """Itens válidos que ainda não constam como concluídos no diário.
+
+        Com ``item_limit`` (pré-visualização) só os primeiros são renderizados.
+        """
+
+        pending = [item for item in self.valid_items if not item.completed]
+        return pending if self.item_limit is None else pending[:self.item_limit]
+
+    @property
+    def total_duration(self) -> float:
+        return sum(item.duration for item in self.pending_items)
+
+    def record(self, item: BatchItemPlan, status: str) -> None:
+        if status == 'done' and item.render_fingerprint and self.output_folder:
+            write_render_sidecar(os.path.join(self.output_folder, item.output_name), item.render_fingerprint)
+        if self.journal is not None:
+            self.journal.record(item, status)
+
+    def playable(self, paths: Iterable[Any]) -> List[Any]:
+        return [path for path in paths if self.playable_videos.get(str(path), False)]
+
+    def required_assets(self) -> Set[str]:
+        """Vídeos, imagens e músicas que os itens pendentes vão usar, já sorteados."""
+
+        required: Set[str] = set()
+        for item in self.pending_items:
+            if item.base_video_path:
+                required.add(str(item.base_video_path))
+            required.update(str(path) for path in item.image_sequence or [])
+            required.update(item.music_playlist or [])
+        return required
+
+    def report(self, progress_queue: Queue, log_prefix: str) -> None:
+        for problem in self.problems:
+            progress_queue.put(("status", f"[{log_prefix}] {problem}", "warning"))
+        for item in self.items:
+            for problem in item.problems:
+                progress_queue.put(("status", f"[{log_prefix}] {item.name}: {problem}", "error"))
+
+        skipped = len(self.items) - len(self.valid_items)
+        completed = sum(1 for item in self.valid_items if item.completed)
+        summary = (
+            f"[{log_prefix}] Verificação prévia: {len(self.valid_items)}/{len(self.items)} itens válidos, "
+            f"{_format_duration(self.total_duration)} de vídeo a renderizar."
+        )
+        if completed:
+            summary += f" {completed} item(ns) já concluídos em execução anterior serão mantidos."
+        if skipped:
+            summary += f" {skipped} item(ns) serão pulados."
+        if self.item_limit is not None:
+            summary += f" Pré-visualização: apenas {len(self.pending_items)} item(ns) serão renderizados."
+        progress_queue.put(("status", summary, "warning" if skipped else "info"))
+
+
+class BatchProgress:
+    """Progresso do lote ponderado pela duração de cada item, com ETA.
+
+    A ETA usa o tempo de renderização por segundo de vídeo observado até agora,
+    aplicado à duração que ainda falta — bem mais fiel do que contar itens
+    quando as narrações têm tamanhos muito diferentes.
+    """
+
+    def __init__(self, plan: BatchPlan, progress_queue: Queue, clock: Callable[[], float] = time.monotonic) -> None:
+        self.total = plan.total_duration
+        self.done = 0.0
+        self.progress_queue = progress_queue
+        self._clock = clock
+        self._started_at = clock()
+
+    def _fraction(self) -> float:
+        if self.total <= 0:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+    def item_started(self, item: BatchItemPlan) -> None:
+        self.progress_queue.put(("batch_progress", self._fraction()))
+
+    def item_finished(self, item: BatchItemPlan, log_prefix: str) -> None:
+        self.done += item.duration
+        self.progress_queue.put(("batch_progress", self._fraction()))
+
+        remaining = max(0.0, self.total - self.done)
+        elapsed = self._clock() - self._started_at
+        if self.done <= 0 or remaining <= 0:
+            return
+        eta = elapsed / self.done * remaining
+        self.progress_queue.put((
+            "status",
+            f"[{log_prefix}] Restam {_format_duration(remaining)} de vídeo; término estimado em {_format_duration(eta)}.",
+            "info",
+        ))
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(round(max(0.0, seconds)))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+    return f"{minutes}m{secs:02d}s"
+
+
+def _media_duration(props: Optional[Dict[str, Any]]) -> Optional[float]:
+    try:
+        duration = float(((props or {}).get('format') or {}).get('duration'))
+    except (TypeError, ValueError):
+        return None
+    return duration if duration > 0 else None
+
+
+def _has_stream(props: Optional[Dict[str, Any]], codec_type: str) -> bool:
+    return any(stream.get('codec_type') == codec_type for stream in (props or {}).get('streams') or [])
+
+
+def _subtitle_problem(subtitle_path: str) -> Optional[str]:
+    try:
+        with open(subtitle_path, 'r', encoding='utf-8-sig', errors='replace') as src:
+            has_cues = next(_iter_srt_cues(src), None) is not None
+    except OSError as exc:
+        return f"legenda ilegível ({exc})."
+    if not has_cues:
+        return f"legenda '{os.path.basename(subtitle_path)}' sem falas válidas."
+    return None
+
+
+def _run_preflight(
+    items: List[BatchItemPlan],
+    params: Dict[str, Any],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+    tail_extension: Callable[[float], float] = lambda duration: duration,
+    choose_video: Optional[Callable[[BatchItemPlan, List[str]], str]] = None,
+    extra_videos: Iterable[Any] = (),
+    extra_audio: Iterable[Any] = (),
+) -> BatchPlan:
+    """Sonda narrações, vídeos base, músicas e legendas em paralelo e monta o plano.
+
+    Cada arquivo é sondado uma única vez, mesmo quando vários itens partilham
+    a mesma pasta de vídeos. Itens com qualquer problema ficam fora de
+    :attr:`BatchPlan.valid_items` e todos os problemas são reportados de uma vez.
+    As durações lidas ficam em :attr:`BatchPlan.media_durations`.
+    """
+
+    plan = BatchPlan(items=items)
+    ffmpeg_path = params['ffmpeg_path']
+    narrations = {item.narration_path for item in items if item.valid}
+    videos = {str(path) for path in extra_videos}
+    for item in items:
+        if item.valid and item.candidate_videos:
+            videos.update(item.candidate_videos)
+    subtitles = {item.subtitle_path for item in items if item.valid and item.subtitle_path}
+    music = {str(path) for path in extra_audio}
+
+    max_workers = max(1, int(params.get('preflight_workers') or _DEFAULT_MAX_WORKERS))
+    music_note = f", {len(music)} músicas" if music else ""
+    progress_queue.put((
+        "status",
+        f"[{log_prefix}] Verificando {len(narrations)} narrações, {len(videos)} vídeos{music_note} e {len(subtitles)} legendas...",
+        "info",
+    ))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preflight") as pool:
+        probe_futures = {path: pool.submit(_probe_media_properties, path, ffmpeg_path) for path in narrations | videos | music}
+        subtitle_futures = {path: pool.submit(_subtitle_problem, path) for path in subtitles}
+        probes = {}
+        for path, future in probe_futures.items():
+            if cancel_event.is_set():
+                pool.shutdown(wait=False, cancel_futures=True)
+                return plan
+            probes[path] = future.result()
+        subtitle_problems = {path: future.result() for path, future in subtitle_futures.items()}
+
+    for path, props in probes.items():
+        duration = _media_duration(props)
+        if duration is not None:
+            plan.media_durations[path] = duration
+
+    for path in sorted(videos):
+        ok = _has_stream(probes.get(path), 'video')
+        plan.playable_videos[path] = ok
+        if not ok:
+            plan.problems.append(f"Vídeo base ignorado (sem faixa de vídeo ou ilegível): {os.path.basename(path)}")
+
+    for item in items:
+        if not item.valid:
+            continue
+        duration = _media_duration(probes.get(item.narration_path))
+        if duration is None:
+            item.problems.append("não foi possível ler a duração da narração.")
+        else:
+            item.narration_duration = duration
+            item.duration = tail_extension(duration)
+
+        if item.subtitle_path and subtitle_problems.get(item.subtitle_path):
+            item.problems.append(subtitle_problems[item.subtitle_path])
+
+        if item.candidate_videos is not None:
+            usable = plan.playable(item.candidate_videos)
+            if not usable:
+                item.problems.append("nenhum vídeo base utilizável.")
+            elif item.valid and choose_video is not None:
+                item.base_video_path = choose_video(item, usable)
+
+    logger.info(
+        "[%s] Pré-verificação: %d/%d itens válidos, %.1fs no total.",
+        log_prefix, len(plan.valid_items), len(items), plan.total_duration,
+    )
+    return plan
@@ -0,0 +1,148 @@
+"""Pre-processing of the presenter clip into a cached, keyed alpha track."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from queue import Queue
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import cache_entry_lock, file_fingerprint, resolve_cache_dir, stable_hash
+from .shared import _execute_ffmpeg, _probe_media_properties, logger, retry_policy_for
+
+__all__ = [
+    "PRESENTER_TRACK_CODECS",
+    "_presenter_overlay_position",
+    "_chroma_key_settings",
+    "_presenter_filter",
+    "_presenter_prerender_enabled",
+    "_prerender_presenter_track",
+]
+
+# Codecs com canal alpha; ProRes 4444 decodifica rápido e mantém a suavização do chroma key.
+PRESENTER_TRACK_CODECS: Dict[str, Tuple[List[str], str]] = {
+    'prores': (['-c:v', 'prores_ks', '-profile:v', '4444', '-pix_fmt', 'yuva444p10le'], '.mov'),
+    'qtrle': (['-c:v', 'qtrle', '-pix_fmt', 'argb'], '.mov'),
+    'vp9': (['-c:v', 'libvpx-vp9', '-pix_fmt', 'yuva420p', '-b:v', '0', '-crf', '30', '-row-mt', '1'], '.webm'),
+}
+
+_PRESENTER_X = {'Inferior Esquerdo': '10', 'Inferior Central': '(W-w)/2', 'Inferior Direito': 'W-w-10'}
+
+
+def _presenter_overlay_position(params: Dict[str, Any]) -> str:
+    pos_x = _PRESENTER_X.get(params.get('presenter_position', 'Inferior Central'), '(W-w)/2')
+    return f"{pos_x}:H-h"
+
+
+def _presenter_target_height(params: Dict[str, Any], resolution: Tuple[int, int]) -> int:
+    scale = float(params.get('presenter_scale', 0.40))
+    return int(resolution[1] * scale)
+
+
+def _chroma_key_settings(params: Dict[str, Any]) -> Tuple[str, float, float]:
+    """Cor, similaridade e suavização do ``chromakey``, a partir dos controles (0–1) da interface."""
+
+    chroma_hex = params.get('presenter_chroma_color', '#00FF00').replace('#', '0x')
+    raw_sim = float(params.get('presenter_chroma_similarity', 0.20))
+    raw_smth = float(params.get('presenter_chroma_blend', 0.10))
+    raw_sim = max(0.0, min(raw_sim, 1.0))
+    raw_smth = max(0.0, min(raw_smth, 1.0))
+    sim = 0.05 + 0.45 * raw_sim
+    smth = 0.02 + 0.28 * raw_smth
+    return chroma_hex, sim, smth
+
+
+def _presenter_filter(params: Dict[str, Any], resolution: Tuple[int, int]) -> str:
+    """Escala (e aplica o chroma key, se ativo) ao vídeo do apresentador."""
+
+    target_h = _presenter_target_height(params, resolution)
+    if not params.get('presenter_chroma_enabled'):
+        return f"scale=w=-1:h={target_h}"
+
+    chroma_hex, sim, smth = _chroma_key_settings(params)
+    return f"scale=w=-1:h={target_h},format=rgba,chromakey={chroma_hex}:{sim}:{smth}"
+
+
+def _presenter_prerender_enabled(params: Dict[str, Any]) -> bool:
+    return bool(params.get('presenter_chroma_enabled')) and bool(params.get('presenter_prerender_enabled', True))
+
+
+def _prerender_presenter_track(
+    params: Dict[str, Any],
+    resolution: Tuple[int, int],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+) -> Optional[str]:
+    """Renderiza o apresentador já escalado e sem fundo numa faixa com alpha.
+
+    A faixa cobre uma volta do vídeo original e é reutilizada a partir do
+    cache enquanto o arquivo, a escala, as opções de chroma key e a resolução
+    forem os mesmos; o passe final só a repete e sobrepõe. A faixa mantém a
+    cadência do vídeo original, como o apresentador aplicado no próprio passe
+    final, e o ``overlay`` a sincroniza com o vídeo base. Retorna
+    ``None`` quando a pré-renderização está desativada ou falha, para que o
+    chamador aplique o chroma key no próprio passe final.
+    """
+
+    source_path = params.get('presenter_video_path')
+    if not _presenter_prerender_enabled(params) or not source_path or not os.path.isfile(source_path):
+        return None
+
+    codec = str(params.get('presenter_track_codec') or 'prores').lower()
+    codec_args, extension = PRESENTER_TRACK_CODECS.get(codec, PRESENTER_TRACK_CODECS['prores'])
+    presenter_filter = _presenter_filter(params, resolution)
+
+    cache_key = stable_hash([
+        file_fingerprint(source_path),
+        presenter_filter,
+        list(resolution),
+        codec_args,
+    ])
+    track_dir = resolve_cache_dir(params, 'presenter_tracks')
+    output_path = os.path.join(track_dir, f"presenter_{Path(source_path).stem}_{cache_key[:16]}{extension}")
+
+    with cache_entry_lock(cache_key):
+        if os.path.isfile(output_path):
+            logger.info("[%s] Reutilizando apresentador pré-processado: %s", log_prefix, output_path)
+            return output_path
+
+        duration = 0.0
+        props = _probe_media_properties(source_path, params['ffmpeg_path'])
+        if props and 'format' in props and 'duration' in props['format']:
+            try:
+                duration = float(props['format']['duration'])
+            except (TypeError, ValueError):
+                duration = 0.0
+
+        partial_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.part"
+        cmd = [
+            params['ffmpeg_path'], '-y',
+            '-i', source_path,
+            '-vf', presenter_filter,
+            '-an',
+            *codec_args,
+            '-f', 'webm' if extension == '.webm' else 'mov',
+            partial_path,
+        ]
+
+        progress_queue.put(("status", f"[{log_prefix}] Pré-processando apresentador (chroma key)...", "info"))
+        success = _execute_ffmpeg(
+            cmd,
+            duration,
+            None,
+            cancel_event,
+            f"{log_prefix} (Apresentador)",
+            progress_queue,
+            policy=retry_policy_for('presenter', params),
+        )
+        if not success or not os.path.isfile(partial_path):
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            return None
+
+        os.replace(partial_path, output_path)
+        return output_path
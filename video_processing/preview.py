@@ -0,0 +1,196 @@
+"""Low-resolution proxy renders of the real final-pass graph."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from queue import Queue
+from typing import Any, Dict, List, Optional, Tuple
+
+from .shared import _execute_ffmpeg, _probe_media_properties, retry_policy_for
+from .utils import _parse_resolution
+
+__all__ = [
+    "PREVIEW_CODEC_ARGS",
+    "preview_enabled",
+    "preview_params",
+    "preview_windows",
+    "preview_output_filename",
+    "seek_inputs",
+    "rebase_preview_streams",
+    "join_preview_windows",
+]
+
+PREVIEW_CODEC_ARGS = ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '30', '-tune', 'fastdecode', '-pix_fmt', 'yuv420p']
+DEFAULT_PREVIEW_HEIGHT = 360
+DEFAULT_PREVIEW_FPS = 12
+DEFAULT_PREVIEW_HEAD_SECONDS = 30.0
+DEFAULT_PREVIEW_TAIL_SECONDS = 12.0
+
+# Opções de lote que não fazem sentido numa pré-visualização descartável e
+# pré-renderizações que cobririam o vídeo inteiro, não só os trechos.
+_PREVIEW_OVERRIDES = {
+    'output_renditions': None,
+    'batch_resume_enabled': False,
+    'skip_unchanged_outputs': False,
+    'work_queue_folder': '',
+    'effect_prerender_enabled': False,
+    'presenter_prerender_enabled': False,
+    'subtitle_prerender_enabled': False,
+    'subtitle_overlay_path': None,
+    'audio_premix_enabled': False,
+    'loudnorm_enabled': False,
+    'slideshow_preset': 'ultrafast',
+}
+# Entradas com a linha do tempo do vídeo final (procuradas no início do trecho) e entradas em laço.
+_TIMELINE_INPUTS = ('main_video', 'subtitles', 'audio_mix', 'narration', 'music')
+_LOOPED_INPUTS = ('effect', 'presenter')
+
+
+def preview_enabled(params: Dict[str, Any]) -> bool:
+    return bool(params.get('render_preview'))
+
+
+def _number(params: Dict[str, Any], key: str, default: float) -> float:
+    try:
+        value = float(params.get(key) or default)
+    except (TypeError, ValueError):
+        value = default
+    return value if value > 0 else default
+
+
+def preview_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Cópia de ``params`` para a pré-visualização: resolução reduzida e menos quadros.
+
+    A proporção da saída é mantida (altura ``preview_height``, 360 por padrão);
+    o restante da configuração — sobreposições, faixa, apresentador,
+    legendas — é o mesmo da renderização completa. As pré-renderizações de
+    duração total ficam desligadas (o filtro equivalente roda só nos trechos),
+    assim como a normalização de loudness, que depende da pré-mixagem.
+    """
+
+    width, height = _parse_resolution(params.get('resolution', ''))
+    target_h = int(min(height, _number(params, 'preview_height', DEFAULT_PREVIEW_HEIGHT)))
+    target_w = int(round(width * target_h / height))
+    target_w, target_h = max(2, target_w - target_w % 2), max(2, target_h - target_h % 2)
+    fps = min(float(params.get('output_fps') or 30), _number(params, 'preview_fps', DEFAULT_PREVIEW_FPS))
+    return {
+        **params,
+        **_PREVIEW_OVERRIDES,
+        'render_preview': True,
+        'resolution': f"{target_w}x{target_h}",
+        'output_fps': fps,
+        'slideshow_fps': fps,
+    }
+
+
+def preview_windows(total_duration: float, params: Dict[str, Any]) -> List[Tuple[float, float]]:
+    """Trechos renderizados: o início e uma amostra final, que inclui o fade-out."""
+
+    head = _number(params, 'preview_head_seconds', DEFAULT_PREVIEW_HEAD_SECONDS)
+    tail = _number(params, 'preview_tail_seconds', DEFAULT_PREVIEW_TAIL_SECONDS)
+    if total_duration <= head + tail:
+        return [(0.0, max(0.0, total_duration))]
+    return [(0.0, head), (total_duration - tail, total_duration)]
+
+
+def preview_output_filename(filename: str) -> str:
+    path = Path(filename)
+    return f"{path.stem}_preview{path.suffix or '.mp4'}"
+
+
+def _media_duration(path: str, ffmpeg_path: str) -> float:
+    props = _probe_media_properties(path, ffmpeg_path)
+    try:
+        return float(props['format']['duration']) if props else 0.0
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def seek_inputs(inputs: List[str], input_map: Dict[str, int], timestamp: float, ffmpeg_path: str) -> List[str]:
+    """Insere ``-ss``/``-itsoffset`` antes de cada ``-i`` do grafo.
+
+    O ``-ss`` de entrada salta direto para o quadro-chave mais próximo, sem
+    decodificar o início; o ``-itsoffset`` devolve aos quadros o tempo
+    original, para que fade, faixa e legendas avaliem ``t`` como no vídeo final.
+    """
+
+    roles = {index: role for role, index in input_map.items()}
+    seeked: List[str] = []
+    index = 0
+    position = 0
+    while position < len(inputs):
+        arg = inputs[position]
+        if arg != '-i':
+            seeked.append(arg)
+            position += 1
+            continue
+        path = inputs[position + 1]
+        role = roles.get(index)
+        offset = 0.0
+        if role in _TIMELINE_INPUTS:
+            offset = timestamp
+        elif role in _LOOPED_INPUTS:
+            duration = _media_duration(path, ffmpeg_path)
+            offset = timestamp % duration if duration > 0 else 0.0
+        if offset > 0:
+            seeked.extend(['-ss', f"{offset:.3f}"])
+        if timestamp > 0:
+            seeked.extend(['-itsoffset', f"{timestamp:.3f}"])
+        seeked.extend(['-i', path])
+        index += 1
+        position += 2
+    return seeked
+
+
+def rebase_preview_streams(
+    filter_parts: List[str],
+    video_stream: str,
+    audio_stream: Optional[str],
+    fps: float,
+) -> Tuple[str, Optional[str]]:
+    """Reduz o FPS e leva o início de cada trecho para zero no fim do grafo.
+
+    As entradas já chegam procuradas com :func:`seek_inputs`, no tempo
+    original; o grafo inteiro avalia ``t`` como no vídeo final e só a saída é
+    re-cronometrada, com áudio e vídeo juntos.
+    """
+
+    filter_parts.append(f"{video_stream}fps={fps:g},setpts=PTS-STARTPTS[v_preview]")
+    if audio_stream:
+        filter_parts.append(f"{audio_stream}asetpts=PTS-STARTPTS[a_preview]")
+        audio_stream = "[a_preview]"
+    return "[v_preview]", audio_stream
+
+
+def join_preview_windows(
+    params: Dict[str, Any],
+    segments: List[str],
+    output_path: str,
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+) -> bool:
+    """Junta os trechos renderizados por cópia direta; os segmentos são removidos em seguida."""
+
+    list_path = f"{os.path.splitext(output_path)[0]}.windows.txt"
+    try:
+        with open(list_path, 'w', encoding='utf-8') as fp:
+            for segment in segments:
+                escaped = Path(segment).as_posix().replace("'", "'\\''")
+                fp.write(f"file '{escaped}'\n")
+        cmd = [
+            params['ffmpeg_path'], '-y', '-f', 'concat', '-safe', '0', '-i', list_path,
+            '-map', '0', '-c', 'copy', '-movflags', '+faststart', output_path,
+        ]
+        return _execute_ffmpeg(
+            cmd, 1, None, cancel_event, f"{log_prefix} (Junção da pré-visualização)", progress_queue,
+            policy=retry_policy_for('final', params),
+        )
+    finally:
+        for path in (list_path, *segments):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,117 @@
+"""Extra output renditions rendered from the same final-pass graph."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .shared import logger
+
+__all__ = [
+    "OutputRendition",
+    "parse_renditions",
+]
+
+_SPEC_RE = re.compile(r"^\s*(\d+)\s*x\s*(\d+)\s*(?:@\s*([\d.]+[kKmM]?))?\s*(?::\s*(\S+))?\s*$")
+_RATE_RE = re.compile(r"^([\d.]+)([kKmM]?)$")
+
+
+def _double_rate(rate: str) -> str:
+    match = _RATE_RE.match(rate)
+    if not match:
+        return rate
+    value = float(match.group(1)) * 2
+    return f"{value:g}{match.group(2)}"
+
+
+@dataclass(frozen=True)
+class OutputRendition:
+    """Versão adicional de um item: outra resolução e, opcionalmente, um teto de bitrate.
+
+    Quando a proporção difere da saída principal (ex.: um corte vertical), o
+    quadro é ampliado até cobrir a nova resolução e recortado no centro.
+    """
+
+    width: int
+    height: int
+    suffix: str
+    video_bitrate: Optional[str] = None
+    audio_bitrate: str = '192k'
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    def output_filename(self, filename: str) -> str:
+        path = Path(filename)
+        return f"{path.stem}{self.suffix}{path.suffix or '.mp4'}"
+
+    def scale_filter(self, source: Tuple[int, int]) -> str:
+        source_w, source_h = source
+        if source_w * self.height == source_h * self.width:
+            return f"scale={self.width}:{self.height},setsar=1"
+        return (
+            f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,"
+            f"crop={self.width}:{self.height},setsar=1"
+        )
+
+    def rate_args(self) -> List[str]:
+        if not self.video_bitrate:
+            return []
+        return ['-maxrate', self.video_bitrate, '-bufsize', _double_rate(self.video_bitrate)]
+
+
+def _from_entry(entry: Any) -> Optional[OutputRendition]:
+    if isinstance(entry, dict):
+        resolution = str(entry.get('resolution') or '')
+        bitrate = entry.get('video_bitrate')
+        spec = f"{resolution}@{bitrate}" if bitrate else resolution
+        if entry.get('suffix'):
+            spec = f"{spec}:{entry['suffix']}"
+        rendition = _from_entry(spec)
+        if rendition and entry.get('audio_bitrate'):
+            rendition = OutputRendition(rendition.width, rendition.height, rendition.suffix, rendition.video_bitrate, str(entry['audio_bitrate']))
+        return rendition
+
+    match = _SPEC_RE.match(str(entry))
+    if not match:
+        return None
+    width, height = int(match.group(1)), int(match.group(2))
+    if width <= 0 or height <= 0:
+        return None
+    # Encoders H.264/HEVC exigem dimensões pares.
+    width, height = width - width % 2, height - height % 2
+    suffix = match.group(4) or f"_{width}x{height}"
+    return OutputRendition(width, height, suffix, match.group(3))
+
+
+def parse_renditions(params: Dict[str, Any], primary: Optional[Tuple[int, int]] = None) -> List[OutputRendition]:
+    """Versões pedidas em ``params['output_renditions']``, além da saída principal.
+
+    Aceita uma lista de dicts (``resolution``, ``video_bitrate``, ``suffix``,
+    ``audio_bitrate``) ou um texto como ``"1280x720@4M, 1080x1920:_vertical"``.
+    Entradas inválidas, repetidas ou iguais à saída principal são ignoradas.
+    """
+
+    raw = params.get('output_renditions')
+    if not raw:
+        return []
+    entries = [part for part in raw.split(',') if part.strip()] if isinstance(raw, str) else list(raw)
+
+    renditions: List[OutputRendition] = []
+    seen = set()
+    for entry in entries:
+        rendition = _from_entry(entry)
+        if rendition is None:
+            logger.warning("Versão de saída inválida ignorada: %r", entry)
+            continue
+        if rendition.resolution == primary and not rendition.video_bitrate:
+            continue
+        if rendition.suffix in seen:
+            logger.warning("Versão de saída com sufixo repetido ignorada: %r", entry)
+            continue
+        seen.add(rendition.suffix)
+        renditions.append(rendition)
+    return renditions
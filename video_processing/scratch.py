@@ -0,0 +1,193 @@
+"""Scratch-space management for the temporary files of a render batch."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .shared import logger
+
+__all__ = [
+    "ScratchSpace",
+    "DEFAULT_MIN_FREE_MB",
+    "_estimate_video_bytes",
+    "_estimate_audio_bytes",
+]
+
+DEFAULT_MIN_FREE_MB = 512
+
+# Estimativas conservadoras para o H.264 intermediário (libx264, CRF ~20) e
+# para o AAC das músicas concatenadas. Só servem para decidir se a etapa cabe
+# no disco de rascunho; não precisam ser exatas.
+_VIDEO_BITS_PER_PIXEL = 0.12
+_AUDIO_BITRATE_BPS = 192_000
+_ESTIMATE_HEADROOM = 1.25
+
+
+def _estimate_video_bytes(duration: float, resolution: Tuple[int, int], fps: float = 30.0) -> int:
+    width, height = resolution
+    try:
+        seconds = max(0.0, float(duration))
+    except (TypeError, ValueError):
+        seconds = 0.0
+    bits = width * height * max(1.0, float(fps or 30)) * _VIDEO_BITS_PER_PIXEL * seconds
+    return int(bits / 8 * _ESTIMATE_HEADROOM)
+
+
+def _estimate_audio_bytes(duration: float) -> int:
+    try:
+        seconds = max(0.0, float(duration))
+    except (TypeError, ValueError):
+        seconds = 0.0
+    return int(_AUDIO_BITRATE_BPS * seconds / 8 * _ESTIMATE_HEADROOM)
+
+
+def _parse_megabytes(value: Any) -> Optional[int]:
+    try:
+        megabytes = float(value)
+    except (TypeError, ValueError):
+        return None
+    if megabytes <= 0:
+        return None
+    return int(megabytes * 1024 * 1024)
+
+
+class ScratchSpace:
+    """Pasta de rascunho de um lote, com cota e verificação de espaço livre.
+
+    A raiz vem de ``params['scratch_folder']`` (por exemplo ``/dev/shm`` ou um
+    NVMe rápido) e cai para o diretório temporário do sistema quando não está
+    definida ou não existe. Cada item do lote recebe uma subpasta própria,
+    apagada assim que o item termina, e :meth:`ensure_space` é consultado antes
+    de cada etapa que grava arquivos grandes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        quota_bytes: Optional[int] = None,
+        min_free_bytes: int = DEFAULT_MIN_FREE_MB * 1024 * 1024,
+        owned: bool = False,
+    ) -> None:
+        self.path = path
+        self.quota_bytes = quota_bytes
+        self.min_free_bytes = max(0, int(min_free_bytes))
+        self.owned = owned
+        self._item_dirs: List[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _limits_from_params(params: Optional[Dict[str, Any]]) -> Tuple[Optional[int], int]:
+        params = params or {}
+        quota = _parse_megabytes(params.get('scratch_quota_mb'))
+        min_free = _parse_megabytes(params.get('scratch_min_free_mb', DEFAULT_MIN_FREE_MB))
+        return quota, (min_free if min_free is not None else 0)
+
+    @classmethod
+    def create(cls, params: Optional[Dict[str, Any]], prefix: str = "kyle-editor-") -> "ScratchSpace":
+        """Cria a pasta do lote dentro da raiz configurada."""
+
+        root = (params or {}).get('scratch_folder') or None
+        if root and not os.path.isdir(root):
+            logger.warning("Pasta de rascunho '%s' não encontrada; usando o diretório temporário do sistema.", root)
+            root = None
+        quota, min_free = cls._limits_from_params(params)
+        path = tempfile.mkdtemp(prefix=prefix, dir=root)
+        logger.info("Pasta de rascunho do lote: %s", path)
+        return cls(path, quota_bytes=quota, min_free_bytes=min_free, owned=True)
+
+    @classmethod
+    def attach(cls, path: str, params: Optional[Dict[str, Any]] = None) -> "ScratchSpace":
+        """Envolve uma pasta já existente sem assumir a sua remoção."""
+
+        quota, min_free = cls._limits_from_params(params)
+        return cls(path, quota_bytes=quota, min_free_bytes=min_free, owned=False)
+
+    def usage_bytes(self) -> int:
+        total = 0
+        stack = [self.path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            else:
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return total
+
+    def free_bytes(self) -> Optional[int]:
+        try:
+            return shutil.disk_usage(self.path).free
+        except OSError:
+            return None
+
+    def check_space(self, required_bytes: int) -> Optional[str]:
+        """Retorna o motivo da falta de espaço, ou ``None`` se a etapa cabe."""
+
+        required = max(0, int(required_bytes))
+        free = self.free_bytes()
+        if free is not None and free - required < self.min_free_bytes:
+            return (
+                f"espaço livre insuficiente em {self.path} "
+                f"({free / 1048576:.0f} MB livres, {required / 1048576:.0f} MB necessários "
+                f"+ {self.min_free_bytes / 1048576:.0f} MB de margem)"
+            )
+        if self.quota_bytes is not None:
+            used = self.usage_bytes()
+            if used + required > self.quota_bytes:
+                return (
+                    f"cota da pasta de rascunho excedida "
+                    f"({used / 1048576:.0f} MB usados + {required / 1048576:.0f} MB "
+                    f"> {self.quota_bytes / 1048576:.0f} MB)"
+                )
+        return None
+
+    def ensure_space(self, required_bytes: int, stage: str, progress_queue=None, log_prefix: str = "") -> bool:
+        """Verifica o espaço antes de ``stage`` e reporta o motivo quando falta."""
+
+        problem = self.check_space(required_bytes)
+        if not problem:
+            return True
+
+        message = f"[{log_prefix}] Etapa '{stage}' ignorada: {problem}."
+        logger.error(message)
+        if progress_queue is not None:
+            progress_queue.put(("status", message, "error"))
+        return False
+
+    def new_item_dir(self, prefix: str) -> str:
+        path = tempfile.mkdtemp(prefix=prefix, dir=self.path)
+        with self._lock:
+            self._item_dirs.append(path)
+        return path
+
+    def release(self, path: Optional[str]) -> None:
+        if not path:
+            return
+        shutil.rmtree(path, ignore_errors=True)
+        with self._lock:
+            if path in self._item_dirs:
+                self._item_dirs.remove(path)
+
+    def release_items(self) -> None:
+        """Apaga as subpastas de itens que ainda não foram liberadas."""
+
+        with self._lock:
+            stale = list(self._item_dirs)
+        for path in stale:
+            self.release(path)
+
+    def cleanup(self) -> None:
+        self.release_items()
+        if self.owned:
+            shutil.rmtree(self.path, ignore_errors=True)
@@ -8,11 +8,15 @@ from typing import Any, Callable, Dict, IO, List, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFile, ImageFont
 
 from processing.ffmpeg_pipeline import (
+    capture_frame,
     escape_ffmpeg_path,
     execute_ffmpeg,
     get_codec_params,
+    measure_loudness,
     probe_media_properties,
 )
+from processing.process_manager import process_manager
+from processing.retry import retry_policy_for
 from processing.language_utils import (
     LANGUAGE_ALIASES,
     LANGUAGE_CODE_MAP,
@@ -45,6 +49,10 @@ _get_codec_params = get_codec_params
 __all__ = [
     "LOGGER_NAME",
     "logger",
+    "process_manager",
+    "retry_policy_for",
+    "measure_loudness",
+    "capture_frame",
     "Image",
     "ImageDraw",
     "ImageFile",
@@ -0,0 +1,198 @@
+"""Pre-rendering of styled subtitles into a transparent overlay track."""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue
+from typing import Any, Dict, List, Optional
+
+from .cache import file_fingerprint, resolve_cache_dir, stable_hash
+from .shared import _escape_ffmpeg_path, _execute_ffmpeg, logger, retry_policy_for
+from .utils import _create_styled_ass_from_srt, _iter_srt_cues, _parse_resolution
+
+__all__ = [
+    "SUBTITLE_OVERLAY_CODECS",
+    "_build_subtitles_filter",
+    "_subtitle_prerender_enabled",
+    "_prerender_subtitle_overlay",
+    "_start_subtitle_prerender",
+    "_collect_subtitle_prerender",
+    "_discard_subtitle_prerender",
+]
+
+# Ambos os codecs guardam alpha e comprimem muito bem os frames vazios entre cues.
+SUBTITLE_OVERLAY_CODECS: Dict[str, List[str]] = {
+    'qtrle': ['-c:v', 'qtrle', '-pix_fmt', 'argb'],
+    'png': ['-c:v', 'png', '-pix_fmt', 'rgba'],
+}
+
+_PRERENDER_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="subtitle-prerender")
+
+
+def _build_subtitles_filter(styled_subtitle_path: str, params: Dict[str, Any]) -> str:
+    """Monta o filtro ``subtitles=`` (com ``fontsdir`` quando há fonte personalizada)."""
+
+    escaped_sub_path = _escape_ffmpeg_path(styled_subtitle_path)
+    font_file_path = (params.get('subtitle_style') or {}).get('font_file')
+
+    subtitle_filter = f"subtitles=filename='{escaped_sub_path}'"
+    if font_file_path and os.path.isfile(font_file_path):
+        font_dir = Path(font_file_path).parent
+        escaped_font_dir = _escape_ffmpeg_path(str(font_dir.resolve()))
+        subtitle_filter += f":fontsdir='{escaped_font_dir}'"
+    return subtitle_filter
+
+
+def _subtitle_prerender_enabled(params: Dict[str, Any]) -> bool:
+    return bool(params.get('subtitle_prerender_enabled'))
+
+
+def _last_cue_end(subtitle_path: str) -> float:
+    try:
+        with open(subtitle_path, 'r', encoding='utf-8-sig', errors='replace') as src:
+            last_end = max((end for _start, end, _text in _iter_srt_cues(src)), default=0)
+    except OSError:
+        return 0.0
+    return last_end / 100.0
+
+
+def _prerender_subtitle_overlay(
+    params: Dict[str, Any],
+    subtitle_path: Optional[str],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+) -> Optional[str]:
+    """Renderiza as legendas estilizadas uma única vez numa faixa RGBA.
+
+    A faixa termina no fim do último cue e é reutilizada a partir do cache
+    enquanto o SRT, o estilo, a resolução e o FPS forem os mesmos. Retorna
+    ``None`` quando não há legendas ou quando a renderização falha, para que
+    o chamador use o filtro ``subtitles=`` convencional.
+    """
+
+    if not subtitle_path or not os.path.isfile(subtitle_path):
+        return None
+
+    width, height = _parse_resolution(params.get('resolution', ''))
+    subtitle_cache = resolve_cache_dir(params, 'subtitles')
+    styled_path = _create_styled_ass_from_srt(
+        subtitle_path,
+        params.get('subtitle_style'),
+        subtitle_cache,
+        (width, height),
+        cache_dir=subtitle_cache,
+    )
+    if not styled_path or not os.path.isfile(styled_path):
+        return None
+
+    duration = _last_cue_end(subtitle_path)
+    if duration <= 0:
+        return None
+    duration += 0.5
+
+    codec = str(params.get('subtitle_overlay_codec') or 'qtrle').lower()
+    codec_args = SUBTITLE_OVERLAY_CODECS.get(codec, SUBTITLE_OVERLAY_CODECS['qtrle'])
+    fps = float(params.get('output_fps') or 30)
+    font_file = (params.get('subtitle_style') or {}).get('font_file')
+
+    cache_key = stable_hash([
+        file_fingerprint(styled_path),
+        file_fingerprint(font_file) if font_file else None,
+        [width, height],
+        fps,
+        round(duration, 2),
+        codec_args,
+    ])
+    overlay_dir = resolve_cache_dir(params, 'subtitle_overlays')
+    output_path = os.path.join(overlay_dir, f"subs_{Path(subtitle_path).stem}_{cache_key[:16]}.mov")
+    if os.path.isfile(output_path):
+        logger.info("[%s] Reutilizando legenda pré-renderizada: %s", log_prefix, output_path)
+        return output_path
+
+    partial_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.part"
+    cmd = [
+        params['ffmpeg_path'], '-y',
+        '-f', 'lavfi',
+        '-i', f"color=c=black@0.0:s={width}x{height}:r={fps}:d={duration:.3f},format=rgba",
+        '-vf', f"{_build_subtitles_filter(styled_path, params)}:alpha=1",
+        *codec_args,
+        '-f', 'mov',
+        partial_path,
+    ]
+
+    progress_queue.put(("status", f"[{log_prefix}] Pré-renderizando legendas ({duration:.1f}s)...", "info"))
+    success = _execute_ffmpeg(
+        cmd,
+        duration,
+        None,
+        cancel_event,
+        f"{log_prefix} (Legendas)",
+        progress_queue,
+        policy=retry_policy_for('subtitle_overlay', params),
+    )
+    if not success or not os.path.isfile(partial_path):
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+        return None
+
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def _start_subtitle_prerender(
+    params: Dict[str, Any],
+    subtitle_path: Optional[str],
+    progress_queue: Queue,
+    cancel_event: threading.Event,
+    log_prefix: str,
+) -> Optional["Future[Optional[str]]"]:
+    """Inicia a pré-renderização em segundo plano, em paralelo com o vídeo base."""
+
+    if not _subtitle_prerender_enabled(params) or not subtitle_path:
+        return None
+    return _PRERENDER_EXECUTOR.submit(
+        _prerender_subtitle_overlay,
+        params,
+        subtitle_path,
+        progress_queue,
+        cancel_event,
+        log_prefix,
+    )
+
+
+def _collect_subtitle_prerender(
+    future: Optional["Future[Optional[str]]"],
+    final_pass_params: Dict[str, Any],
+    log_prefix: str,
+) -> None:
+    """Aguarda a pré-renderização e repassa a faixa pronta ao passe final."""
+
+    if future is None:
+        return
+    try:
+        overlay_path = future.result()
+    except Exception as exc:  # pragma: no cover - falha inesperada na thread
+        logger.error("[%s] Falha na pré-renderização das legendas: %s", log_prefix, exc, exc_info=True)
+        overlay_path = None
+    if overlay_path:
+        final_pass_params['subtitle_overlay_path'] = overlay_path
+    else:
+        # Evita uma segunda tentativa no passe final; usa o filtro ``subtitles=``.
+        final_pass_params['subtitle_prerender_enabled'] = False
+
+
+def _discard_subtitle_prerender(future: Optional["Future[Optional[str]]"]) -> None:
+    """Descarta uma pré-renderização que não será usada: cancela se ainda não começou, senão aguarda o fim."""
+
+    if future is None or future.cancel():
+        return
+    try:
+        future.result()
+    except Exception:  # pragma: no cover - falha inesperada na thread
+        pass
@@ -4,18 +4,20 @@ from __future__ import annotations
 
 import math
 import os
-import random
 import re
 from itertools import islice
 from pathlib import Path
 from queue import Queue
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 import threading
 
+from .assets import AssetAllocator
+from .cache import file_fingerprint, stable_hash
 from .shared import (
     _execute_ffmpeg,
     _probe_media_properties,
     logger,
+    retry_policy_for,
 )
 
 __all__ = [
@@ -82,20 +84,116 @@ def _build_subtitle_style_string(style_params: Dict) -> str:
     return ",".join(f"{key}={value}" for key, value in style_parts.items())
 
 
+_SRT_TIME_PATTERN = re.compile(
+    r"(\d{1,3}):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(\d{1,3}):(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+_ASS_FORMAT_VERSION = 2
+
+
+def _srt_timestamp_to_cs(hours: str, minutes: str, seconds: str, millis: str) -> int:
+    """Converte os campos de um timestamp SRT em centésimos de segundo."""
+
+    ms = int(millis.ljust(3, '0')[:3])
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 100 + ms // 10
+
+
+def _format_ass_time(centiseconds: int) -> str:
+    hours, rest = divmod(max(0, centiseconds), 360000)
+    minutes, rest = divmod(rest, 6000)
+    seconds, cs = divmod(rest, 100)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}.{cs:02d}"
+
+
+def _iter_srt_cues(lines: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+    """Lê cues SRT linha a linha, tolerando blocos malformados.
+
+    Aceita índices ausentes, ``.`` como separador de milissegundos, cues sem
+    linha em branco entre si e coordenadas após o timestamp. Cues sem texto
+    ou com fim anterior ao início são descartados.
+    """
+
+    start = end = None
+    text_lines: List[str] = []
+    pending_index: Optional[str] = None
+
+    def flush() -> Optional[Tuple[int, int, str]]:
+        if start is None or end is None or end <= start:
+            return None
+        cleaned = [line for line in text_lines if line]
+        if not cleaned:
+            return None
+        return start, end, "\\N".join(cleaned)
+
+    for raw_line in lines:
+        line = raw_line.strip().strip('\ufeff')
+        time_match = _SRT_TIME_PATTERN.search(line) if '-->' in line else None
+
+        if time_match:
+            cue = flush()
+            if cue:
+                yield cue
+            groups = time_match.groups()
+            start = _srt_timestamp_to_cs(*groups[:4])
+            end = _srt_timestamp_to_cs(*groups[4:])
+            text_lines = []
+            pending_index = None
+            continue
+
+        if not line:
+            if pending_index is not None and start is not None:
+                text_lines.append(pending_index)
+            pending_index = None
+            cue = flush()
+            if cue:
+                yield cue
+            start = end = None
+            text_lines = []
+            continue
+
+        if start is None:
+            # Índice numérico ou lixo fora de um cue: ignorado até o próximo timestamp.
+            continue
+
+        if line.isdigit():
+            # Pode ser o índice do próximo cue (sem linha em branco) ou texto;
+            # decide-se ao ler a linha seguinte.
+            if pending_index is not None:
+                text_lines.append(pending_index)
+            pending_index = line
+            continue
+
+        if pending_index is not None:
+            text_lines.append(pending_index)
+            pending_index = None
+        text_lines.append(line)
+
+    if pending_index is not None and start is not None:
+        text_lines.append(pending_index)
+    cue = flush()
+    if cue:
+        yield cue
+
+
 def _create_styled_ass_from_srt(
     subtitle_path: Optional[str],
     style_params: Optional[Dict],
     temp_dir: str,
     resolution: Tuple[int, int],
+    cache_dir: Optional[str] = None,
 ) -> Optional[str]:
-    """Converte um arquivo ``.srt`` para ``.ass`` aplicando o estilo configurado."""
+    """Converte um arquivo ``.srt`` para ``.ass`` aplicando o estilo configurado.
+
+    O SRT é lido e escrito de forma incremental. Quando ``cache_dir`` é
+    informado, o resultado fica guardado nessa pasta sob uma chave formada
+    pelo fingerprint do SRT, pelo estilo e pela resolução, e é reutilizado
+    pelas renderizações seguintes.
+    """
 
     if not subtitle_path or not os.path.isfile(subtitle_path):
         return None
 
     style_params = style_params or {}
     style_name = "Default"
-    output_path = os.path.join(temp_dir, f"styled_{Path(subtitle_path).stem}.ass")
 
     def hex_to_ass(hex_color: str, alpha: int = 0) -> str:
         hex_color = (hex_color or '#FFFFFF').lstrip('#')
@@ -140,25 +238,6 @@ def _create_styled_ass_from_srt(
         ]
     )
 
-    def parse_srt_entries() -> Iterable[Tuple[str, str, str]]:
-        with open(subtitle_path, 'r', encoding='utf-8-sig') as src:
-            content = src.read().replace('\r', '')
-        blocks = re.split(r"\n\s*\n", content.strip())
-        time_pattern = re.compile(r"(\d{1,2}):(\d{2}):(\d{2}),(\d{3})\s+-->\s+(\d{1,2}):(\d{2}):(\d{2}),(\d{3})")
-        for block in blocks:
-            lines = [line.strip('\ufeff') for line in block.splitlines() if line.strip()]
-            if len(lines) < 2:
-                continue
-            time_match = time_pattern.match(lines[1]) if not time_pattern.match(lines[0]) else time_pattern.match(lines[0])
-            text_lines = lines[2:] if time_pattern.match(lines[1]) else lines[1:]
-            if not time_match or not text_lines:
-                continue
-            sh, sm, ss, sms, eh, em, es, ems = map(int, time_match.groups())
-            start = f"{sh:d}:{sm:02d}:{ss:02d}.{sms // 10:02d}"
-            end = f"{eh:d}:{em:02d}:{es:02d}.{ems // 10:02d}"
-            text = "\\N".join(text_lines)
-            yield start, end, text
-
     width, height = resolution
     header = [
         "[Script Info]",
@@ -175,18 +254,60 @@ def _create_styled_ass_from_srt(
         "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
     ]
 
-    events: List[str] = []
-    for start, end, text in parse_srt_entries():
-        events.append(f"Dialogue: 0,{start},{end},{style_name},,0000,0000,0000,,{text}")
-
-    if not events:
+    output_dir = cache_dir or temp_dir
+    output_name = f"styled_{Path(subtitle_path).stem}.ass"
+    if cache_dir:
+        cache_key = stable_hash([
+            file_fingerprint(subtitle_path),
+            style_line,
+            [int(width), int(height)],
+            _ASS_FORMAT_VERSION,
+        ])
+        output_name = f"styled_{Path(subtitle_path).stem}_{cache_key[:16]}.ass"
+    output_path = os.path.join(output_dir, output_name)
+
+    if cache_dir and os.path.isfile(output_path):
+        logger.info("[_create_styled_ass_from_srt] Reutilizando ASS em cache para '%s': %s", subtitle_path, output_path)
+        return output_path
+
+    os.makedirs(output_dir, exist_ok=True)
+    partial_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.part"
+
+    def write_events(encoding: str) -> int:
+        count = 0
+        with open(subtitle_path, 'r', encoding=encoding, errors='strict' if encoding == 'utf-8-sig' else 'replace', newline=None) as src, \
+                open(partial_path, 'w', encoding='utf-8') as ass_file:
+            ass_file.write("\n".join(header))
+            for start, end, text in _iter_srt_cues(src):
+                ass_file.write(
+                    f"\nDialogue: 0,{_format_ass_time(start)},{_format_ass_time(end)},{style_name},,0000,0000,0000,,{text}"
+                )
+                count += 1
+        return count
+
+    try:
+        try:
+            events_written = write_events('utf-8-sig')
+        except UnicodeDecodeError:
+            logger.warning("[_create_styled_ass_from_srt] '%s' não está em UTF-8; a usar cp1252.", subtitle_path)
+            events_written = write_events('cp1252')
+    except OSError as exc:
+        logger.error("[_create_styled_ass_from_srt] Falha ao converter '%s': %s", subtitle_path, exc)
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
         return subtitle_path
 
-    os.makedirs(temp_dir, exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as ass_file:
-        ass_file.write("\n".join(header + events))
+    if not events_written:
+        os.remove(partial_path)
+        return subtitle_path
 
-    logger.info("[_create_styled_ass_from_srt] Arquivo SRT '%s' convertido para ASS estilizado em '%s'", subtitle_path, output_path)
+    os.replace(partial_path, output_path)
+    logger.info(
+        "[_create_styled_ass_from_srt] Arquivo SRT '%s' convertido para ASS estilizado em '%s' (%d eventos)",
+        subtitle_path,
+        output_path,
+        events_written,
+    )
     return output_path
 
 
@@ -245,33 +366,53 @@ def _create_concatenated_audio(
         cancel_event,
         f"{log_prefix} (Concat Música)",
         progress_queue,
+        policy=retry_policy_for('music', params),
     )
 
 
-def _get_music_playlist(available_music: List[str], target_duration: float, params: Dict, ffmpeg_path: str) -> List[str]:
-    """Cria uma lista de caminhos de música para atingir a duração desejada."""
+def _get_music_playlist(
+    available_music: List[str],
+    target_duration: float,
+    params: Dict,
+    ffmpeg_path: str,
+    allocator: Optional[AssetAllocator] = None,
+    durations: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """Cria uma lista de caminhos de música para atingir a duração desejada.
+
+    As faixas vêm de ``allocator`` (partilhado pelo lote, para repetir o
+    sorteio e equilibrar o uso); ``durations`` evita sondar de novo as músicas
+    já verificadas na pré-verificação.
+    """
     if not available_music:
         return []
 
+    allocator = allocator or AssetAllocator(available_music)
     if params.get('batch_music_behavior') == 'loop':
-        return [random.choice(available_music)]
+        return [allocator.next()]
 
+    durations = durations if durations is not None else {}
     playlist: List[str] = []
     current_duration = 0.0
-    shuffled_music = random.sample(available_music, len(available_music))
-
-    while current_duration < target_duration and target_duration > 0:
-        if not shuffled_music:
-            shuffled_music = random.sample(available_music, len(available_music))
-        music_path = shuffled_music.pop(0)
-        props = _probe_media_properties(music_path, ffmpeg_path)
-        if props and props.get('format', {}).get('duration'):
-            duration = float(props['format']['duration'])
+    misses = 0
+
+    # Se nenhuma faixa tiver duração legível numa volta completa, desiste em vez de girar para sempre.
+    while current_duration < target_duration and target_duration > 0 and misses < len(available_music):
+        music_path = allocator.next()
+        duration = durations.get(music_path)
+        if duration is None:
+            props = _probe_media_properties(music_path, ffmpeg_path)
+            if props and props.get('format', {}).get('duration'):
+                duration = durations[music_path] = float(props['format']['duration'])
+        if duration:
             playlist.append(music_path)
             current_duration += duration
+            misses = 0
+        else:
+            misses += 1
 
-    if not playlist and available_music:
-        playlist.append(random.choice(available_music))
+    if not playlist:
+        playlist.append(allocator.next())
 
     return playlist
 
@@ -342,6 +483,7 @@ def _process_images_in_chunks(
         cancel_event,
         f"{log_prefix} (Slideshow)",
         progress_queue,
+        policy=retry_policy_for('slideshow', params),
     )
 
     return output_path, success
@@ -0,0 +1,271 @@
+"""File-based work queue that spreads one batch across several machines.
+
+Workers share a folder (typically on a network share). An item is claimed by
+creating ``<item>.lock`` with ``O_CREAT | O_EXCL``, which only one worker can
+win; a heartbeat keeps the lock's mtime fresh while the item renders. Locks
+whose lease expired belong to a dead worker and are broken by renaming them
+aside and re-checking the renamed file, so a lock that another worker has just
+re-created is put back instead of being stolen. Finished items leave a
+``<item>.done`` marker so no other worker renders them again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from queue import Queue
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .shared import logger
+
+__all__ = [
+    "DEFAULT_LEASE_SECONDS",
+    "DEFAULT_POLL_SECONDS",
+    "WorkQueue",
+]
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_POLL_SECONDS = 30
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def _positive_float(value: Any, default: float) -> float:
+    try:
+        parsed = float(value)
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+class WorkQueue:
+    """Fila de trabalho partilhada por vários processos ou máquinas."""
+
+    def __init__(
+        self,
+        folder: str,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+    ) -> None:
+        self.folder = folder
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._held: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    @classmethod
+    def open(cls, params: Dict[str, Any]) -> Optional["WorkQueue"]:
+        """Fila configurada em ``work_queue_folder``; ``None`` quando o modo distribuído está desligado."""
+
+        folder = params.get('work_queue_folder')
+        if not folder:
+            return None
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError as exc:
+            logger.warning("Pasta da fila distribuída '%s' indisponível: %s", folder, exc)
+            return None
+        return cls(
+            folder,
+            worker_id=params.get('work_queue_worker_id') or None,
+            lease_seconds=_positive_float(params.get('work_queue_lease_seconds'), DEFAULT_LEASE_SECONDS),
+            poll_seconds=_positive_float(params.get('work_queue_poll_seconds'), DEFAULT_POLL_SECONDS),
+        )
+
+    def _base(self, item: Any) -> str:
+        return os.path.join(self.folder, _UNSAFE_CHARS.sub('_', item.output_name))
+
+    def _lock_path(self, item: Any) -> str:
+        return self._base(item) + ".lock"
+
+    def _done_path(self, item: Any) -> str:
+        return self._base(item) + ".done"
+
+    def is_done(self, item: Any) -> bool:
+        return os.path.exists(self._done_path(item))
+
+    def _lock_owner(self, lock_path: str) -> Optional[str]:
+        try:
+            with open(lock_path, 'r', encoding='utf-8') as src:
+                return json.load(src).get('worker')
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _lease_expired(self, lock_path: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(lock_path) > self.lease_seconds
+        except FileNotFoundError:
+            return True
+
+    def _break_stale_lock(self, lock_path: str, stale_owner: Optional[str]) -> bool:
+        """Afasta o lock expirado de ``stale_owner``; ``False`` se outro worker chegou antes.
+
+        Dois workers podem ver o mesmo lease expirado. O primeiro renomeia o
+        lock e cria o seu; o segundo, sem a nova verificação, renomearia o
+        lock recém-criado. Por isso o arquivo renomeado é conferido de novo: se
+        não está mais expirado ou mudou de dono, ele volta para o lugar.
+        """
+
+        tombstone = f"{lock_path}.stale-{uuid.uuid4().hex}"
+        try:
+            os.rename(lock_path, tombstone)
+        except OSError:
+            return False
+        if not self._lease_expired(tombstone) or self._lock_owner(tombstone) != stale_owner:
+            self._restore_lock(tombstone, lock_path)
+            return False
+        logger.warning("Lease expirado em '%s'; item recuperado por %s.", os.path.basename(lock_path), self.worker_id)
+        try:
+            os.remove(tombstone)
+        except OSError:
+            pass
+        return True
+
+    def _restore_lock(self, tombstone: str, lock_path: str) -> None:
+        # ``link`` não sobrescreve: se um terceiro worker já criou um lock, o dele prevalece.
+        try:
+            os.link(tombstone, lock_path)
+        except FileExistsError:
+            pass
+        except OSError:
+            if not os.path.exists(lock_path):
+                try:
+                    os.rename(tombstone, lock_path)
+                except OSError:
+                    pass
+                return
+        try:
+            os.remove(tombstone)
+        except OSError:
+            pass
+
+    def _try_create_lock(self, lock_path: str) -> bool:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as dst:
+            json.dump({'worker': self.worker_id, 'claimed_at': time.strftime('%Y-%m-%dT%H:%M:%S')}, dst)
+        return True
+
+    def claim(self, item: Any) -> bool:
+        """Reserva o item para este worker; ``False`` se já foi concluído ou está com outro worker."""
+
+        if self.is_done(item):
+            return False
+        lock_path = self._lock_path(item)
+        if not self._try_create_lock(lock_path):
+            stale_owner = self._lock_owner(lock_path)
+            if not self._lease_expired(lock_path):
+                return False
+            if not self._break_stale_lock(lock_path, stale_owner):
+                return False
+            if not self._try_create_lock(lock_path):
+                return False
+        if self.is_done(item):
+            # Outro worker terminou entre a verificação e a criação do lock.
+            self._remove_own_lock(lock_path)
+            return False
+        with self._lock:
+            self._held[item.output_name] = lock_path
+        self._ensure_heartbeat()
+        return True
+
+    def _remove_own_lock(self, lock_path: str) -> None:
+        if self._lock_owner(lock_path) != self.worker_id:
+            return
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+    def complete(self, item: Any, success: bool) -> None:
+        """Libera o item; quando ``success`` grava o marcador de concluído antes de soltar o lock."""
+
+        with self._lock:
+            lock_path = self._held.pop(item.output_name, None)
+        if success:
+            try:
+                with open(self._done_path(item), 'w', encoding='utf-8') as dst:
+                    json.dump({'worker': self.worker_id, 'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S')}, dst)
+            except OSError as exc:
+                logger.warning("Não foi possível marcar '%s' como concluído na fila: %s", item.output_name, exc)
+        if lock_path:
+            self._remove_own_lock(lock_path)
+
+    def renew(self) -> None:
+        with self._lock:
+            held = list(self._held.values())
+        for lock_path in held:
+            try:
+                os.utime(lock_path, None)
+            except OSError as exc:
+                logger.warning("Falha ao renovar o lease de '%s': %s", os.path.basename(lock_path), exc)
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat is not None and self._heartbeat.is_alive():
+            return
+        self._stop.clear()
+        interval = max(1.0, self.lease_seconds / 3)
+
+        def beat() -> None:
+            while not self._stop.wait(interval):
+                self.renew()
+
+        self._heartbeat = threading.Thread(target=beat, name="work-queue-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def close(self) -> None:
+        """Para o heartbeat e devolve à fila os itens ainda reservados (ex.: cancelamento)."""
+
+        self._stop.set()
+        with self._lock:
+            held = list(self._held.values())
+            self._held.clear()
+        for lock_path in held:
+            self._remove_own_lock(lock_path)
+
+    def iter_claims(
+        self,
+        items: Iterable[Any],
+        cancel_event: threading.Event,
+        progress_queue: Optional[Queue] = None,
+        log_prefix: str = "",
+    ) -> Iterator[Any]:
+        """Gera os itens reservados por este worker até não restar nada pendente.
+
+        Itens com outro worker ficam para uma nova passagem após ``poll_seconds``;
+        assim os leases de workers mortos expiram e são recuperados. Cada item é
+        tentado no máximo uma vez por este worker.
+        """
+
+        waiting: List[Any] = list(items)
+        while waiting and not cancel_event.is_set():
+            busy: List[Any] = []
+            for item in waiting:
+                if cancel_event.is_set():
+                    return
+                if self.is_done(item):
+                    continue
+                if self.claim(item):
+                    yield item
+                else:
+                    busy.append(item)
+            waiting = [item for item in busy if not self.is_done(item)]
+            if waiting:
+                if progress_queue is not None:
+                    progress_queue.put((
+                        "status",
+                        f"[{log_prefix}] {len(waiting)} item(ns) em renderização por outros workers; aguardando...",
+                        "info",
+                    ))
+                cancel_event.wait(self.poll_seconds)
@@ -3,8 +3,6 @@
 from __future__ import annotations
 
 import os
-import shutil
-import tempfile
 from pathlib import Path
 from queue import Queue
 from typing import Dict, List, Optional, Tuple
@@ -14,9 +12,12 @@ import threading
 from security.license_manager import require_license
 # --------------------------------
 
+from processing.concurrency import concurrency_controller
 from processing.process_manager import process_manager
 from video_processing.intro import _combine_intro_with_main, _maybe_create_intro_clip
 from video_processing.final_pass import _perform_final_pass
+from video_processing.preview import preview_enabled, preview_params
+from video_processing.scratch import ScratchSpace
 from video_processing.batch import (_run_batch_image_processing, _run_batch_mixed_processing,
                                   _run_batch_video_processing, _run_hierarchical_batch_image_processing)
 from video_processing.shared import logger
@@ -75,9 +76,14 @@ def _process_single_slideshow(params: Dict, temp_dir: str, progress_queue: Queue
 @require_license # <<<<<<< DECORADOR DE SEGURANÇA APLICADO
 def process_entrypoint(params: Dict, progress_queue: Queue, cancel_event: threading.Event) -> bool:
     """Ponto de entrada principal, agora protegido por verificação de licença."""
-    temp_dir = tempfile.mkdtemp(prefix="kyle-editor-")
+    if preview_enabled(params):
+        params = preview_params(params)
+    scratch = ScratchSpace.create(params)
+    temp_dir = scratch.path
     mode = params.get('media_type', 'video_single')
     logger.info("[process_entrypoint] Processamento iniciado. Modo: %s", mode)
+    concurrency_controller.configure(min_jobs=params.get('ffmpeg_min_jobs'), max_jobs=params.get('ffmpeg_max_jobs'))
+    process_manager.configure(priority=params.get('ffmpeg_priority'), pin_cores=params.get('ffmpeg_pin_cores'))
     success = False
 
     try:
@@ -85,6 +91,13 @@ def process_entrypoint(params: Dict, progress_queue: Queue, cancel_event: thread
             progress_queue.put(("status", "[process_entrypoint] Cancelado antes do início.", "warning"))
             return False
 
+        if preview_enabled(params):
+            progress_queue.put((
+                "status",
+                f"[process_entrypoint] Modo pré-visualização: {params['resolution']} a {params['output_fps']:g} fps, apenas trechos do vídeo.",
+                "info",
+            ))
+
         if mode == 'video_single':
             success = _process_single_video(params, temp_dir, progress_queue, cancel_event)
         elif mode == 'image_folder':
@@ -109,5 +122,5 @@ def process_entrypoint(params: Dict, progress_queue: Queue, cancel_event: thread
         progress_queue.put(("finish", False))
         return False
     finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        scratch.cleanup()
         logger.info("[process_entrypoint] Finalizado. Sucesso: %s, Cancelado: %s", success, cancel_event.is_set())